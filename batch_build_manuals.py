@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Batch User Manual Builder for Inventory Management System
+Builds many manual variants (role x location x language) in a process pool.
+"""
+
+import os
+import re
+import json
+import time
+import argparse
+import itertools
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from manual_template import load_template_bytes
+from create_manual_basic import BasicUserManualGenerator, manual_sections, ALL_ROLES
+from manual_search import index_path
+
+# Content shared by every build in a worker process
+_worker_sections = None
+
+
+def variant_matrix(roles, locations, languages):
+    """Expand the role, location and language lists into a list of variants"""
+    return [
+        {"role": role, "location": location, "language": language}
+        for role, location, language in itertools.product(roles, locations or [None], languages)
+    ]
+
+
+def load_matrix(path):
+    """Load a variant matrix from a JSON file
+
+    The file holds either a list of variants or an object with "roles",
+    "locations" and "languages" lists that are combined into every variant.
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, list):
+        return data
+    return variant_matrix(
+        data.get("roles", list(ALL_ROLES)),
+        data.get("locations", []),
+        data.get("languages", ["en"]),
+    )
+
+
+def variant_filename(variant):
+    """Output file name for a variant, e.g. User_Manual_admin_Karachi_en.docx"""
+    parts = [variant.get("role") or "user"]
+    if variant.get("location"):
+        parts.append(variant["location"])
+    parts.append(variant.get("language") or "en")
+    safe = [re.sub(r"[^A-Za-z0-9-]+", "-", part).strip("-") for part in parts]
+    return "User_Manual_" + "_".join(safe) + ".docx"
+
+
+def _init_worker(sections):
+    """Receive the shared content once per worker instead of once per build"""
+    global _worker_sections
+    _worker_sections = sections
+    load_template_bytes()
+
+
+def _build_variant(variant, doc_path):
+    generator = BasicUserManualGenerator(variant=variant, sections=_worker_sections)
+    generator.generate_manual(doc_path, search_index_path=index_path(doc_path))
+    return doc_path
+
+
+def build_variants(variants, output_dir=".", workers=None):
+    """Build every variant in a process pool and return (paths, elapsed seconds)"""
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Parse the shared content and compile the template before forking
+    sections = manual_sections()
+    load_template_bytes()
+
+    paths = []
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(sections,)) as pool:
+        futures = {
+            pool.submit(_build_variant, variant, os.path.join(output_dir, variant_filename(variant))): variant
+            for variant in variants
+        }
+        for future in as_completed(futures):
+            try:
+                paths.append(future.result())
+            except Exception as e:
+                print(f"Error building variant {futures[future]}: {e}")
+    elapsed = time.perf_counter() - start
+
+    return paths, elapsed
+
+
+def main():
+    """Main function to run the batch manual builder"""
+    parser = argparse.ArgumentParser(description="Build user manual variants in parallel")
+    parser.add_argument("--matrix", help="JSON file with the variant matrix")
+    parser.add_argument("--roles", default=",".join(ALL_ROLES), help="Comma-separated roles")
+    parser.add_argument("--locations", default="", help="Comma-separated locations")
+    parser.add_argument("--languages", default="en", help="Comma-separated language codes")
+    parser.add_argument("--output-dir", default="manuals", help="Directory for the generated manuals")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    if args.matrix:
+        variants = load_matrix(args.matrix)
+    else:
+        split = lambda value: [item.strip() for item in value.split(",") if item.strip()]
+        variants = variant_matrix(split(args.roles), split(args.locations), split(args.languages))
+
+    print("=== Inventory Management System - Batch User Manual Builder ===")
+    print(f"Building {len(variants)} manual variants...")
+    print()
+
+    paths, elapsed = build_variants(variants, args.output_dir, args.workers)
+
+    print("\n=== Batch Build Complete ===")
+    print(f"✓ {len(paths)} of {len(variants)} manuals written to: {args.output_dir}")
+    if elapsed > 0:
+        print(f"✓ Throughput: {len(paths) / elapsed:.1f} documents/second ({elapsed:.2f}s total)")
+
+
+if __name__ == "__main__":
+    main()
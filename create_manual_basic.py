@@ -5,74 +5,755 @@ Creates a comprehensive user manual without requiring screenshots.
 """
 
 import os
+import re
+import json
+import argparse
+from io import BytesIO
 from datetime import datetime
 
 try:
-    from docx import Document
-    from docx.shared import Inches, Pt
+    from docx.shared import Inches
     from docx.enum.text import WD_ALIGN_PARAGRAPH
-    from docx.enum.style import WD_STYLE_TYPE
 except ImportError:
     print("Installing python-docx...")
     os.system("pip install python-docx")
-    from docx import Document
-    from docx.shared import Inches, Pt
+    from docx.shared import Inches
     from docx.enum.text import WD_ALIGN_PARAGRAPH
-    from docx.enum.style import WD_STYLE_TYPE
+
+from manual_template import new_document, apply_manual_styles
+from manual_images import docx_media
+from manual_search import index_path, update_index
+from manual_toc import TableOfContents
+from manual_package import save_document
+
+# Roles from the `role` column in `profiles`
+ALL_ROLES = ("admin", "user")
+
+ROLE_LABELS = {"admin": "Administrator Edition", "user": "User Edition"}
+
+DEFAULT_VARIANT = {"role": "user", "location": None, "language": "en"}
+
+SCREENSHOTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "screenshots")
+
+TRANSLATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "manual_translations")
+
+# Language codes such as "ur" or "pt-BR"; anything else never reaches the file system
+LANGUAGE_PATTERN = re.compile(r"[a-z]{2,3}(-[A-Za-z0-9]{2,8})*")
+
+def available_languages():
+    """English plus every language with a catalog in manual_translations/"""
+    try:
+        names = os.listdir(TRANSLATIONS_DIR)
+    except OSError:
+        names = []
+    return ["en"] + sorted(name[:-5] for name in names
+                           if name.endswith(".json") and LANGUAGE_PATTERN.fullmatch(name[:-5]))
+
+def load_translations(language):
+    """Load the string catalog for a language (manual_translations/<language>.json)"""
+    if not language or language == "en":
+        return {}
+    if not LANGUAGE_PATTERN.fullmatch(language):
+        print(f"Invalid language code '{language}', using English")
+        return {}
+    path = os.path.join(TRANSLATIONS_DIR, f"{language}.json")
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"No usable translations for '{language}', using English: {e}")
+        return {}
+
+def numbered_sections(sections, role=None):
+    """Yield (section number, entry) pairs for the sections that apply to a role"""
+    section_number = 0
+    subsection_number = 0
+    for entry in sections:
+        if role and role not in entry["roles"]:
+            continue
+        if entry["level"] == 1:
+            section_number += 1
+            subsection_number = 0
+            yield f"{section_number}.", entry
+        else:
+            subsection_number += 1
+            yield f"{section_number}.{subsection_number}", entry
+
+def section_name(title):
+    """Command-line name of a section, e.g. "Email Management" -> "email-management" """
+    return re.sub(r"[^a-z0-9]+", "-", title.lower()).strip("-")
+
+def manual_sections():
+    """Return the manual content as an ordered list of section entries
+
+    Each entry has a heading level (1 for sections, 2 for subsections), an
+    unnumbered title, the content paragraphs, the roles it applies to and
+    optionally the screenshots (file names in screenshots/) that illustrate
+    it. Section numbers are assigned when the manual is generated.
+    """
+    # Introduction
+    intro_content = [
+        "The Computerized Stationary Management System is a comprehensive web-based application designed for Pakistan State Oil (PSO) to manage inventory operations efficiently.",
+        "",
+        "This system provides a modern, user-friendly interface for managing stationary and office supplies inventory with the following key features:",
+        "",
+        "• Real-time Analytics & Reporting - Get instant insights into your inventory status",
+        "• Role-based Access Control - Secure access based on user roles and permissions", 
+        "• Secure Data Management - All data is encrypted and securely stored",
+        "• Email Notifications - Automated alerts for low stock and important updates",
+        "• Stock History Tracking - Complete audit trail of all inventory movements",
+        "• Multi-user Support - Multiple users can work simultaneously",
+        "• Responsive Design - Works on desktop, tablet, and mobile devices",
+        "",
+        "The system is built using modern web technologies including Next.js, React, and Supabase, ensuring high performance, security, and reliability.",
+        "",
+        "This manual will guide you through all aspects of using the system, from initial login to advanced inventory management features."
+    ]
+    
+    # Getting Started
+    getting_started_content = [
+        "Before you begin using the Computerized Stationary Management System, ensure you have:",
+        "",
+        "System Requirements:",
+        "• A modern web browser (Chrome 90+, Firefox 88+, Safari 14+, or Edge 90+)",
+        "• Stable internet connection",
+        "• JavaScript enabled in your browser",
+        "• Cookies enabled for the application domain",
+        "",
+        "Access Requirements:",
+        "• Valid user account (contact your system administrator)",
+        "• Assigned user role and permissions",
+        "• Network access to the application server",
+        "",
+        "First Time Setup:",
+        "1. Receive your login credentials from the system administrator",
+        "2. Navigate to the application URL in your web browser",
+        "3. Complete the initial login process",
+        "4. Familiarize yourself with the dashboard and navigation",
+        "",
+        "The application URL will be provided by your IT department or system administrator."
+    ]
+    
+    # Authentication System
+    auth_content = [
+        "The authentication system provides secure access to the inventory management system using email-based login.",
+        "",
+        "Login Process:",
+        "1. Navigate to the application homepage",
+        "2. Click on the 'Sign In' tab if not already selected",
+        "3. Enter your registered email address in the email field",
+        "4. Enter your password in the password field",
+        "5. Click the 'Sign In' button to access the dashboard",
+        "",
+        "If login is successful, you will be automatically redirected to the main dashboard.",
+        "",
+        "Sign Up Process (for new users):",
+        "1. Click on the 'Sign Up' tab on the homepage",
+        "2. Enter your full name in the name field",
+        "3. Provide a valid email address",
+        "4. Create a secure password (minimum 8 characters recommended)",
+        "5. Click 'Sign Up' to create your account",
+        "",
+        "Password Requirements:",
+        "• Minimum 6 characters (8+ recommended)",
+        "• Use a combination of letters, numbers, and special characters",
+        "• Avoid using easily guessable information",
+        "",
+        "Security Features:",
+        "• Session-based authentication with automatic timeout",
+        "• Secure password hashing and storage",
+        "• Protection against common web vulnerabilities",
+        "• Automatic logout after period of inactivity"
+    ]
+    
+    # Dashboard Overview
+    dashboard_content = [
+        "The dashboard is the main hub of the Computerized Stationary Management System, providing an overview of your inventory status and quick access to all system features.",
+        "",
+        "Dashboard Components:",
+        "",
+        "Header Section:",
+        "• PSO logo and system branding",
+        "• System title: 'Computerized Stationary System'",
+        "• User profile information (name and email)",
+        "• Logout button for secure session termination",
+        "",
+        "Navigation Menu:",
+        "The main navigation provides access to three core modules:",
+        "",
+        "1. Dashboard - Overview and analytics",
+        "   • Real-time inventory statistics",
+        "   • Interactive charts and graphs",
+        "   • Key performance indicators",
+        "   • Recent activity summary",
+        "",
+        "2. Inventory - Stock management and history",
+        "   • Current stock levels",
+        "   • Add new inventory items",
+        "   • Stock movement history",
+        "   • Inventory reports",
+        "",
+        "3. Email Management - Communication tools",
+        "   • Send inventory reports",
+        "   • Configure email templates",
+        "   • Manage notification settings",
+        "   • Test email configuration",
+        "",
+        "Visual Design:",
+        "• Clean, modern interface with intuitive navigation",
+        "• Responsive design that works on all device sizes",
+        "• Color-coded sections for easy identification",
+        "• Consistent styling throughout the application"
+    ]
+    
+    # Inventory Management
+    inventory_content = [
+        "The Inventory Management section is the core functionality of the system, providing comprehensive tools for managing stationary and office supplies.",
+        "",
+        "The inventory section is organized into three main tabs, each serving a specific purpose:",
+        "",
+        "Tab Structure:",
+        "• Inventory Overview - Combined view of all inventory data",
+        "• Current Stock - Real-time stock levels and item management",
+        "• Stock History - Historical transactions and audit trail",
+        "",
+        "Key Features Available:",
+        "• Add new inventory items with detailed information",
+        "• Update stock quantities for existing items",
+        "• Track all stock movements (in and out)",
+        "• Generate comprehensive reports",
+        "• Search and filter items by various criteria",
+        "• Bulk operations for efficiency",
+        "• Real-time data synchronization",
+        "",
+        "Data Management:",
+        "• All changes are automatically saved",
+        "• Complete audit trail maintained",
+        "• Data validation to prevent errors",
+        "• Backup and recovery capabilities"
+    ]
+    
+    # Inventory Overview
+    overview_content = [
+        "The Inventory Overview tab provides a comprehensive view of all inventory items in a single, unified interface.",
+        "",
+        "Features:",
+        "• Combined table showing all inventory items",
+        "• Real-time stock levels for each item",
+        "• Quick action buttons for common operations",
+        "• Sortable columns for easy data organization",
+        "• Search functionality to find specific items",
+        "",
+        "Information Displayed:",
+        "• Item name and description",
+        "• Current quantity in stock",
+        "• Storage location",
+        "• Last updated timestamp",
+        "• Item category or type",
+        "",
+        "Available Actions:",
+        "• View detailed item information",
+        "• Edit item details",
+        "• Update stock quantities",
+        "• Delete items (with confirmation)",
+        "• Export data to various formats"
+    ]
+    
+    # Current Stock Management
+    current_stock_content = [
+        "The Current Stock tab focuses on real-time inventory management and item maintenance.",
+        "",
+        "Primary Functions:",
+        "• View all items with current stock levels",
+        "• Add new inventory items to the system",
+        "• Update existing item information",
+        "• Manage item categories and classifications",
+        "• Set minimum stock level alerts",
+        "",
+        "Adding New Items:",
+        "1. Click the 'Add New Item' button",
+        "2. Fill in the required information:",
+        "   • Item Name (required)",
+        "   • Description (detailed item description)",
+        "   • Initial Quantity (starting stock level)",
+        "   • Location (storage location)",
+        "   • Category (item classification)",
+        "3. Verify all information is correct",
+        "4. Click 'Save' to add the item to inventory",
+        "",
+        "Updating Existing Items:",
+        "1. Locate the item in the table",
+        "2. Click the 'Edit' button for that item",
+        "3. Modify the necessary fields",
+        "4. Click 'Update' to save changes",
+        "",
+        "Stock Level Management:",
+        "• Increase stock when new supplies arrive",
+        "• Decrease stock when items are distributed",
+        "• Set reorder points for automatic alerts",
+        "• Track minimum and maximum stock levels"
+    ]
+    
+    # Stock History Tracking
+    history_content = [
+        "The Stock History tab provides a complete audit trail of all inventory movements and transactions.",
+        "",
+        "History Features:",
+        "• Complete record of all stock transactions",
+        "• Detailed transaction information",
+        "• Advanced filtering and search capabilities",
+        "• Export functionality for reporting",
+        "• Data integrity and audit compliance",
+        "",
+        "Transaction Information Tracked:",
+        "• Date and time of transaction",
+        "• Item name and description",
+        "• Quantity changed (positive for stock in, negative for stock out)",
+        "• Transaction type (Stock In, Stock Out, Adjustment)",
+        "• User who performed the action",
+        "• Additional notes or comments",
+        "• Reference numbers or documentation",
+        "",
+        "Filtering Options:",
+        "• Filter by date range (from/to dates)",
+        "• Filter by transaction type",
+        "• Filter by specific items",
+        "• Filter by user who made the change",
+        "• Filter by location",
+        "",
+        "Using the History:",
+        "1. Select your desired filters",
+        "2. Click 'Apply Filters' to view results",
+        "3. Use the search box for specific items",
+        "4. Export data for external reporting",
+        "5. Click on any transaction for detailed view",
+        "",
+        "Audit Trail Benefits:",
+        "• Complete accountability for all changes",
+        "• Compliance with inventory management standards",
+        "• Ability to track down discrepancies",
+        "• Historical analysis and reporting"
+    ]
+    
+    # Adding New Items
+    add_items_content = [
+        "The Add New Items functionality allows authorized users to expand the inventory database with new stationary and office supplies.",
+        "",
+        "Access Method:",
+        "• Navigate to Inventory → Current Stock tab",
+        "• Click the 'Add New Item' button",
+        "• Or use the dedicated 'Add Item' page from the navigation",
+        "",
+        "Required Information:",
+        "",
+        "Item Name:",
+        "• Descriptive name of the stationary item",
+        "• Should be clear and easily identifiable",
+        "• Examples: 'A4 Copy Paper', 'Blue Ballpoint Pens', 'Stapler - Heavy Duty'",
+        "",
+        "Description:",
+        "• Detailed description including specifications",
+        "• Brand information if applicable",
+        "• Size, color, or other distinguishing features",
+        "• Any special handling requirements",
+        "",
+        "Initial Quantity:",
+        "• Starting stock level for the new item",
+        "• Must be a positive number",
+        "• Represents current available quantity",
+        "",
+        "Storage Location:",
+        "• Physical location where item is stored",
+        "• Examples: 'Storeroom A', 'Cabinet 3-B', 'Main Warehouse'",
+        "• Helps staff locate items quickly",
+        "",
+        "Category:",
+        "• Classification of the item type",
+        "• Examples: 'Office Supplies', 'Paper Products', 'Writing Instruments'",
+        "• Used for reporting and organization",
+        "",
+        "Step-by-Step Process:",
+        "1. Access the Add Item form",
+        "2. Fill in all required fields carefully",
+        "3. Double-check information for accuracy",
+        "4. Click 'Add Item' to save to database",
+        "5. Confirm the item appears in the inventory list",
+        "",
+        "Best Practices:",
+        "• Use consistent naming conventions",
+        "• Include all relevant details in descriptions",
+        "• Verify quantities before entering",
+        "• Use standardized location names",
+        "• Choose appropriate categories for easy filtering"
+    ]
+    
+    # Email Management
+    email_content = [
+        "The Email Management system provides automated communication capabilities for inventory-related notifications and reports.",
+        "",
+        "Core Email Features:",
+        "",
+        "Automated Reports:",
+        "• Daily inventory status reports",
+        "• Weekly summary reports",
+        "• Monthly comprehensive reports",
+        "• Custom report scheduling",
+        "",
+        "Alert Notifications:",
+        "• Low stock level warnings",
+        "• Out of stock alerts",
+        "• Reorder point notifications",
+        "• System maintenance announcements",
+        "",
+        "Email Configuration:",
+        "",
+        "SMTP Settings:",
+        "• Configure outgoing mail server",
+        "• Set authentication credentials",
+        "• Test email connectivity",
+        "• Verify delivery settings",
+        "",
+        "Template Management:",
+        "• Customize email templates",
+        "• Add company branding",
+        "• Modify message content",
+        "• Include dynamic data fields",
+        "",
+        "Recipient Management:",
+        "• Maintain distribution lists",
+        "• Add/remove email addresses",
+        "• Group recipients by role",
+        "• Set notification preferences",
+        "",
+        "Email Types and Usage:",
+        "",
+        "Low Stock Alerts:",
+        "• Automatically sent when items reach minimum levels",
+        "• Include item details and current quantities",
+        "• Suggest reorder quantities",
+        "• Provide supplier information if available",
+        "",
+        "Inventory Reports:",
+        "• Comprehensive inventory status",
+        "• Stock movement summaries",
+        "• Usage patterns and trends",
+        "• Formatted for easy reading",
+        "",
+        "System Notifications:",
+        "• Maintenance schedules",
+        "• System updates",
+        "• Security alerts",
+        "• User account changes",
+        "",
+        "Testing and Troubleshooting:",
+        "• Send test emails to verify configuration",
+        "• Check spam/junk folders",
+        "• Verify recipient email addresses",
+        "• Monitor delivery status",
+        "",
+        "Best Practices:",
+        "• Regularly test email functionality",
+        "• Keep recipient lists updated",
+        "• Use clear, professional email templates",
+        "• Set appropriate alert thresholds",
+        "• Monitor email delivery rates"
+    ]
+    
+    # User Profile Management
+    profile_content = [
+        "User Profile Management allows users to view and manage their account information and system preferences.",
+        "",
+        "Profile Information:",
+        "• Full name display",
+        "• Email address (used for login)",
+        "• User role and permissions",
+        "• Account creation date",
+        "• Last login information",
+        "",
+        "Account Security:",
+        "• Change password functionality",
+        "• Session management",
+        "• Login history tracking",
+        "• Security notifications",
+        "",
+        "User Preferences:",
+        "• Email notification settings",
+        "• Dashboard layout preferences",
+        "• Report format preferences",
+        "• Time zone settings",
+        "",
+        "Logout Process:",
+        "1. Click the user profile area in the header",
+        "2. Select 'Logout' from the dropdown menu",
+        "3. Confirm logout if prompted",
+        "4. You will be redirected to the login page",
+        "",
+        "Security Best Practices:",
+        "• Always logout when finished using the system",
+        "• Use strong, unique passwords",
+        "• Report any suspicious account activity",
+        "• Keep contact information updated"
+    ]
+    
+    # Troubleshooting
+    troubleshooting_content = [
+        "Common Issues and Solutions:",
+        "",
+        "Login Problems:",
+        "",
+        "Cannot Login / Invalid Credentials:",
+        "• Verify email address is spelled correctly",
+        "• Check that Caps Lock is not enabled",
+        "• Ensure password is entered correctly",
+        "• Try resetting your password if available",
+        "• Contact system administrator for account verification",
+        "",
+        "Page Won't Load:",
+        "• Check your internet connection",
+        "• Refresh the page (F5 or Ctrl+R)",
+        "• Clear browser cache and cookies",
+        "• Try a different web browser",
+        "• Disable browser extensions temporarily",
+        "",
+        "Performance Issues:",
+        "",
+        "Slow Loading Times:",
+        "• Check internet connection speed",
+        "• Close unnecessary browser tabs",
+        "• Clear browser cache",
+        "• Restart your web browser",
+        "• Try using a different browser",
+        "",
+        "Data Not Updating:",
+        "• Refresh the page to get latest data",
+        "• Check if you have proper permissions",
+        "• Verify internet connection is stable",
+        "• Contact support if data appears corrupted",
+        "",
+        "Email Issues:",
+        "",
+        "Not Receiving Emails:",
+        "• Check spam/junk email folders",
+        "• Verify email address is correct in profile",
+        "• Ensure email notifications are enabled",
+        "• Contact administrator to verify email configuration",
+        "",
+        "Email Delivery Problems:",
+        "• Test email configuration in Email Management",
+        "• Verify SMTP settings with IT department",
+        "• Check recipient email addresses are valid",
+        "• Monitor email server status",
+        "",
+        "Browser Compatibility:",
+        "",
+        "Supported Browsers:",
+        "• Google Chrome 90 or later (recommended)",
+        "• Mozilla Firefox 88 or later",
+        "• Safari 14 or later",
+        "• Microsoft Edge 90 or later",
+        "",
+        "Browser Settings:",
+        "• Enable JavaScript",
+        "• Allow cookies for the application domain",
+        "• Disable popup blockers for the site",
+        "• Ensure browser is up to date",
+        "",
+        "When to Contact Support:",
+        "• Persistent login issues after trying above solutions",
+        "• Data corruption or loss",
+        "• System errors or unexpected behavior",
+        "• Need for additional user accounts or permissions",
+        "• Questions about system functionality",
+        "",
+        "Information to Provide When Contacting Support:",
+        "• Your name and email address",
+        "• Description of the problem",
+        "• Steps you've already tried",
+        "• Browser and version being used",
+        "• Any error messages received",
+        "• Screenshots if helpful"
+    ]
+    
+    # System Requirements
+    requirements_content = [
+        "Technical Requirements:",
+        "",
+        "Minimum Browser Requirements:",
+        "• Google Chrome 90 or later",
+        "• Mozilla Firefox 88 or later",
+        "• Safari 14 or later",
+        "• Microsoft Edge 90 or later",
+        "",
+        "Network Requirements:",
+        "• Stable internet connection",
+        "• Minimum 1 Mbps download speed",
+        "• Reliable network connectivity",
+        "• Access to application server",
+        "",
+        "Browser Configuration:",
+        "• JavaScript must be enabled",
+        "• Cookies must be enabled",
+        "• Popup blockers should allow the application",
+        "• Local storage should be enabled",
+        "",
+        "Security Requirements:",
+        "• HTTPS connection (automatically enforced)",
+        "• Modern TLS encryption support",
+        "• Certificate validation enabled",
+        "• Secure cookie support",
+        "",
+        "Hardware Recommendations:",
+        "• Minimum 4GB RAM",
+        "• Modern processor (Intel i3 or equivalent)",
+        "• Screen resolution 1024x768 or higher",
+        "• Keyboard and mouse/trackpad",
+        "",
+        "Operating System Compatibility:",
+        "• Windows 10 or later",
+        "• macOS 10.15 or later",
+        "• Linux (Ubuntu 18.04+ or equivalent)",
+        "• iOS 13+ (for mobile access)",
+        "• Android 8+ (for mobile access)"
+    ]
+    
+    # Appendix
+    appendix_content = [
+        "Additional Information and Resources:",
+        "",
+        "System Architecture:",
+        "• Built with Next.js and React for modern web performance",
+        "• Supabase backend for reliable data management",
+        "• Real-time data synchronization",
+        "• Cloud-based infrastructure for scalability",
+        "",
+        "Security Features:",
+        "• Secure HTTPS connection with TLS encryption",
+        "• Session-based authentication with timeout",
+        "• Role-based access control (RBAC)",
+        "• Data encryption in transit and at rest",
+        "• Regular security updates and patches",
+        "",
+        "Data Backup and Recovery:",
+        "• Automated daily backups",
+        "• Point-in-time recovery capabilities",
+        "• Redundant data storage",
+        "• Disaster recovery procedures",
+        "",
+        "Compliance and Standards:",
+        "• Industry-standard security practices",
+        "• Data privacy protection",
+        "• Audit trail maintenance",
+        "• Regular security assessments",
+        "",
+        "Support and Maintenance:",
+        "• Regular system updates",
+        "• Performance monitoring",
+        "• Proactive issue resolution",
+        "• User training and documentation",
+        "",
+        "Contact Information:",
+        "• System Administrator: [Contact your IT department]",
+        "• Technical Support: [Contact your IT helpdesk]",
+        "• User Training: [Contact your training coordinator]",
+        "",
+        "Version Information:",
+        f"• Manual Version: 1.0",
+        f"• Generated: {datetime.now().strftime('%B %d, %Y')}",
+        "• System Version: Latest",
+        "",
+        "Glossary of Terms:",
+        "",
+        "• Inventory: Collection of stationary and office supplies",
+        "• Stock Level: Current quantity of an item available",
+        "• Transaction: Any change to inventory (in, out, adjustment)",
+        "• Audit Trail: Complete record of all system changes",
+        "• RBAC: Role-Based Access Control for security",
+        "• SMTP: Simple Mail Transfer Protocol for email",
+        "• Dashboard: Main overview screen of the application",
+        "• Session: Period of active use after login",
+        "",
+        "Keyboard Shortcuts:",
+        "• Ctrl+R or F5: Refresh page",
+        "• Ctrl+F: Search on current page",
+        "• Tab: Navigate between form fields",
+        "• Enter: Submit forms or confirm actions",
+        "• Esc: Cancel dialogs or close popups",
+        "",
+        "Tips for Efficient Use:",
+        "• Use the search functionality to quickly find items",
+        "• Regularly check stock levels to prevent shortages",
+        "• Keep item descriptions detailed and accurate",
+        "• Use consistent naming conventions",
+        "• Take advantage of bulk operations when possible",
+        "• Set up email alerts for important notifications",
+        "• Regularly review stock history for insights",
+        "",
+        "Future Enhancements:",
+        "• Mobile application development",
+        "• Advanced reporting and analytics",
+        "• Integration with procurement systems",
+        "• Barcode scanning capabilities",
+        "• Automated reordering features"
+    ]
+
+    return [
+        {"level": 1, "title": "Introduction", "content": intro_content, "roles": ALL_ROLES, "images": ["00_landing_page.png"]},
+        {"level": 1, "title": "Getting Started", "content": getting_started_content, "roles": ALL_ROLES},
+        {"level": 1, "title": "Authentication System", "content": auth_content, "roles": ALL_ROLES, "images": ["01_login_page.png", "02_login_form.png", "03_signup_form.png"]},
+        {"level": 1, "title": "Dashboard Overview", "content": dashboard_content, "roles": ALL_ROLES, "images": ["04_dashboard.png"]},
+        {"level": 1, "title": "Inventory Management", "content": inventory_content, "roles": ALL_ROLES},
+        {"level": 2, "title": "Inventory Overview", "content": overview_content, "roles": ALL_ROLES, "images": ["05_inventory_overview.png"]},
+        {"level": 2, "title": "Current Stock Management", "content": current_stock_content, "roles": ALL_ROLES, "images": ["06_current_stock.png"]},
+        {"level": 2, "title": "Stock History Tracking", "content": history_content, "roles": ALL_ROLES, "images": ["07_stock_history.png"]},
+        {"level": 2, "title": "Adding New Items", "content": add_items_content, "roles": ALL_ROLES, "images": ["08_add_item.png"]},
+        {"level": 1, "title": "Email Management", "content": email_content, "roles": ALL_ROLES, "images": ["09_email_management.png"]},
+        {"level": 1, "title": "User Profile Management", "content": profile_content, "roles": ALL_ROLES},
+        {"level": 1, "title": "Troubleshooting", "content": troubleshooting_content, "roles": ALL_ROLES},
+        {"level": 1, "title": "System Requirements", "content": requirements_content, "roles": ALL_ROLES},
+        {"level": 1, "title": "Appendix", "content": appendix_content, "roles": ALL_ROLES},
+    ]
 
 class BasicUserManualGenerator:
-    def __init__(self):
-        self.doc = Document()
+    def __init__(self, variant=None, sections=None, include_screenshots=False, only_sections=None):
+        self.doc = new_document()
+        self.toc = TableOfContents(self.doc)
+        self.include_screenshots = include_screenshots
+        self.variant = dict(DEFAULT_VARIANT, **(variant or {}))
+        self.show_edition = variant is not None
+        self.sections = sections if sections is not None else manual_sections()
+        self.translations = load_translations(self.variant["language"])
+        # Top-level sections to build (by section_name), keeping their usual numbers
+        self.only_sections = set(only_sections) if only_sections else None
         
     def setup_document_styles(self):
-        """Setup document styles"""
-        # Title style
-        title_style = self.doc.styles.add_style('CustomTitle', WD_STYLE_TYPE.PARAGRAPH)
-        title_font = title_style.font
-        title_font.name = 'Arial'
-        title_font.size = Pt(24)
-        title_font.bold = True
-        title_style.paragraph_format.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        title_style.paragraph_format.space_after = Pt(12)
-        
-        # Heading styles
-        heading1_style = self.doc.styles.add_style('CustomHeading1', WD_STYLE_TYPE.PARAGRAPH)
-        heading1_font = heading1_style.font
-        heading1_font.name = 'Arial'
-        heading1_font.size = Pt(18)
-        heading1_font.bold = True
-        heading1_style.paragraph_format.space_before = Pt(12)
-        heading1_style.paragraph_format.space_after = Pt(6)
+        """Setup document styles (already present when built from the template)"""
+        apply_manual_styles(self.doc)
+    
+    def cover_lines(self):
+        """Return the cover page as (text, style) pairs"""
+        lines = [
+            ("USER MANUAL", 'CustomTitle'),
+            ("Computerized Stationary Management System", 'CustomTitle'),
+            ("Pakistan State Oil (PSO)", 'CustomHeading1'),
+        ]
         
-        heading2_style = self.doc.styles.add_style('CustomHeading2', WD_STYLE_TYPE.PARAGRAPH)
-        heading2_font = heading2_style.font
-        heading2_font.name = 'Arial'
-        heading2_font.size = Pt(14)
-        heading2_font.bold = True
-        heading2_style.paragraph_format.space_before = Pt(6)
-        heading2_style.paragraph_format.space_after = Pt(3)
+        # Edition (role and location of this variant)
+        if self.show_edition:
+            edition = [self.translate(ROLE_LABELS.get(self.variant["role"], self.variant["role"]))]
+            if self.variant["location"]:
+                edition.append(self.variant["location"])
+            lines.append((" - ".join(edition), 'Normal'))
+        
+        # Some space, then version info
+        lines += [("", 'Normal'), ("", 'Normal')]
+        lines.append((f"Generated on: {datetime.now().strftime('%B %d, %Y')}", 'Normal'))
+        return lines
     
     def add_cover_page(self):
         """Add cover page to the document"""
-        # Title
-        title = self.doc.add_paragraph("USER MANUAL", style='CustomTitle')
-        title.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        
-        # Subtitle
-        subtitle = self.doc.add_paragraph("Computerized Stationary Management System", style='CustomTitle')
-        subtitle.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        
-        # Organization
-        org = self.doc.add_paragraph("Pakistan State Oil (PSO)", style='CustomHeading1')
-        org.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        
-        # Add some space
-        self.doc.add_paragraph("")
-        self.doc.add_paragraph("")
-        
-        # Version info
-        version_info = self.doc.add_paragraph(f"Generated on: {datetime.now().strftime('%B %d, %Y')}")
-        version_info.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        for text, style in self.cover_lines():
+            paragraph = self.doc.add_paragraph(text, style=style)
+            paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
         
         # Page break
         self.doc.add_page_break()
@@ -82,32 +763,26 @@ class BasicUserManualGenerator:
         toc_heading = self.doc.add_paragraph("TABLE OF CONTENTS", style='CustomHeading1')
         toc_heading.alignment = WD_ALIGN_PARAGRAPH.CENTER
         
-        toc_items = [
-            "1. Introduction",
-            "2. Getting Started",
-            "3. Authentication System",
-            "4. Dashboard Overview", 
-            "5. Inventory Management",
-            "   5.1 Inventory Overview",
-            "   5.2 Current Stock Management",
-            "   5.3 Stock History Tracking",
-            "   5.4 Adding New Items",
-            "6. Email Management",
-            "7. User Profile Management",
-            "8. Troubleshooting",
-            "9. System Requirements",
-            "10. Appendix"
-        ]
-        
-        for item in toc_items:
-            self.doc.add_paragraph(item, style='Normal')
+        # Entries are filled in from the headings as the sections are added
+        self.toc.insert()
         
         self.doc.add_page_break()
     
+    def translate(self, text):
+        """Translate a string using the variant's catalog, falling back to English"""
+        return self.translations.get(text, text)
+    
+    def translate_content(self, content):
+        """Translate section content (a paragraph or a list of paragraphs)"""
+        if isinstance(content, list):
+            return [self.translate(paragraph) if paragraph.strip() else paragraph for paragraph in content]
+        return self.translate(content)
+    
     def add_section(self, title, content):
         """Add a section with title and content"""
         # Add heading
-        self.doc.add_paragraph(title, style='CustomHeading1')
+        heading = self.doc.add_paragraph(title, style='CustomHeading1')
+        self.toc.add_heading(heading, 1)
         
         # Add content
         if isinstance(content, list):
@@ -125,7 +800,8 @@ class BasicUserManualGenerator:
     def add_subsection(self, title, content):
         """Add a subsection with title and content"""
         # Add heading
-        self.doc.add_paragraph(title, style='CustomHeading2')
+        heading = self.doc.add_paragraph(title, style='CustomHeading2')
+        self.toc.add_heading(heading, 2)
         
         # Add content
         if isinstance(content, list):
@@ -140,10 +816,41 @@ class BasicUserManualGenerator:
         # Add space after subsection
         self.doc.add_paragraph("")
     
-    def generate_manual(self):
-        """Generate the complete user manual"""
-        print("Generating user manual...")
-        
+    def add_screenshot(self, image_path):
+        """Add a screenshot scaled to the page width
+        
+        Images go through the media cache, so identical screenshots are
+        stored once in word/media however often they are used.
+        """
+        self.doc.add_picture(docx_media(image_path), width=Inches(6))
+        self.doc.paragraphs[-1].alignment = WD_ALIGN_PARAGRAPH.CENTER
+    
+    def content_tree(self):
+        """Return the numbered, translated sections of this variant
+        
+        The tree is what every output format renders: a list of nodes with
+        the heading level, numbered title, paragraphs and screenshot paths.
+        """
+        tree = []
+        selected = True
+        for number, entry in numbered_sections(self.sections, self.variant["role"]):
+            if self.only_sections is not None:
+                if entry["level"] == 1:
+                    selected = section_name(entry["title"]) in self.only_sections
+                if not selected:
+                    continue
+            content = self.translate_content(entry["content"])
+            images = [os.path.join(SCREENSHOTS_DIR, name) for name in entry.get("images", ())]
+            tree.append({
+                "level": entry["level"],
+                "title": f"{number} {self.translate(entry['title'])}",
+                "paragraphs": content if isinstance(content, list) else [content],
+                "images": [path for path in images if os.path.exists(path)],
+            })
+        return tree
+    
+    def build_document(self, tree=None):
+        """Add every part of the manual to the in-memory document"""
         # Setup
         self.setup_document_styles()
         
@@ -151,640 +858,70 @@ class BasicUserManualGenerator:
         self.add_cover_page()
         self.add_table_of_contents()
         
-        # 1. Introduction
-        intro_content = [
-            "The Computerized Stationary Management System is a comprehensive web-based application designed for Pakistan State Oil (PSO) to manage inventory operations efficiently.",
-            "",
-            "This system provides a modern, user-friendly interface for managing stationary and office supplies inventory with the following key features:",
-            "",
-            "• Real-time Analytics & Reporting - Get instant insights into your inventory status",
-            "• Role-based Access Control - Secure access based on user roles and permissions", 
-            "• Secure Data Management - All data is encrypted and securely stored",
-            "• Email Notifications - Automated alerts for low stock and important updates",
-            "• Stock History Tracking - Complete audit trail of all inventory movements",
-            "• Multi-user Support - Multiple users can work simultaneously",
-            "• Responsive Design - Works on desktop, tablet, and mobile devices",
-            "",
-            "The system is built using modern web technologies including Next.js, React, and Supabase, ensuring high performance, security, and reliability.",
-            "",
-            "This manual will guide you through all aspects of using the system, from initial login to advanced inventory management features."
-        ]
-        self.add_section("1. Introduction", intro_content)
-        
-        # 2. Getting Started
-        getting_started_content = [
-            "Before you begin using the Computerized Stationary Management System, ensure you have:",
-            "",
-            "System Requirements:",
-            "• A modern web browser (Chrome 90+, Firefox 88+, Safari 14+, or Edge 90+)",
-            "• Stable internet connection",
-            "• JavaScript enabled in your browser",
-            "• Cookies enabled for the application domain",
-            "",
-            "Access Requirements:",
-            "• Valid user account (contact your system administrator)",
-            "• Assigned user role and permissions",
-            "• Network access to the application server",
-            "",
-            "First Time Setup:",
-            "1. Receive your login credentials from the system administrator",
-            "2. Navigate to the application URL in your web browser",
-            "3. Complete the initial login process",
-            "4. Familiarize yourself with the dashboard and navigation",
-            "",
-            "The application URL will be provided by your IT department or system administrator."
-        ]
-        self.add_section("2. Getting Started", getting_started_content)
-        
-        # 3. Authentication System
-        auth_content = [
-            "The authentication system provides secure access to the inventory management system using email-based login.",
-            "",
-            "Login Process:",
-            "1. Navigate to the application homepage",
-            "2. Click on the 'Sign In' tab if not already selected",
-            "3. Enter your registered email address in the email field",
-            "4. Enter your password in the password field",
-            "5. Click the 'Sign In' button to access the dashboard",
-            "",
-            "If login is successful, you will be automatically redirected to the main dashboard.",
-            "",
-            "Sign Up Process (for new users):",
-            "1. Click on the 'Sign Up' tab on the homepage",
-            "2. Enter your full name in the name field",
-            "3. Provide a valid email address",
-            "4. Create a secure password (minimum 8 characters recommended)",
-            "5. Click 'Sign Up' to create your account",
-            "",
-            "Password Requirements:",
-            "• Minimum 6 characters (8+ recommended)",
-            "• Use a combination of letters, numbers, and special characters",
-            "• Avoid using easily guessable information",
-            "",
-            "Security Features:",
-            "• Session-based authentication with automatic timeout",
-            "• Secure password hashing and storage",
-            "• Protection against common web vulnerabilities",
-            "• Automatic logout after period of inactivity"
-        ]
-        self.add_section("3. Authentication System", auth_content)
-        
-        # 4. Dashboard Overview
-        dashboard_content = [
-            "The dashboard is the main hub of the Computerized Stationary Management System, providing an overview of your inventory status and quick access to all system features.",
-            "",
-            "Dashboard Components:",
-            "",
-            "Header Section:",
-            "• PSO logo and system branding",
-            "• System title: 'Computerized Stationary System'",
-            "• User profile information (name and email)",
-            "• Logout button for secure session termination",
-            "",
-            "Navigation Menu:",
-            "The main navigation provides access to three core modules:",
-            "",
-            "1. Dashboard - Overview and analytics",
-            "   • Real-time inventory statistics",
-            "   • Interactive charts and graphs",
-            "   • Key performance indicators",
-            "   • Recent activity summary",
-            "",
-            "2. Inventory - Stock management and history",
-            "   • Current stock levels",
-            "   • Add new inventory items",
-            "   • Stock movement history",
-            "   • Inventory reports",
-            "",
-            "3. Email Management - Communication tools",
-            "   • Send inventory reports",
-            "   • Configure email templates",
-            "   • Manage notification settings",
-            "   • Test email configuration",
-            "",
-            "Visual Design:",
-            "• Clean, modern interface with intuitive navigation",
-            "• Responsive design that works on all device sizes",
-            "• Color-coded sections for easy identification",
-            "• Consistent styling throughout the application"
-        ]
-        self.add_section("4. Dashboard Overview", dashboard_content)
-        
-        # 5. Inventory Management
-        inventory_content = [
-            "The Inventory Management section is the core functionality of the system, providing comprehensive tools for managing stationary and office supplies.",
-            "",
-            "The inventory section is organized into three main tabs, each serving a specific purpose:",
-            "",
-            "Tab Structure:",
-            "• Inventory Overview - Combined view of all inventory data",
-            "• Current Stock - Real-time stock levels and item management",
-            "• Stock History - Historical transactions and audit trail",
-            "",
-            "Key Features Available:",
-            "• Add new inventory items with detailed information",
-            "• Update stock quantities for existing items",
-            "• Track all stock movements (in and out)",
-            "• Generate comprehensive reports",
-            "• Search and filter items by various criteria",
-            "• Bulk operations for efficiency",
-            "• Real-time data synchronization",
-            "",
-            "Data Management:",
-            "• All changes are automatically saved",
-            "• Complete audit trail maintained",
-            "• Data validation to prevent errors",
-            "• Backup and recovery capabilities"
-        ]
-        self.add_section("5. Inventory Management", inventory_content)
-        
-        # 5.1 Inventory Overview
-        overview_content = [
-            "The Inventory Overview tab provides a comprehensive view of all inventory items in a single, unified interface.",
-            "",
-            "Features:",
-            "• Combined table showing all inventory items",
-            "• Real-time stock levels for each item",
-            "• Quick action buttons for common operations",
-            "• Sortable columns for easy data organization",
-            "• Search functionality to find specific items",
-            "",
-            "Information Displayed:",
-            "• Item name and description",
-            "• Current quantity in stock",
-            "• Storage location",
-            "• Last updated timestamp",
-            "• Item category or type",
-            "",
-            "Available Actions:",
-            "• View detailed item information",
-            "• Edit item details",
-            "• Update stock quantities",
-            "• Delete items (with confirmation)",
-            "• Export data to various formats"
-        ]
-        self.add_subsection("5.1 Inventory Overview", overview_content)
-        
-        # 5.2 Current Stock Management
-        current_stock_content = [
-            "The Current Stock tab focuses on real-time inventory management and item maintenance.",
-            "",
-            "Primary Functions:",
-            "• View all items with current stock levels",
-            "• Add new inventory items to the system",
-            "• Update existing item information",
-            "• Manage item categories and classifications",
-            "• Set minimum stock level alerts",
-            "",
-            "Adding New Items:",
-            "1. Click the 'Add New Item' button",
-            "2. Fill in the required information:",
-            "   • Item Name (required)",
-            "   • Description (detailed item description)",
-            "   • Initial Quantity (starting stock level)",
-            "   • Location (storage location)",
-            "   • Category (item classification)",
-            "3. Verify all information is correct",
-            "4. Click 'Save' to add the item to inventory",
-            "",
-            "Updating Existing Items:",
-            "1. Locate the item in the table",
-            "2. Click the 'Edit' button for that item",
-            "3. Modify the necessary fields",
-            "4. Click 'Update' to save changes",
-            "",
-            "Stock Level Management:",
-            "• Increase stock when new supplies arrive",
-            "• Decrease stock when items are distributed",
-            "• Set reorder points for automatic alerts",
-            "• Track minimum and maximum stock levels"
-        ]
-        self.add_subsection("5.2 Current Stock Management", current_stock_content)
-        
-        # 5.3 Stock History Tracking
-        history_content = [
-            "The Stock History tab provides a complete audit trail of all inventory movements and transactions.",
-            "",
-            "History Features:",
-            "• Complete record of all stock transactions",
-            "• Detailed transaction information",
-            "• Advanced filtering and search capabilities",
-            "• Export functionality for reporting",
-            "• Data integrity and audit compliance",
-            "",
-            "Transaction Information Tracked:",
-            "• Date and time of transaction",
-            "• Item name and description",
-            "• Quantity changed (positive for stock in, negative for stock out)",
-            "• Transaction type (Stock In, Stock Out, Adjustment)",
-            "• User who performed the action",
-            "• Additional notes or comments",
-            "• Reference numbers or documentation",
-            "",
-            "Filtering Options:",
-            "• Filter by date range (from/to dates)",
-            "• Filter by transaction type",
-            "• Filter by specific items",
-            "• Filter by user who made the change",
-            "• Filter by location",
-            "",
-            "Using the History:",
-            "1. Select your desired filters",
-            "2. Click 'Apply Filters' to view results",
-            "3. Use the search box for specific items",
-            "4. Export data for external reporting",
-            "5. Click on any transaction for detailed view",
-            "",
-            "Audit Trail Benefits:",
-            "• Complete accountability for all changes",
-            "• Compliance with inventory management standards",
-            "• Ability to track down discrepancies",
-            "• Historical analysis and reporting"
-        ]
-        self.add_subsection("5.3 Stock History Tracking", history_content)
-        
-        # 5.4 Adding New Items
-        add_items_content = [
-            "The Add New Items functionality allows authorized users to expand the inventory database with new stationary and office supplies.",
-            "",
-            "Access Method:",
-            "• Navigate to Inventory → Current Stock tab",
-            "• Click the 'Add New Item' button",
-            "• Or use the dedicated 'Add Item' page from the navigation",
-            "",
-            "Required Information:",
-            "",
-            "Item Name:",
-            "• Descriptive name of the stationary item",
-            "• Should be clear and easily identifiable",
-            "• Examples: 'A4 Copy Paper', 'Blue Ballpoint Pens', 'Stapler - Heavy Duty'",
-            "",
-            "Description:",
-            "• Detailed description including specifications",
-            "• Brand information if applicable",
-            "• Size, color, or other distinguishing features",
-            "• Any special handling requirements",
-            "",
-            "Initial Quantity:",
-            "• Starting stock level for the new item",
-            "• Must be a positive number",
-            "• Represents current available quantity",
-            "",
-            "Storage Location:",
-            "• Physical location where item is stored",
-            "• Examples: 'Storeroom A', 'Cabinet 3-B', 'Main Warehouse'",
-            "• Helps staff locate items quickly",
-            "",
-            "Category:",
-            "• Classification of the item type",
-            "• Examples: 'Office Supplies', 'Paper Products', 'Writing Instruments'",
-            "• Used for reporting and organization",
-            "",
-            "Step-by-Step Process:",
-            "1. Access the Add Item form",
-            "2. Fill in all required fields carefully",
-            "3. Double-check information for accuracy",
-            "4. Click 'Add Item' to save to database",
-            "5. Confirm the item appears in the inventory list",
-            "",
-            "Best Practices:",
-            "• Use consistent naming conventions",
-            "• Include all relevant details in descriptions",
-            "• Verify quantities before entering",
-            "• Use standardized location names",
-            "• Choose appropriate categories for easy filtering"
-        ]
-        self.add_subsection("5.4 Adding New Items", add_items_content)
-        
-        # 6. Email Management
-        email_content = [
-            "The Email Management system provides automated communication capabilities for inventory-related notifications and reports.",
-            "",
-            "Core Email Features:",
-            "",
-            "Automated Reports:",
-            "• Daily inventory status reports",
-            "• Weekly summary reports",
-            "• Monthly comprehensive reports",
-            "• Custom report scheduling",
-            "",
-            "Alert Notifications:",
-            "• Low stock level warnings",
-            "• Out of stock alerts",
-            "• Reorder point notifications",
-            "• System maintenance announcements",
-            "",
-            "Email Configuration:",
-            "",
-            "SMTP Settings:",
-            "• Configure outgoing mail server",
-            "• Set authentication credentials",
-            "• Test email connectivity",
-            "• Verify delivery settings",
-            "",
-            "Template Management:",
-            "• Customize email templates",
-            "• Add company branding",
-            "• Modify message content",
-            "• Include dynamic data fields",
-            "",
-            "Recipient Management:",
-            "• Maintain distribution lists",
-            "• Add/remove email addresses",
-            "• Group recipients by role",
-            "• Set notification preferences",
-            "",
-            "Email Types and Usage:",
-            "",
-            "Low Stock Alerts:",
-            "• Automatically sent when items reach minimum levels",
-            "• Include item details and current quantities",
-            "• Suggest reorder quantities",
-            "• Provide supplier information if available",
-            "",
-            "Inventory Reports:",
-            "• Comprehensive inventory status",
-            "• Stock movement summaries",
-            "• Usage patterns and trends",
-            "• Formatted for easy reading",
-            "",
-            "System Notifications:",
-            "• Maintenance schedules",
-            "• System updates",
-            "• Security alerts",
-            "• User account changes",
-            "",
-            "Testing and Troubleshooting:",
-            "• Send test emails to verify configuration",
-            "• Check spam/junk folders",
-            "• Verify recipient email addresses",
-            "• Monitor delivery status",
-            "",
-            "Best Practices:",
-            "• Regularly test email functionality",
-            "• Keep recipient lists updated",
-            "• Use clear, professional email templates",
-            "• Set appropriate alert thresholds",
-            "• Monitor email delivery rates"
-        ]
-        self.add_section("6. Email Management", email_content)
-        
-        # 7. User Profile Management
-        profile_content = [
-            "User Profile Management allows users to view and manage their account information and system preferences.",
-            "",
-            "Profile Information:",
-            "• Full name display",
-            "• Email address (used for login)",
-            "• User role and permissions",
-            "• Account creation date",
-            "• Last login information",
-            "",
-            "Account Security:",
-            "• Change password functionality",
-            "• Session management",
-            "• Login history tracking",
-            "• Security notifications",
-            "",
-            "User Preferences:",
-            "• Email notification settings",
-            "• Dashboard layout preferences",
-            "• Report format preferences",
-            "• Time zone settings",
-            "",
-            "Logout Process:",
-            "1. Click the user profile area in the header",
-            "2. Select 'Logout' from the dropdown menu",
-            "3. Confirm logout if prompted",
-            "4. You will be redirected to the login page",
-            "",
-            "Security Best Practices:",
-            "• Always logout when finished using the system",
-            "• Use strong, unique passwords",
-            "• Report any suspicious account activity",
-            "• Keep contact information updated"
-        ]
-        self.add_section("7. User Profile Management", profile_content)
-        
-        # 8. Troubleshooting
-        troubleshooting_content = [
-            "Common Issues and Solutions:",
-            "",
-            "Login Problems:",
-            "",
-            "Cannot Login / Invalid Credentials:",
-            "• Verify email address is spelled correctly",
-            "• Check that Caps Lock is not enabled",
-            "• Ensure password is entered correctly",
-            "• Try resetting your password if available",
-            "• Contact system administrator for account verification",
-            "",
-            "Page Won't Load:",
-            "• Check your internet connection",
-            "• Refresh the page (F5 or Ctrl+R)",
-            "• Clear browser cache and cookies",
-            "• Try a different web browser",
-            "• Disable browser extensions temporarily",
-            "",
-            "Performance Issues:",
-            "",
-            "Slow Loading Times:",
-            "• Check internet connection speed",
-            "• Close unnecessary browser tabs",
-            "• Clear browser cache",
-            "• Restart your web browser",
-            "• Try using a different browser",
-            "",
-            "Data Not Updating:",
-            "• Refresh the page to get latest data",
-            "• Check if you have proper permissions",
-            "• Verify internet connection is stable",
-            "• Contact support if data appears corrupted",
-            "",
-            "Email Issues:",
-            "",
-            "Not Receiving Emails:",
-            "• Check spam/junk email folders",
-            "• Verify email address is correct in profile",
-            "• Ensure email notifications are enabled",
-            "• Contact administrator to verify email configuration",
-            "",
-            "Email Delivery Problems:",
-            "• Test email configuration in Email Management",
-            "• Verify SMTP settings with IT department",
-            "• Check recipient email addresses are valid",
-            "• Monitor email server status",
-            "",
-            "Browser Compatibility:",
-            "",
-            "Supported Browsers:",
-            "• Google Chrome 90 or later (recommended)",
-            "• Mozilla Firefox 88 or later",
-            "• Safari 14 or later",
-            "• Microsoft Edge 90 or later",
-            "",
-            "Browser Settings:",
-            "• Enable JavaScript",
-            "• Allow cookies for the application domain",
-            "• Disable popup blockers for the site",
-            "• Ensure browser is up to date",
-            "",
-            "When to Contact Support:",
-            "• Persistent login issues after trying above solutions",
-            "• Data corruption or loss",
-            "• System errors or unexpected behavior",
-            "• Need for additional user accounts or permissions",
-            "• Questions about system functionality",
-            "",
-            "Information to Provide When Contacting Support:",
-            "• Your name and email address",
-            "• Description of the problem",
-            "• Steps you've already tried",
-            "• Browser and version being used",
-            "• Any error messages received",
-            "• Screenshots if helpful"
-        ]
-        self.add_section("8. Troubleshooting", troubleshooting_content)
+        self.tree = tree if tree is not None else self.content_tree()
+        for node in self.tree:
+            if node["level"] == 1:
+                self.add_section(node["title"], node["paragraphs"])
+            else:
+                self.add_subsection(node["title"], node["paragraphs"])
+            if self.include_screenshots:
+                for image_path in node["images"]:
+                    self.add_screenshot(image_path)
+        
+        self.toc.finish()
+        return self.doc
+    
+    def write_to(self, stream):
+        """Build the manual and write it to a writable binary stream"""
+        self.build_document()
+        save_document(self.doc, stream)
+        return stream
+    
+    def to_bytes(self):
+        """Build the manual and return the .docx package as bytes"""
+        return self.write_to(BytesIO()).getvalue()
+    
+    def generate_manual(self, doc_path="User_Manual.docx", search_index_path=None):
+        """Generate the complete user manual
         
-        # 9. System Requirements
-        requirements_content = [
-            "Technical Requirements:",
-            "",
-            "Minimum Browser Requirements:",
-            "• Google Chrome 90 or later",
-            "• Mozilla Firefox 88 or later",
-            "• Safari 14 or later",
-            "• Microsoft Edge 90 or later",
-            "",
-            "Network Requirements:",
-            "• Stable internet connection",
-            "• Minimum 1 Mbps download speed",
-            "• Reliable network connectivity",
-            "• Access to application server",
-            "",
-            "Browser Configuration:",
-            "• JavaScript must be enabled",
-            "• Cookies must be enabled",
-            "• Popup blockers should allow the application",
-            "• Local storage should be enabled",
-            "",
-            "Security Requirements:",
-            "• HTTPS connection (automatically enforced)",
-            "• Modern TLS encryption support",
-            "• Certificate validation enabled",
-            "• Secure cookie support",
-            "",
-            "Hardware Recommendations:",
-            "• Minimum 4GB RAM",
-            "• Modern processor (Intel i3 or equivalent)",
-            "• Screen resolution 1024x768 or higher",
-            "• Keyboard and mouse/trackpad",
-            "",
-            "Operating System Compatibility:",
-            "• Windows 10 or later",
-            "• macOS 10.15 or later",
-            "• Linux (Ubuntu 18.04+ or equivalent)",
-            "• iOS 13+ (for mobile access)",
-            "• Android 8+ (for mobile access)"
-        ]
-        self.add_section("9. System Requirements", requirements_content)
+        When search_index_path is given, the full-text search index is
+        updated from the same sections (only changed sections are re-indexed).
+        """
+        print("Generating user manual...")
         
-        # 10. Appendix
-        appendix_content = [
-            "Additional Information and Resources:",
-            "",
-            "System Architecture:",
-            "• Built with Next.js and React for modern web performance",
-            "• Supabase backend for reliable data management",
-            "• Real-time data synchronization",
-            "• Cloud-based infrastructure for scalability",
-            "",
-            "Security Features:",
-            "• Secure HTTPS connection with TLS encryption",
-            "• Session-based authentication with timeout",
-            "• Role-based access control (RBAC)",
-            "• Data encryption in transit and at rest",
-            "• Regular security updates and patches",
-            "",
-            "Data Backup and Recovery:",
-            "• Automated daily backups",
-            "• Point-in-time recovery capabilities",
-            "• Redundant data storage",
-            "• Disaster recovery procedures",
-            "",
-            "Compliance and Standards:",
-            "• Industry-standard security practices",
-            "• Data privacy protection",
-            "• Audit trail maintenance",
-            "• Regular security assessments",
-            "",
-            "Support and Maintenance:",
-            "• Regular system updates",
-            "• Performance monitoring",
-            "• Proactive issue resolution",
-            "• User training and documentation",
-            "",
-            "Contact Information:",
-            "• System Administrator: [Contact your IT department]",
-            "• Technical Support: [Contact your IT helpdesk]",
-            "• User Training: [Contact your training coordinator]",
-            "",
-            "Version Information:",
-            f"• Manual Version: 1.0",
-            f"• Generated: {datetime.now().strftime('%B %d, %Y')}",
-            "• System Version: Latest",
-            "",
-            "Glossary of Terms:",
-            "",
-            "• Inventory: Collection of stationary and office supplies",
-            "• Stock Level: Current quantity of an item available",
-            "• Transaction: Any change to inventory (in, out, adjustment)",
-            "• Audit Trail: Complete record of all system changes",
-            "• RBAC: Role-Based Access Control for security",
-            "• SMTP: Simple Mail Transfer Protocol for email",
-            "• Dashboard: Main overview screen of the application",
-            "• Session: Period of active use after login",
-            "",
-            "Keyboard Shortcuts:",
-            "• Ctrl+R or F5: Refresh page",
-            "• Ctrl+F: Search on current page",
-            "• Tab: Navigate between form fields",
-            "• Enter: Submit forms or confirm actions",
-            "• Esc: Cancel dialogs or close popups",
-            "",
-            "Tips for Efficient Use:",
-            "• Use the search functionality to quickly find items",
-            "• Regularly check stock levels to prevent shortages",
-            "• Keep item descriptions detailed and accurate",
-            "• Use consistent naming conventions",
-            "• Take advantage of bulk operations when possible",
-            "• Set up email alerts for important notifications",
-            "• Regularly review stock history for insights",
-            "",
-            "Future Enhancements:",
-            "• Mobile application development",
-            "• Advanced reporting and analytics",
-            "• Integration with procurement systems",
-            "• Barcode scanning capabilities",
-            "• Automated reordering features"
-        ]
-        self.add_section("10. Appendix", appendix_content)
+        self.build_document()
         
         # Save document
-        doc_path = "User_Manual.docx"
-        self.doc.save(doc_path)
+        save_document(self.doc, doc_path)
         print(f"User manual saved as: {doc_path}")
         
+        if search_index_path:
+            changed = update_index(self.tree, search_index_path)
+            print(f"Search index updated: {search_index_path} ({changed} sections re-indexed)")
+        
         return doc_path
 
 def main():
     """Main function to run the basic user manual generator"""
+    names = [section_name(entry["title"]) for entry in manual_sections() if entry["level"] == 1]
+    parser = argparse.ArgumentParser(description="Generate the user manual without screenshots")
+    parser.add_argument("--sections", help=f"Comma-separated sections to build ({', '.join(names)})")
+    parser.add_argument("--output", default="User_Manual.docx", help="Manual file to write")
+    args = parser.parse_args()
+    
+    only = None
+    if args.sections is not None:
+        only = [name.strip() for name in args.sections.split(",") if name.strip()]
+        unknown = [name for name in only if name not in names]
+        if unknown:
+            parser.error(f"unknown section: {', '.join(unknown)} (choose from {', '.join(names)})")
+    
     print("=== Inventory Management System - Basic User Manual Generator ===")
     print("Generating comprehensive user manual...")
     print()
     
-    generator = BasicUserManualGenerator()
-    doc_path = generator.generate_manual()
+    generator = BasicUserManualGenerator(only_sections=only)
+    doc_path = generator.generate_manual(args.output, search_index_path=index_path(args.output))
     
     print("\n=== Manual Generation Complete ===")
     print(f"✓ User manual created: {doc_path}")
@@ -793,4 +930,4 @@ def main():
     print("\nThe manual is ready for use and can be distributed to users.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
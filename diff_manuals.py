@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""
+Structural Diff Between Two Generated User Manuals
+Streams the body of two DOCX packages, hashes every paragraph and embedded
+image, groups them by section and reports added, removed and changed sections
+and images. Sections are matched by title in one dictionary pass and only
+changed sections are diffed paragraph by paragraph, aligned on paragraphs that
+occur once in both versions (patience diff), so the cost stays close to linear
+in the size of the manuals. Optionally writes an HTML side-by-side report.
+"""
+
+import re
+import sys
+import html
+import base64
+import bisect
+import hashlib
+import difflib
+import argparse
+import posixpath
+import time
+from collections import Counter
+from zipfile import ZipFile
+
+from lxml import etree
+
+W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+R = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+A = "http://schemas.openxmlformats.org/drawingml/2006/main"
+
+W_P = f"{{{W}}}p"
+W_T = f"{{{W}}}t"
+W_PSTYLE = f"{{{W}}}pStyle"
+W_OUTLINE = f"{{{W}}}outlineLvl"
+W_VAL = f"{{{W}}}val"
+A_BLIP = f"{{{A}}}blip"
+R_EMBED = f"{{{R}}}embed"
+
+# Heading styles recognized when a paragraph carries no outline level
+HEADING_STYLES = {"CustomHeading1": 1, "CustomHeading2": 2, "Heading1": 1, "Heading2": 2}
+
+NUMBER_PREFIX = re.compile(r"^\d+(\.\d+)*\.?\s+")
+
+FRONT_MATTER = "(front matter)"
+
+
+def digest(data):
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+class Section:
+    """Paragraphs and images between two headings"""
+
+    def __init__(self, title, level):
+        self.title = title
+        self.level = level
+        self.paragraphs = []
+        self.images = []
+        self._hash = hashlib.blake2b(title.encode("utf-8"), digest_size=8)
+
+    def add(self, text, images):
+        line = f"{text}\0{' '.join(images)}"
+        self.paragraphs.append((digest(line.encode("utf-8")), text, images))
+        self.images.extend(images)
+        self._hash.update(line.encode("utf-8") + b"\n")
+
+    @property
+    def hash(self):
+        return self._hash.hexdigest()
+
+    @property
+    def key(self):
+        """Title without its number, so renumbered sections still match"""
+        return NUMBER_PREFIX.sub("", self.title).strip().lower()
+
+
+class Manual:
+    """Sections and media of one DOCX, read in a single streaming pass"""
+
+    def __init__(self, path):
+        self.path = path
+        self.sections = []
+        self.media = {}
+        self.paragraph_count = 0
+        with ZipFile(path) as package:
+            targets = self._image_targets(package)
+            media_hashes = {}
+            current = Section(FRONT_MATTER, 0)
+            self.sections.append(current)
+
+            with package.open("word/document.xml") as stream:
+                for _, p in etree.iterparse(stream, events=("end",), tag=W_P, huge_tree=True):
+                    text = "".join(t.text or "" for t in p.iter(W_T))
+                    images = []
+                    for blip in p.iter(A_BLIP):
+                        target = targets.get(blip.get(R_EMBED))
+                        if target is None:
+                            continue
+                        if target not in media_hashes:
+                            data = package.read(target)
+                            media_hashes[target] = digest(data)
+                            self.media[media_hashes[target]] = (target, data)
+                        images.append(media_hashes[target])
+
+                    level = self._heading_level(p)
+                    if level and text.strip():
+                        current = Section(text.strip(), level)
+                        self.sections.append(current)
+                    else:
+                        current.add(text, images)
+                    self.paragraph_count += 1
+
+                    # Drop finished paragraphs so memory does not grow with the document
+                    p.clear(keep_tail=True)
+                    while p.getprevious() is not None:
+                        del p.getparent()[0]
+
+        if not self.sections[0].paragraphs:
+            self.sections.pop(0)
+
+    @staticmethod
+    def _image_targets(package):
+        """Map document relationship ids to media member names"""
+        root = etree.fromstring(package.read("word/_rels/document.xml.rels"))
+        targets = {}
+        for rel in root:
+            if rel.get("TargetMode") != "External" and rel.get("Type", "").endswith("/image"):
+                targets[rel.get("Id")] = posixpath.normpath(posixpath.join("word", rel.get("Target"))).lstrip("/")
+        return targets
+
+    @staticmethod
+    def _heading_level(p):
+        ppr = p.find(f"{{{W}}}pPr")
+        if ppr is None:
+            return 0
+        outline = ppr.find(W_OUTLINE)
+        if outline is not None:
+            return int(outline.get(W_VAL)) + 1
+        style = ppr.find(W_PSTYLE)
+        return HEADING_STYLES.get(style.get(W_VAL), 0) if style is not None else 0
+
+    def keyed_sections(self):
+        """{(title key, occurrence): section}, telling repeated titles apart"""
+        seen = Counter()
+        keyed = {}
+        for section in self.sections:
+            seen[section.key] += 1
+            keyed[(section.key, seen[section.key])] = section
+        return keyed
+
+
+def _unique_anchors(a, b, alo, ahi, blo, bhi):
+    """(i, j) pairs of items that occur once in a[alo:ahi] and once in b[blo:bhi]
+
+    Only the longest run of pairs in the same order in both is returned
+    (patience sorting), so the pairs can anchor an alignment.
+    """
+    counts = {}
+    for i in range(alo, ahi):
+        entry = counts.setdefault(a[i], [0, i, 0, None])
+        entry[0] += 1
+    for j in range(blo, bhi):
+        entry = counts.get(b[j])
+        if entry is not None:
+            entry[2] += 1
+            entry[3] = j
+    pairs = sorted((i, j) for in_a, i, in_b, j in counts.values() if in_a == 1 and in_b == 1)
+
+    tails, tail_pairs, previous = [], [], []
+    for index, (_, j) in enumerate(pairs):
+        position = bisect.bisect_left(tails, j)
+        if position == len(tails):
+            tails.append(j)
+            tail_pairs.append(index)
+        else:
+            tails[position] = j
+            tail_pairs[position] = index
+        previous.append(tail_pairs[position - 1] if position else -1)
+
+    anchors = []
+    index = tail_pairs[-1] if tail_pairs else -1
+    while index >= 0:
+        anchors.append(pairs[index])
+        index = previous[index]
+    return anchors[::-1]
+
+
+def _matching_blocks(a, b, alo, ahi, blo, bhi, blocks):
+    """Append (i, j, size) blocks of a[alo:ahi] matching b[blo:bhi] to blocks, in order"""
+    while alo < ahi and blo < bhi and a[alo] == b[blo]:
+        blocks.append((alo, blo, 1))
+        alo, blo = alo + 1, blo + 1
+    suffix = []
+    while alo < ahi and blo < bhi and a[ahi - 1] == b[bhi - 1]:
+        ahi, bhi = ahi - 1, bhi - 1
+        suffix.append((ahi, bhi, 1))
+
+    if alo < ahi and blo < bhi:
+        anchors = _unique_anchors(a, b, alo, ahi, blo, bhi)
+        if anchors:
+            for i, j in anchors:
+                _matching_blocks(a, b, alo, i, blo, j, blocks)
+                blocks.append((i, j, 1))
+                alo, blo = i + 1, j + 1
+            _matching_blocks(a, b, alo, ahi, blo, bhi, blocks)
+        else:
+            # Nothing unique left (e.g. runs of blank paragraphs); autojunk keeps long runs fast
+            matcher = difflib.SequenceMatcher(None, a[alo:ahi], b[blo:bhi])
+            blocks.extend((alo + i, blo + j, size) for i, j, size in matcher.get_matching_blocks() if size)
+    blocks.extend(reversed(suffix))
+
+
+def paragraph_opcodes(a, b):
+    """difflib-style opcodes turning the paragraph hashes a into b"""
+    blocks = []
+    _matching_blocks(a, b, 0, len(a), 0, len(b), blocks)
+    opcodes = []
+    i = j = 0
+    for block_i, block_j, size in blocks + [(len(a), len(b), 0)]:
+        if i < block_i and j < block_j:
+            opcodes.append(("replace", i, block_i, j, block_j))
+        elif i < block_i:
+            opcodes.append(("delete", i, block_i, j, j))
+        elif j < block_j:
+            opcodes.append(("insert", i, i, j, block_j))
+        if size:
+            if opcodes and opcodes[-1][0] == "equal" and opcodes[-1][2] == block_i:
+                opcodes[-1] = ("equal", opcodes[-1][1], block_i + size, opcodes[-1][3], block_j + size)
+            else:
+                opcodes.append(("equal", block_i, block_i + size, block_j, block_j + size))
+        i, j = block_i + size, block_j + size
+    return opcodes
+
+
+def diff_manuals(old, new):
+    """Compare two Manuals
+
+    Returns a list of (status, old section, new section, opcodes) in the new
+    manual's order with removed sections after their predecessor. status is
+    "added", "removed", "changed" or "same"; opcodes (as from difflib) come
+    from paragraph_opcodes and are only computed for changed sections.
+    """
+    old_keyed = old.keyed_sections()
+    new_keyed = new.keyed_sections()
+    new_keys = set(new_keyed)
+
+    removed_after = {}
+    previous = None
+    for key, section in old_keyed.items():
+        if key in new_keys:
+            previous = key
+        else:
+            removed_after.setdefault(previous, []).append(section)
+
+    result = [("removed", section, None, None) for section in removed_after.get(None, [])]
+    for key, section in new_keyed.items():
+        before = old_keyed.get(key)
+        if before is None:
+            result.append(("added", None, section, None))
+        elif before.hash == section.hash and before.title == section.title:
+            result.append(("same", before, section, None))
+        else:
+            opcodes = paragraph_opcodes([p[0] for p in before.paragraphs], [p[0] for p in section.paragraphs])
+            result.append(("changed", before, section, opcodes))
+        result.extend(("removed", removed, None, None) for removed in removed_after.get(key, []))
+    return result
+
+
+def image_changes(old_section, new_section):
+    """(added, removed) image digests between two versions of a section"""
+    old_images = Counter(old_section.images if old_section else [])
+    new_images = Counter(new_section.images if new_section else [])
+    return list((new_images - old_images).elements()), list((old_images - new_images).elements())
+
+
+def text_report(old, new, changes):
+    counts = Counter(status for status, _, _, _ in changes)
+    yield f"--- {old.path} ({len(old.sections)} sections, {old.paragraph_count} paragraphs)"
+    yield f"+++ {new.path} ({len(new.sections)} sections, {new.paragraph_count} paragraphs)"
+    for status, before, after, opcodes in changes:
+        if status == "same":
+            continue
+        section = after or before
+        line = f"{status.upper():<8} {section.title}"
+        if status == "changed":
+            edits = Counter(tag for tag, *_ in opcodes if tag != "equal")
+            details = [f"{count} {tag}" for tag, count in sorted(edits.items())]
+            if before.title != after.title:
+                details.append(f"was \"{before.title}\"")
+            added, removed = image_changes(before, after)
+            if added or removed:
+                details.append(f"images +{len(added)}/-{len(removed)}")
+            line += f"  ({', '.join(details) or 'reordered'})"
+        yield line
+
+    old_media, new_media = set(old.media), set(new.media)
+    yield ""
+    yield (f"Sections: {counts['added']} added, {counts['removed']} removed, {counts['changed']} changed, "
+           f"{counts['same']} unchanged")
+    yield f"Images: {len(new_media - old_media)} added, {len(old_media - new_media)} removed"
+
+
+REPORT_STYLE = """
+body { font-family: Arial, Helvetica, sans-serif; margin: 2em; color: #222; }
+h1 { font-size: 18pt; } h2 { font-size: 13pt; margin-top: 2em; }
+table { border-collapse: collapse; width: 100%; table-layout: fixed; }
+td { vertical-align: top; padding: 2px 6px; border-bottom: 1px solid #eee; white-space: pre-wrap; word-wrap: break-word; }
+td.del { background: #fde8e8; } td.ins { background: #e6f4ea; } td.empty { background: #f6f6f6; }
+.added h2 { color: #1e7b34; } .removed h2 { color: #b42318; } .changed h2 { color: #1a56db; }
+img { max-width: 100%; max-height: 240px; border: 1px solid #ddd; }
+.summary { color: #555; }
+"""
+
+
+def _cell(css, paragraph, manual):
+    if paragraph is None:
+        return '<td class="empty"></td>'
+    _, text, images = paragraph
+    content = html.escape(text)
+    for image in images:
+        name, data = manual.media[image]
+        mime = "image/jpeg" if name.lower().endswith((".jpg", ".jpeg")) else "image/png"
+        content += f'<br><img src="data:{mime};base64,{base64.b64encode(data).decode("ascii")}" alt="{html.escape(name)}">'
+    return f'<td class="{css}">{content}</td>'
+
+
+def html_report(old, new, changes, path):
+    """Write a side-by-side HTML report of every section that differs"""
+    parts = [
+        "<!DOCTYPE html><html><head><meta charset=\"utf-8\"><title>Manual diff</title>",
+        f"<style>{REPORT_STYLE}</style></head><body>",
+        f"<h1>{html.escape(old.path)} &rarr; {html.escape(new.path)}</h1>",
+        "<p class=\"summary\">" + "<br>".join(html.escape(line) for line in list(text_report(old, new, changes))[-2:]) + "</p>",
+    ]
+    for status, before, after, opcodes in changes:
+        if status == "same":
+            continue
+        section = after or before
+        parts.append(f'<div class="{status}"><h2>{status.title()}: {html.escape(section.title)}</h2><table>')
+        if status == "added":
+            rows = [(None, paragraph) for paragraph in after.paragraphs]
+        elif status == "removed":
+            rows = [(paragraph, None) for paragraph in before.paragraphs]
+        else:
+            rows = []
+            for tag, i1, i2, j1, j2 in opcodes:
+                if tag == "equal":
+                    continue
+                left, right = before.paragraphs[i1:i2], after.paragraphs[j1:j2]
+                for index in range(max(len(left), len(right))):
+                    rows.append((left[index] if index < len(left) else None,
+                                 right[index] if index < len(right) else None))
+        for left, right in rows:
+            parts.append(f"<tr>{_cell('del', left, old)}{_cell('ins', right, new)}</tr>")
+        parts.append("</table></div>")
+    parts.append("</body></html>")
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(parts))
+    return path
+
+
+def main():
+    """Main function to compare two manuals"""
+    parser = argparse.ArgumentParser(description="Structural diff between two User Manual .docx files")
+    parser.add_argument("old", help="Previous manual")
+    parser.add_argument("new", help="Regenerated manual")
+    parser.add_argument("--html", metavar="PATH", help="Also write a side-by-side HTML report")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    old, new = Manual(args.old), Manual(args.new)
+    changes = diff_manuals(old, new)
+    elapsed = time.perf_counter() - start
+
+    print("\n".join(text_report(old, new, changes)))
+    print(f"Compared in {elapsed:.2f}s")
+    if args.html:
+        html_report(old, new, changes, args.html)
+        print(f"✓ HTML report written to {args.html}")
+
+    # Like diff(1): 0 when identical, 1 when the manuals differ
+    return 0 if all(status == "same" for status, _, _, _ in changes) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,10 +5,17 @@ This script automatically generates a comprehensive user manual by touring the w
 """
 
 import os
-import time
+import re
 import sys
+import time
+import asyncio
+import argparse
+import multiprocessing
+from io import BytesIO
 from datetime import datetime
+from contextlib import nullcontext
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 
 try:
     from selenium import webdriver
@@ -17,6 +24,7 @@ try:
     from selenium.webdriver.support import expected_conditions as EC
     from selenium.webdriver.chrome.options import Options
     from selenium.webdriver.common.action_chains import ActionChains
+    from selenium.webdriver.common.keys import Keys
 except ImportError:
     print("Installing selenium...")
     os.system("pip install selenium")
@@ -26,31 +34,146 @@ except ImportError:
     from selenium.webdriver.support import expected_conditions as EC
     from selenium.webdriver.chrome.options import Options
     from selenium.webdriver.common.action_chains import ActionChains
+    from selenium.webdriver.common.keys import Keys
 
 try:
-    from docx import Document
-    from docx.shared import Inches, Pt
+    from docx.shared import Inches
     from docx.enum.text import WD_ALIGN_PARAGRAPH
-    from docx.enum.style import WD_STYLE_TYPE
     from docx.oxml.shared import OxmlElement, qn
+    from docx.opc.constants import RELATIONSHIP_TYPE as RT
 except ImportError:
     print("Installing python-docx...")
     os.system("pip install python-docx")
-    from docx import Document
-    from docx.shared import Inches, Pt
+    from docx.shared import Inches
     from docx.enum.text import WD_ALIGN_PARAGRAPH
-    from docx.enum.style import WD_STYLE_TYPE
     from docx.oxml.shared import OxmlElement, qn
+    from docx.opc.constants import RELATIONSHIP_TYPE as RT
+
+from manual_template import new_document, apply_manual_styles
+from manual_toc import TableOfContents
+from manual_images import docx_media
+from manual_package import save_document
+from manual_annotate import annotate_screenshot, element_boxes, visible_boxes, callout_legend
+from manual_recorder import CLIP_FORMATS, FrameRecorder, ffmpeg_available
+from manual_perf import PERF_DIR, PerformanceRecorder, appendix_paragraphs
+from perf_budget import DEFAULT_BUDGET_PATH, check_run, report_lines
+from manual_plan import BuildPlan, record_step
+from manual_memory import MemoryProfiler
+from manual_async import AsyncTourRunner
+from manual_archive import DEFAULT_ARCHIVE_PATH, PageArchive
+from manual_search import index_path, update_index
+from network_profiles import (NETWORK_PROFILES, QUIET_MS, SETTLED_SCRIPT, install_network_tracker,
+                              apply_network_profile)
+
+# Device metrics for Emulation.setDeviceMetricsOverride. Tablet and mobile sit on
+# either side of the 768px MOBILE_BREAKPOINT in hooks/use-mobile.tsx.
+VIEWPORTS = {
+    "desktop": {"width": 1920, "height": 1080, "deviceScaleFactor": 1, "mobile": False},
+    "tablet": {"width": 768, "height": 1024, "deviceScaleFactor": 2, "mobile": True},
+    "mobile": {"width": 390, "height": 844, "deviceScaleFactor": 3, "mobile": True},
+}
+
+# Resolves after the next two frames, i.e. once the new layout has been painted
+AFTER_LAYOUT_SCRIPT = """
+const done = arguments[arguments.length - 1];
+requestAnimationFrame(() => requestAnimationFrame(() => done(true)));
+"""
+
+# Tour steps in tour order: the generator method, whether it expects a signed-in
+# session, the app sources its screenshots show (relative to the repository), the
+# walkthrough clip recorded for it, if any, and the step whose page it continues
+# on ("after"; toured in the same browser session when both are built)
+TOUR_STEPS = {
+    "landing": {"method": "capture_landing_page", "needs_session": False,
+                "sources": ["app/page.tsx", "components/auth"]},
+    "authentication": {"method": "capture_authentication", "needs_session": False,
+                       "sources": ["components/auth"], "after": "landing"},
+    "dashboard": {"method": "capture_dashboard", "needs_session": True,
+                  "sources": ["app/dashboard", "components/dashboard"], "clip": "02_dashboard"},
+    "inventory": {"method": "capture_inventory_management", "needs_session": True,
+                  "sources": ["app/inventory", "components/inventory"], "clip": "03_inventory"},
+    "email": {"method": "capture_email_management", "needs_session": True,
+              "sources": ["app/email-management", "components/email"]},
+}
+
+# Sections written without the browser, in manual order after the tour
+TEXT_SECTIONS = {
+    "getting_started": "add_getting_started_section",
+    "user_profile": "add_user_profile_section",
+    "troubleshooting": "add_troubleshooting_section",
+    "system_requirements": "add_system_requirements_section",
+    "appendix": "add_appendix_section",
+    "performance": "add_performance_appendix",
+}
+
+# Default test account, used unless credentials are passed in
+DEFAULT_CREDENTIALS = ("wastiaman123@gmail.com", "polo0987")
 
 class UserManualGenerator:
-    def __init__(self, base_url="http://localhost:3000"):
+    def __init__(self, base_url="http://localhost:3000", viewports=("desktop",), record_fps=None,
+                 clip_format="mp4", network_profile=None, credentials=None, profile_memory=False,
+                 memory_budget_mb=None, archive_path=None):
         self.base_url = base_url
         self.driver = None
-        self.doc = Document()
         
-        # Test credentials (you may need to adjust these)
-        self.test_email = "wastiaman123@gmail.com"
-        self.test_password = "polo0987"
+        # Throttled runs keep their screenshots and samples apart and wait longer
+        self.network_profile = network_profile
+        self.timeout_scale = NETWORK_PROFILES[network_profile]["timeout_scale"] if network_profile else 1
+        
+        # Walkthrough clips are recorded only when a frame rate is given
+        self.record_fps = record_fps
+        self.clip_format = clip_format
+        self.recorder = None
+        self.clips = []
+        
+        # Page timings collected at every tour step, and what the budget check found
+        self.perf = None
+        self.perf_run_id = None
+        self.performance_regressions = []
+        
+        # Per-phase peak memory (see --profile-memory); a budget alone also turns it on
+        self.memory = MemoryProfiler(enabled=profile_memory or bool(memory_budget_mb), budget_mb=memory_budget_mb)
+        
+        # MHTML snapshots of every captured page (see manual_archive), opened on first use
+        self.archive_path = archive_path
+        self.archive = None
+        
+        # The first viewport is the primary one: its screenshots go into the main manual
+        self.viewports = list(viewports)
+        self.doc = new_document()
+        self.toc = TableOfContents(self.doc)
+        
+        self.screenshots_dir = Path("network_runs") / network_profile if network_profile else Path("screenshots")
+        
+        # Sections as passed to add_section, renderable by manual_render
+        self.content_tree = []
+        
+        # content_tree entries added by each tour step and text section, so the
+        # document can be rebuilt after re-running only some of them
+        self.section_nodes = {}
+        
+        # Watch mode keeps the browser open between builds
+        self.keep_browser = False
+        
+        # Screenshot paths captured during this run, in tour order
+        self.captured = []
+        
+        # Screenshots are written and encoded in the background while the tour continues
+        self.image_pool = ThreadPoolExecutor(max_workers=4)
+        self.image_jobs = {}
+        
+        # Set by manual_async: screenshots go through its bounded queue, and
+        # on_section(name, content_tree entries) is called as each section ends
+        self.image_queue = None
+        self.on_section = None
+        
+        # Close-ups are cropped and annotated in worker processes, started on first use
+        self.annotation_pool = None
+        self.last_screenshot_png = None
+        
+        # Test credentials (see --credentials-env)
+        self.test_email, self.test_password = credentials or DEFAULT_CREDENTIALS
+        self.signed_in = False
         
     def setup_driver(self):
         """Setup Chrome WebDriver with appropriate options"""
@@ -61,9 +184,15 @@ class UserManualGenerator:
         chrome_options.add_argument("--disable-gpu")
         
         try:
+            started = time.perf_counter()
             self.driver = webdriver.Chrome(options=chrome_options)
             self.driver.maximize_window()
             print("Chrome WebDriver initialized successfully")
+            install_network_tracker(self.driver)
+            if self.network_profile:
+                apply_network_profile(self.driver, self.network_profile)
+                print(f"Network profile: {self.network_profile}")
+            record_step("setup", "setup", time.perf_counter() - started)
         except Exception as e:
             print(f"Error initializing Chrome WebDriver: {e}")
             print("Please ensure Chrome and ChromeDriver are installed")
@@ -74,7 +203,7 @@ class UserManualGenerator:
     def wait_for_element(self, by, value, timeout=10):
         """Wait for an element to be present"""
         try:
-            return WebDriverWait(self.driver, timeout).until(
+            return WebDriverWait(self.driver, timeout * self.timeout_scale).until(
                 EC.presence_of_element_located((by, value))
             )
         except Exception as e:
@@ -84,40 +213,25 @@ class UserManualGenerator:
     def wait_for_page_load(self, timeout=10):
         """Wait for page to load completely"""
         try:
-            WebDriverWait(self.driver, timeout).until(
+            WebDriverWait(self.driver, timeout * self.timeout_scale).until(
                 lambda driver: driver.execute_script("return document.readyState") == "complete"
             )
-            time.sleep(2)  # Additional wait for dynamic content
         except Exception as e:
             print(f"Page load timeout: {e}")
+        self.wait_for_settled(timeout)
+    
+    def wait_for_settled(self, timeout=10):
+        """Wait until requests, spinners and animations have finished (see SETTLED_SCRIPT)"""
+        try:
+            WebDriverWait(self.driver, timeout * self.timeout_scale, poll_frequency=0.1).until(
+                lambda driver: driver.execute_script(SETTLED_SCRIPT, QUIET_MS)
+            )
+        except Exception as e:
+            print(f"Page did not settle: {e}")
     
     def setup_document_styles(self):
-        """Setup document styles"""
-        # Title style
-        title_style = self.doc.styles.add_style('CustomTitle', WD_STYLE_TYPE.PARAGRAPH)
-        title_font = title_style.font
-        title_font.name = 'Arial'
-        title_font.size = Pt(24)
-        title_font.bold = True
-        title_style.paragraph_format.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        title_style.paragraph_format.space_after = Pt(12)
-        
-        # Heading styles
-        heading1_style = self.doc.styles.add_style('CustomHeading1', WD_STYLE_TYPE.PARAGRAPH)
-        heading1_font = heading1_style.font
-        heading1_font.name = 'Arial'
-        heading1_font.size = Pt(18)
-        heading1_font.bold = True
-        heading1_style.paragraph_format.space_before = Pt(12)
-        heading1_style.paragraph_format.space_after = Pt(6)
-        
-        heading2_style = self.doc.styles.add_style('CustomHeading2', WD_STYLE_TYPE.PARAGRAPH)
-        heading2_font = heading2_style.font
-        heading2_font.name = 'Arial'
-        heading2_font.size = Pt(14)
-        heading2_font.bold = True
-        heading2_style.paragraph_format.space_before = Pt(6)
-        heading2_style.paragraph_format.space_after = Pt(3)
+        """Setup document styles (already present when built from the template)"""
+        apply_manual_styles(self.doc)
     
     def add_cover_page(self):
         """Add cover page to the document"""
@@ -149,38 +263,186 @@ class UserManualGenerator:
         toc_heading = self.doc.add_paragraph("TABLE OF CONTENTS", style='CustomHeading1')
         toc_heading.alignment = WD_ALIGN_PARAGRAPH.CENTER
         
-        toc_items = [
-            "1. Introduction",
-            "2. Getting Started",
-            "3. Authentication System",
-            "4. Dashboard Overview",
-            "5. Inventory Management",
-            "6. Email Management",
-            "7. User Profile Management",
-            "8. Troubleshooting",
-            "9. Appendix"
-        ]
-        
-        for item in toc_items:
-            self.doc.add_paragraph(item, style='Normal')
+        # Entries are filled in from the headings as the sections are added
+        self.toc.insert()
         
         self.doc.add_page_break()
     
-    def add_section(self, title, content):
-        """Add a section with title and content"""
+    def viewport_path(self, name, viewport):
+        """Screenshot path for a viewport; the primary one keeps screenshots/<name>.png"""
+        if viewport == self.viewports[0]:
+            return self.screenshots_dir / f"{name}.png"
+        return self.screenshots_dir / viewport / f"{name}.png"
+    
+    def emulate_viewport(self, viewport):
+        """Resize the loaded page to a viewport through CDP, without reloading it"""
+        metrics = VIEWPORTS[viewport]
+        self.driver.execute_cdp_cmd("Emulation.setDeviceMetricsOverride", metrics)
+        self.driver.execute_cdp_cmd("Emulation.setTouchEmulationEnabled", {"enabled": metrics["mobile"]})
+        self.driver.execute_async_script(AFTER_LAYOUT_SCRIPT)
+    
+    @staticmethod
+    def _store_screenshot(path, png):
+        """Write a screenshot and prepare its DOCX media (runs in the image pool)"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(png)
+        docx_media(str(path))
+        return str(path)
+    
+    def capture_screenshot(self, name):
+        """Screenshot the current page in every viewport and return the primary path
+        
+        Secondary viewports are captured first so the page is left in the
+        primary layout for the rest of the tour.
+        """
+        if self.perf:
+            self.perf.collect(name)
+        if self.archive_path:
+            self.archive_page(name)
+        try:
+            with self.memory.phase(f"capture {name}"):
+                viewports = self.viewports[1:] + self.viewports[:1]
+                # A clip being recorded keeps the primary layout's frame size
+                with self.recorder.paused() if self.recorder and len(viewports) > 1 else nullcontext():
+                    for viewport in viewports:
+                        if len(viewports) > 1:
+                            self.emulate_viewport(viewport)
+                        path = self.viewport_path(name, viewport)
+                        png = self.driver.get_screenshot_as_png()
+                        pool = self.image_queue or self.image_pool
+                        self.image_jobs[str(path)] = pool.submit(self._store_screenshot, path, png)
+                        self.captured.append(str(path))
+            self.last_screenshot_png = png
+            return str(self.viewport_path(name, self.viewports[0]))
+        except Exception as e:
+            print(f"Could not capture screenshot {name}: {e}")
+            return None
+    
+    def archive_page(self, name):
+        """Add an MHTML snapshot of the current page to the page archive"""
+        try:
+            if self.archive is None:
+                self.archive = PageArchive(self.archive_path)
+            self.archive.capture(self.driver, name)
+        except Exception as e:
+            print(f"Could not archive {name}: {e}")
+    
+    def capture_closeup(self, name, targets):
+        """Screenshot the page plus a numbered close-up of the elements a section describes
+        
+        targets is a list of (label, CSS selector or XPath). Returns
+        (screenshot path, close-up path or None, legend lines). The close-up
+        is drawn in a worker process; add_screenshot waits for it.
+        """
+        screenshot = self.capture_screenshot(name)
+        if screenshot is None:
+            return None, None, []
+        try:
+            boxes = visible_boxes(element_boxes(self.driver, targets), self.last_screenshot_png)
+        except Exception as e:
+            print(f"Could not locate elements for {name}: {e}")
+            return screenshot, None, []
+        if not boxes:
+            return screenshot, None, []
+        
+        if self.annotation_pool is None:
+            # Spawn rather than fork: the image threads may hold locks at this point
+            self.annotation_pool = ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context("spawn"))
+        closeup = str(self.screenshots_dir / "closeups" / f"{name}.png")
+        self.image_jobs[closeup] = self.annotation_pool.submit(
+            annotate_screenshot, self.last_screenshot_png, boxes, closeup
+        )
+        return screenshot, closeup, ["", "Highlighted in the close-up:"] + callout_legend(boxes)
+    
+    def wait_for_images(self, paths=None):
+        """Block until the given (or all) background screenshot jobs have finished"""
+        for path in (paths if paths is not None else list(self.image_jobs)):
+            job = self.image_jobs.get(path)
+            if job is not None:
+                job.result()
+    
+    def add_screenshot(self, image_path):
+        """Add a screenshot scaled to the page width
+        
+        Images go through the media cache, so identical screenshots are
+        stored once in word/media however often they are used.
+        """
+        self.wait_for_images([image_path])
+        self.doc.add_picture(docx_media(image_path), width=Inches(6))
+        self.doc.paragraphs[-1].alignment = WD_ALIGN_PARAGRAPH.CENTER
+    
+    def add_section(self, title, content, images=None):
+        """Add a section with title, content and optional screenshots"""
+        images = [path for path in (images or []) if path]
+        node = {
+            "level": 2 if re.match(r"\d+\.\d+ ", title) else 1,
+            "title": title,
+            "paragraphs": list(content) if isinstance(content, list) else [content],
+            "images": images,
+        }
+        self.content_tree.append(node)
+        # Under manual_async the writer adds the entry once its images are encoded,
+        # so the tour never waits for an encoder
+        if self.on_section is None:
+            self.write_section(node)
+    
+    def write_section(self, node):
+        """Write one content_tree entry into the document"""
         # Add heading
-        self.doc.add_paragraph(title, style='CustomHeading1')
+        heading = self.doc.add_paragraph(node["title"], style='CustomHeading1')
+        self.toc.add_heading(heading, node["level"])
         
         # Add content
-        if isinstance(content, list):
-            for paragraph in content:
-                self.doc.add_paragraph(paragraph, style='Normal')
-        else:
-            self.doc.add_paragraph(content, style='Normal')
+        for paragraph in node["paragraphs"]:
+            self.doc.add_paragraph(paragraph, style='Normal')
+        
+        for image_path in node["images"]:
+            self.add_screenshot(image_path)
         
         # Add space after section
         self.doc.add_paragraph("")
     
+    def run_section(self, name, method):
+        """Run a tour step or text section and remember the content_tree entries it adds
+        
+        Its duration, images and text size go to the step history for --plan.
+        """
+        start = len(self.content_tree)
+        started = time.perf_counter()
+        try:
+            with self.memory.phase(f"section {name}"):
+                return method()
+        finally:
+            nodes = self.section_nodes[name] = self.content_tree[start:]
+            record_step(
+                name, "page" if name in TOUR_STEPS else "section", time.perf_counter() - started,
+                images=[image for node in nodes for image in node["images"]],
+                text_bytes=sum(len(paragraph) for node in nodes for paragraph in node["paragraphs"]),
+            )
+            if self.on_section:
+                self.on_section(name, nodes)
+    
+    def render_document(self, doc_path="User_Manual.docx"):
+        """Rebuild and save the document from the recorded sections without touring again"""
+        order = list(TOUR_STEPS) + list(TEXT_SECTIONS)
+        self.content_tree = [node for name in order for node in self.section_nodes.get(name, [])]
+        self.doc = new_document()
+        self.toc = TableOfContents(self.doc)
+        self.setup_document_styles()
+        self.add_cover_page()
+        self.add_table_of_contents()
+        for node in self.content_tree:
+            self.write_section(node)
+        self.toc.finish()
+        save_document(self.doc, doc_path)
+        return doc_path
+    
+    def sign_out(self):
+        """End the browser session, including the session Supabase keeps in localStorage"""
+        self.driver.delete_all_cookies()
+        self.driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        self.signed_in = False
+    
     def login_to_system(self):
         """Login to the system for authenticated pages"""
         try:
@@ -193,7 +455,7 @@ class UserManualGenerator:
                 login_tab = self.wait_for_element(By.XPATH, "//button[contains(text(), 'Sign In')]", timeout=5)
                 if login_tab:
                     login_tab.click()
-                    time.sleep(1)
+                    self.wait_for_settled()
             except:
                 print("Login tab not found or already active")
             
@@ -236,18 +498,19 @@ class UserManualGenerator:
                 print("Waiting for redirect to dashboard...")
                 try:
                     # Wait for URL to change to dashboard
-                    WebDriverWait(self.driver, 15).until(
+                    WebDriverWait(self.driver, 15 * self.timeout_scale).until(
                         lambda driver: "/dashboard" in driver.current_url or driver.current_url != self.base_url
                     )
                     
-                    # Additional wait for page to load
-                    time.sleep(3)
+                    # Wait for the dashboard data to load
+                    self.wait_for_settled(15)
                     
                     current_url = self.driver.current_url
                     print(f"Current URL after login: {current_url}")
                     
                     if "/dashboard" in current_url or current_url != self.base_url:
                         print("Login successful - redirected to dashboard")
+                        self.signed_in = True
                         return True
                     else:
                         print("Login may have failed - no redirect detected")
@@ -261,6 +524,7 @@ class UserManualGenerator:
                         return False
                     else:
                         print("URL changed, assuming login successful")
+                        self.signed_in = True
                         return True
             else:
                 print("Login button not found")
@@ -275,6 +539,7 @@ class UserManualGenerator:
         print("Touring landing page...")
         self.driver.get(self.base_url)
         self.wait_for_page_load()
+        screenshot = self.capture_screenshot("00_landing_page")
         
         content = [
             "The Computerized Stationary Management System is a comprehensive web-based application designed for Pakistan State Oil (PSO) to manage inventory operations efficiently.",
@@ -289,19 +554,26 @@ class UserManualGenerator:
             "The landing page provides access to both login and signup functionality through a tabbed interface."
         ]
         
-        self.add_section("1. Introduction - Landing Page", content)
+        self.add_section("1. Introduction - Landing Page", content, [screenshot])
     
     def capture_authentication(self):
         """Tour authentication pages"""
         print("Touring authentication pages...")
+        screenshots = []
+        
+        # With --pages or in a session of its own the landing page was never loaded
+        if self.driver.current_url.rstrip("/") != self.base_url.rstrip("/"):
+            self.driver.get(self.base_url)
+            self.wait_for_page_load()
         
         # Ensure we're on the login tab first
         try:
             login_tab = self.wait_for_element(By.XPATH, "//button[contains(text(), 'Sign In')]", timeout=10)
             if login_tab:
                 login_tab.click()
-                time.sleep(2)
+                self.wait_for_settled()
                 print("Viewing Sign In tab")
+                screenshots.append(self.capture_screenshot("01_login_page"))
         except Exception as e:
             print(f"Could not find or click Sign In tab: {e}")
         
@@ -310,8 +582,9 @@ class UserManualGenerator:
             signup_tab = self.wait_for_element(By.XPATH, "//button[contains(text(), 'Sign Up')]", timeout=10)
             if signup_tab:
                 signup_tab.click()
-                time.sleep(2)
+                self.wait_for_settled()
                 print("Viewing Sign Up tab")
+                screenshots.append(self.capture_screenshot("03_signup_form"))
         except Exception as e:
             print(f"Could not find or click Sign Up tab: {e}")
         
@@ -332,15 +605,15 @@ class UserManualGenerator:
             "The system includes form validation and error handling for security."
         ]
         
-        self.add_section("2. Authentication System", content)
+        self.add_section("2. Authentication System", content, screenshots)
         self.add_section("2.1 User Registration", ["New users can register using the Sign Up tab."])
     
     def capture_dashboard(self):
         """Tour dashboard page"""
         print("Touring dashboard...")
         
-        # Login first
-        if not self.login_to_system():
+        # Login first, unless the tour already has
+        if not self.signed_in and not self.login_to_system():
             print("Cannot access dashboard - login failed")
             return
         
@@ -351,8 +624,9 @@ class UserManualGenerator:
             self.driver.get(f"{self.base_url}/dashboard")
             self.wait_for_page_load()
         
-        time.sleep(3)  # Wait for dashboard to fully load
+        self.wait_for_settled()  # Wait for dashboard data to load
         print("Viewing dashboard content...")
+        screenshot = self.capture_screenshot("04_dashboard")
         
         content = [
             "The dashboard provides a comprehensive overview of your inventory system.",
@@ -371,7 +645,7 @@ class UserManualGenerator:
             "The header displays the PSO logo, system name, and user information with logout functionality."
         ]
         
-        self.add_section("3. Dashboard Overview", content)
+        self.add_section("3. Dashboard Overview", content, [screenshot])
     
     def capture_inventory_management(self):
         """Tour inventory management pages"""
@@ -380,8 +654,8 @@ class UserManualGenerator:
         # Navigate to inventory page
         self.driver.get(f"{self.base_url}/inventory")
         self.wait_for_page_load()
-        time.sleep(3)  # Wait for page to fully load
         print("Viewing inventory overview...")
+        screenshot = self.capture_screenshot("05_inventory_overview")
         
         content = [
             "The Inventory Management section is the core of the system, providing comprehensive tools for managing stock items.",
@@ -399,15 +673,20 @@ class UserManualGenerator:
             "• Search and filter items"
         ]
         
-        self.add_section("4. Inventory Management", content)
+        self.add_section("4. Inventory Management", content, [screenshot])
         
         # Tour Current Stock tab
+        add_item = None
         try:
             print("Viewing Current Stock tab...")
             current_stock_tab = self.wait_for_element(By.XPATH, "//button[contains(text(), 'Current Stock')]", timeout=10)
             if current_stock_tab:
                 current_stock_tab.click()
-                time.sleep(3)  # Wait for tab content to load
+                self.wait_for_settled()  # Wait for tab content to load
+                screenshot, closeup, legend = self.capture_closeup("06_current_stock", [
+                    ("Add New Stock button", "//button[contains(., 'Add New Stock')]"),
+                    ("Add New Item button", "//button[contains(., 'Add New Item')]"),
+                ])
                 
                 current_stock_content = [
                     "The Current Stock tab displays real-time inventory levels.",
@@ -424,9 +703,10 @@ class UserManualGenerator:
                     "• Current quantity in stock",
                     "• Location information",
                     "• Last updated timestamp"
-                ]
+                ] + legend
                 
-                self.add_section("4.1 Current Stock Management", current_stock_content)
+                self.add_section("4.1 Current Stock Management", current_stock_content, [screenshot, closeup])
+                add_item = self.capture_add_item_form()
             else:
                 print("Current Stock tab not found")
         except Exception as e:
@@ -435,10 +715,14 @@ class UserManualGenerator:
         # Tour Stock History tab
         try:
             print("Viewing Stock History tab...")
+            screenshot, closeup, legend = None, None, []
             history_tab = self.wait_for_element(By.XPATH, "//button[contains(text(), 'Stock History')]", timeout=10)
             if history_tab:
                 history_tab.click()
-                time.sleep(3)  # Wait for tab content to load
+                self.wait_for_settled()  # Wait for tab content to load
+                screenshot, closeup, legend = self.capture_closeup("07_stock_history", [
+                    ("Stock history table", "//table"),
+                ])
                 
                 history_content = [
                     "The Stock History tab provides a complete audit trail of all inventory movements.",
@@ -459,10 +743,13 @@ class UserManualGenerator:
                 "• Additional notes or comments"
             ]
             
-            self.add_section("4.2 Stock History Tracking", history_content)
+            self.add_section("4.2 Stock History Tracking", history_content + legend, [screenshot, closeup])
         except Exception as e:
             print(f"Error viewing stock history tab: {e}")
         
+        if add_item:
+            self.add_section("4.3 Adding New Items", *add_item)
+        
         # Tour Add Item page
         # try:
         #     print("Touring Add Item page...")
@@ -491,6 +778,41 @@ class UserManualGenerator:
         # except Exception as e:
         #     print(f"Error touring add item page: {e}")
     
+    def capture_add_item_form(self):
+        """Open the Add New Item dialog on the Current Stock tab and capture its fields
+        
+        Returns (content, images) for the section, or None if the dialog
+        could not be opened. The dialog is closed again afterwards.
+        """
+        try:
+            add_button = self.wait_for_element(By.XPATH, "//button[contains(., 'Add New Item')]", timeout=10)
+            if not add_button:
+                return None
+            add_button.click()
+            self.wait_for_element(By.ID, "itemName", timeout=10)
+            self.wait_for_settled()  # Let the dialog finish its opening animation
+            screenshot, closeup, legend = self.capture_closeup("08_add_item", [
+                ("Item Name field", "#itemName"),
+                ("Initial Quantity field", "#quantity"),
+                ("Description field", "#description"),
+            ])
+            ActionChains(self.driver).send_keys(Keys.ESCAPE).perform()
+        except Exception as e:
+            print(f"Error capturing add item form: {e}")
+            return None
+        
+        content = [
+            "New item types are added from the Current Stock tab with the 'Add New Item' button.",
+            "",
+            "Required Information:",
+            "• Item Name - Descriptive name of the item (e.g., SLS03, PART IV)",
+            "• Initial Quantity - Starting stock level",
+            "• Description - Optional details about the item",
+            "",
+            "Adding a new item automatically creates matching 'Items Required' and 'Items Dispatched' columns in the Inventory Overview table."
+        ] + legend
+        return content, [screenshot, closeup]
+    
     def capture_email_management(self):
         """Tour email management page"""
         print("Touring email management...")
@@ -498,8 +820,8 @@ class UserManualGenerator:
         try:
             self.driver.get(f"{self.base_url}/email-management")
             self.wait_for_page_load()
-            time.sleep(3)  # Wait for page to fully load
             print("Viewing email management interface...")
+            screenshot = self.capture_screenshot("09_email_management")
             
             content = [
                 "The Email Management system provides automated communication capabilities.",
@@ -524,9 +846,34 @@ class UserManualGenerator:
                 "• Scheduling preferences"
             ]
             
-            self.add_section("5. Email Management", content)
+            self.add_section("5. Email Management", content, [screenshot])
         except Exception as e:
             print(f"Error capturing email management: {e}")
+            return
+        
+        # Tour Schedules tab
+        try:
+            print("Viewing reminder schedules...")
+            schedules_tab = self.wait_for_element(By.XPATH, "//button[contains(., 'Schedules')]", timeout=10)
+            if schedules_tab:
+                schedules_tab.click()
+                self.wait_for_settled()  # Wait for tab content to load
+                screenshot, closeup, legend = self.capture_closeup("10_email_schedules", [
+                    ("Reminder schedule list", "//table[.//th[contains(., 'Reminder Name')]]"),
+                    ("Add Reminder Schedule button", "//button[contains(., 'Add Reminder Schedule')]"),
+                    ("Send All Due Reminders button", "//button[contains(., 'Send All Due Reminders')]"),
+                ])
+                
+                schedule_content = [
+                    "The Schedules tab lists the monthly reminder emails sent to all active contacts.",
+                    "",
+                    "Each schedule shows its name, recipients and the day of the month it is sent.",
+                    "Use 'Add Reminder Schedule' to create a new reminder, or 'Send All Due Reminders' to send every reminder that is due now."
+                ] + legend
+                
+                self.add_section("5.1 Reminder Email Schedules", schedule_content, [screenshot, closeup])
+        except Exception as e:
+            print(f"Error viewing reminder schedules: {e}")
     
     def add_troubleshooting_section(self):
         """Add troubleshooting section"""
@@ -796,9 +1143,14 @@ class UserManualGenerator:
         ]
         self.add_section("9. Appendix", content)
     
-    def generate_text_only_manual(self):
+    def generate_text_only_manual(self, doc_path="User_Manual.docx", search_index_path=None):
         """Generate manual with text content only (no screenshots)"""
         try:
+            # Start from a fresh copy of the template in case a tour already added content
+            self.doc = new_document()
+            self.toc = TableOfContents(self.doc)
+            self.content_tree = []
+            
             self.setup_document_styles()
             self.add_cover_page()
             self.add_table_of_contents()
@@ -806,136 +1158,427 @@ class UserManualGenerator:
             self.add_troubleshooting_section()
             self.add_appendix()
             
-            doc_path = "User_Manual.docx"
-            self.doc.save(doc_path)
+            self.toc.finish()
+            save_document(self.doc, doc_path)
             print(f"Text-only user manual generated: {doc_path}")
+            self.write_search_index(search_index_path)
         except Exception as e:
             print(f"Error generating text-only manual: {e}")
     
-    def tour_complete_website(self):
-        """Tour the complete website in a single session without reloading"""
-        print("Starting complete website tour...")
+    def add_clip(self, clip_path):
+        """Add a walkthrough clip to the end of the current section
         
-        # Start with landing page
-        self.capture_landing_page()
+        GIFs play inline in Word and are embedded; MP4 and WebP clips are
+        linked, relative to the manual.
+        """
+        self.clips.append(clip_path)
+        if self.content_tree:
+            self.content_tree[-1]["paragraphs"].append(f"Walkthrough clip: {clip_path}")
         
-        # Tour authentication (already on landing page)
-        self.capture_authentication()
+        if clip_path.endswith(".gif"):
+            # Bypass the media cache, which would flatten the animation
+            self.doc.add_picture(clip_path, width=Inches(6))
+            self.doc.paragraphs[-1].alignment = WD_ALIGN_PARAGRAPH.CENTER
+            return
         
-        # Login and tour authenticated pages
-        print("Logging in to access authenticated pages...")
-        if self.login_to_system():
-            print("Successfully logged in, continuing tour...")
-            
-            # Tour dashboard (already navigated after login)
-            self.capture_dashboard()
-            
-            # Tour inventory management
-            self.capture_inventory_management()
-            
-            # Tour email management
-            self.capture_email_management()
-            
-            print("Website tour completed successfully!")
+        paragraph = self.doc.add_paragraph("Walkthrough clip: ", style='Normal')
+        r_id = self.doc.part.relate_to(clip_path.replace(os.sep, "/"), RT.HYPERLINK, is_external=True)
+        link = OxmlElement('w:hyperlink')
+        link.set(qn('r:id'), r_id)
+        run = OxmlElement('w:r')
+        run_properties = OxmlElement('w:rPr')
+        for tag, value in (('w:color', '0563C1'), ('w:u', 'single')):
+            element = OxmlElement(tag)
+            element.set(qn('w:val'), value)
+            run_properties.append(element)
+        run.append(run_properties)
+        text = OxmlElement('w:t')
+        text.text = os.path.basename(clip_path)
+        run.append(text)
+        link.append(run)
+        paragraph._p.append(link)
+    
+    def record_step(self, name, step):
+        """Run a tour step, recording it as a walkthrough clip when recording is on"""
+        if self.recorder is None or name is None:
+            return step()
+        self.recorder.start(name)
+        try:
+            return step()
+        finally:
+            clip = self.recorder.stop()
+            if clip:
+                self.add_clip(clip)
+    
+    def start_performance_recording(self):
+        """Install the Web Vitals observers before the first page is loaded"""
+        perf_dir = os.path.join(PERF_DIR, self.network_profile) if self.network_profile else PERF_DIR
+        self.perf = PerformanceRecorder(self.driver, run_id=self.perf_run_id, perf_dir=perf_dir)
+        try:
+            self.perf.install()
+        except Exception as e:
+            print(f"Performance data will not be collected: {e}")
+            self.perf = None
+    
+    def add_performance_appendix(self):
+        """Summarize the page timings of this run"""
+        if self.perf and self.perf.samples:
+            self.add_section("10. Performance Appendix", appendix_paragraphs(self.perf.samples, self.perf.path))
+            print(f"Performance samples saved to {self.perf.path}")
+    
+    def check_performance_budget(self, budget_path=DEFAULT_BUDGET_PATH):
+        """Compare this run's samples with the budget and earlier runs; no page is reloaded"""
+        if not (self.perf and self.perf.samples and os.path.exists(budget_path)):
+            return []
+        self.performance_regressions = check_run(self.perf.path, budget_path, samples=self.perf.samples)
+        for line in report_lines(self.performance_regressions):
+            print(line)
+        return self.performance_regressions
+    
+    def tour_complete_website(self, pages=None):
+        """Tour the complete website in a single session without reloading
+        
+        pages limits the tour to some of TOUR_STEPS; the login only happens
+        when one of them needs a signed-in session.
+        """
+        print("Starting complete website tour...")
+        self.start_performance_recording()
+        
+        if self.record_fps:
+            if ffmpeg_available():
+                self.recorder = FrameRecorder(self.driver, fps=self.record_fps, clip_format=self.clip_format)
+            else:
+                print("⚠️ ffmpeg not found - walkthrough clips will not be recorded")
+        
+        # Public pages come first, so the session is signed in once and stays signed in
+        for name, step in TOUR_STEPS.items():
+            if pages is not None and name not in pages:
+                continue
+            if step["needs_session"] and not self.signed_in:
+                print("Logging in to access authenticated pages...")
+                started = time.perf_counter()
+                if not self.record_step("01_login", self.login_to_system):
+                    print("Login failed, skipping authenticated pages")
+                    break
+                record_step("login", "login", time.perf_counter() - started)
+                print("Successfully logged in, continuing tour...")
+            method = getattr(self, step["method"])
+            self.record_step(step.get("clip"), lambda: self.run_section(name, method))
         else:
-            print("Login failed, skipping authenticated pages")
-
-    def generate_manual(self):
-        """Generate the complete user manual"""
+            print("Website tour completed successfully!")
+        self.recorder = None
+    
+    def new_session(self):
+        """A generator with the same settings, for another browser session of this build"""
+        session = UserManualGenerator(self.base_url, self.viewports, self.record_fps, self.clip_format,
+                                      self.network_profile, (self.test_email, self.test_password),
+                                      profile_memory=self.memory.enabled, memory_budget_mb=self.memory.budget_mb,
+                                      archive_path=self.archive_path)
+        session.perf_run_id = self.perf_run_id
+        return session
+    
+    def run_tour(self):
+        """Tour the website for its screenshots only and return their paths"""
+        self.setup_driver()
         try:
-            print("Starting user manual generation...")
-            
-            # Check if server is running
-            try:
-                import requests
-                response = requests.get(self.base_url, timeout=5)
-                server_running = response.status_code == 200
-            except:
-                server_running = False
-            
-            if not server_running:
-                print(f"Development server not accessible at {self.base_url}")
-                print("Generating text-only manual...")
-                self.generate_text_only_manual()
-                return "User_Manual.docx"
-            
-            # Setup browser and document
-            self.setup_driver()
             self.setup_document_styles()
-            
-            # Generate manual by touring the website
-            print("Generating manual by touring the website...")
-            
-            # Add cover page and TOC
-            self.add_cover_page()
-            self.add_table_of_contents()
-            
-            # Tour the complete website
             self.tour_complete_website()
+        finally:
+            self.driver.quit()
+            self.driver = None
+        self.wait_for_images()
+        return list(self.captured)
+    
+    def generate_viewport_manuals(self, doc_path="User_Manual.docx"):
+        """Write one manual per secondary viewport from the recorded content tree
+        
+        The primary manual is doc_path; the others are named after their
+        viewport, e.g. User_Manual_mobile.docx.
+        """
+        from manual_render import render_docx
+        
+        self.wait_for_images()
+        stem = os.path.splitext(doc_path)[0]
+        paths = []
+        for viewport in self.viewports[1:]:
+            tree = []
+            for node in self.content_tree:
+                # Close-ups are cut from the primary layout, so other viewports get full screenshots only
+                images = [str(self.viewport_path(Path(image).stem, viewport)) for image in node["images"]
+                          if Path(image).parent == self.screenshots_dir]
+                tree.append(dict(node, images=[image for image in images if os.path.exists(image)]))
+            path = f"{stem}_{viewport}.docx"
+            render_docx(tree, None, path)
+            print(f"{viewport.title()} manual generated: {path}")
+            paths.append(path)
+        return paths
+
+    def generate_manual(self, doc_path="User_Manual.docx", pages=None, sections=None, workers=1,
+                        search_index_path=None):
+        """Generate the complete user manual
+        
+        doc_path may be a file name or a writable binary stream. pages and
+        sections limit the manual to some of TOUR_STEPS and TEXT_SECTIONS
+        (default: all); without pages no browser is started. With workers > 1
+        the pages are toured in that many browser sessions at once. When
+        search_index_path is given, the search index is updated from the
+        sections written (see manual_search).
+        
+        Tours run on manual_async.AsyncTourRunner, which this wraps; from
+        running event loop code, await AsyncTourRunner(...).build() instead.
+        Watch mode tours on this generator's own browser so it stays open.
+        """
+        pages = list(TOUR_STEPS) if pages is None else [name for name in TOUR_STEPS if name in pages]
+        sections = list(TEXT_SECTIONS) if sections is None else [name for name in TEXT_SECTIONS if name in sections]
+        try:
+            print("Starting user manual generation...")
             
-            # Add additional sections
-            self.add_getting_started_section()
-            self.add_user_profile_section()
-            self.add_troubleshooting_section()
-            self.add_system_requirements_section()
-            self.add_appendix_section()
+            if pages:
+                # Check if server is running
+                try:
+                    import requests
+                    response = requests.get(self.base_url, timeout=5)
+                    server_running = response.status_code == 200
+                except:
+                    server_running = False
+                
+                if not server_running:
+                    print(f"Development server not accessible at {self.base_url}")
+                    print("Generating text-only manual...")
+                    self.generate_text_only_manual(doc_path, search_index_path)
+                    return doc_path
             
-            # Save document
-            doc_path = "User_Manual.docx"
-            self.doc.save(doc_path)
+            if pages and not self.keep_browser:
+                print("Generating manual by touring the website...")
+                asyncio.run(AsyncTourRunner(self, pages, sections, workers).build(doc_path))
+            else:
+                self.build_in_session(doc_path, pages, sections)
             print(f"User manual generated successfully: {doc_path}")
+            self.write_search_index(search_index_path)
+            self.check_performance_budget()
+            self.report_memory()
+            
+            if pages and len(self.viewports) > 1 and isinstance(doc_path, str):
+                self.generate_viewport_manuals(doc_path)
             return doc_path
             
         except Exception as e:
             print(f"Error generating manual: {e}")
             print("Falling back to text-only manual...")
-            self.generate_text_only_manual()
-            return "User_Manual.docx"
+            self.generate_text_only_manual(doc_path, search_index_path)
+            return doc_path
         finally:
-            if self.driver:
-                self.driver.quit()
+            self.memory.stop()
+            if not self.keep_browser:
+                self.close()
+    
+    def build_in_session(self, doc_path, pages, sections):
+        """Tour the pages on this generator's browser and write the manual step by step"""
+        # Setup document
+        with self.memory.phase("styles"):
+            self.setup_document_styles()
+        
+        # Add cover page and TOC
+        with self.memory.phase("cover"):
+            self.add_cover_page()
+        with self.memory.phase("toc"):
+            self.add_table_of_contents()
+        
+        # Generate manual by touring the website
+        if pages:
+            print("Generating manual by touring the website...")
+            self.setup_driver()
+            self.tour_complete_website(pages)
+        
+        # Add additional sections
+        for name in sections:
+            self.run_section(name, getattr(self, TEXT_SECTIONS[name]))
+        
+        # Save document
+        started = time.perf_counter()
+        with self.memory.phase("save"):
+            self.toc.finish()
+            save_document(self.doc, doc_path)
+        record_step("save", "save", time.perf_counter() - started)
+    
+    def write_search_index(self, path):
+        """Update the search index from the sections of this build; only changed ones are re-indexed"""
+        if path:
+            changed = update_index(self.content_tree, path)
+            print(f"Search index updated: {path} ({changed} sections re-indexed)")
+    
+    def report_memory(self):
+        """Print the peak memory of every phase of this build"""
+        lines = self.memory.report_lines()
+        if lines:
+            print("\nMemory per phase:")
+            print("\n".join(lines))
+            exceeded = self.memory.over_budget()
+            if exceeded:
+                print(f"❌ {len(exceeded)} phase(s) over the {self.memory.budget_mb} MB memory budget")
+    
+    def close(self):
+        """Quit the browser, stop the image threads and worker processes and close the page archive"""
+        if self.driver:
+            self.driver.quit()
+            self.driver = None
+        self.image_pool.shutdown()
+        if self.annotation_pool:
+            self.annotation_pool.shutdown()
+            self.annotation_pool = None
+        if self.archive:
+            self.archive.close()
+            self.archive = None
+        self.memory.stop()
+
+    def to_bytes(self):
+        """Generate the manual in memory and return the .docx package as bytes"""
+        buffer = BytesIO()
+        self.generate_manual(buffer)
+        return buffer.getvalue()
+
+def _names(value, known, parser, flag):
+    """Split a comma-separated --pages/--sections/--viewports value and check the names"""
+    names = [name.strip().replace("-", "_") for name in value.split(",") if name.strip()]
+    unknown = [name for name in names if name not in known]
+    if unknown:
+        choices = ", ".join(name.replace("_", "-") for name in known)
+        parser.error(f"unknown {flag}: {', '.join(unknown)} (choose from {choices})")
+    return names
+
+def credentials_from_env(prefix):
+    """(email, password) from <PREFIX>_EMAIL and <PREFIX>_PASSWORD"""
+    email, password = os.environ.get(f"{prefix}_EMAIL"), os.environ.get(f"{prefix}_PASSWORD")
+    if not email or not password:
+        raise KeyError(f"{prefix}_EMAIL and {prefix}_PASSWORD must both be set")
+    return email, password
 
 def main():
     """Main function to run the user manual generator"""
+    page_names = [name.replace("_", "-") for name in TOUR_STEPS]
+    section_names = [name.replace("_", "-") for name in TEXT_SECTIONS]
+    parser = argparse.ArgumentParser(description="Generate the user manual by touring the website")
+    parser.add_argument("--pages", help=f"Comma-separated tour pages to capture ({', '.join(page_names)})")
+    parser.add_argument("--sections", help=f"Comma-separated text sections to write ({', '.join(section_names)})")
+    parser.add_argument("--workers", type=int, default=1, help="Browser sessions touring pages at once")
+    parser.add_argument("--viewports", default="desktop",
+                        help=f"Comma-separated viewports to write a manual for ({', '.join(VIEWPORTS)}; "
+                             "default: desktop); desktop is always included")
+    parser.add_argument("--no-screenshots", action="store_true",
+                        help="Write the text-only manual without starting a browser")
+    parser.add_argument("--output", default="User_Manual.docx", help="Manual file to write")
+    parser.add_argument("--base-url", default="http://localhost:3000")
+    parser.add_argument("--credentials-env", metavar="PREFIX",
+                        help="Sign in with the account in $PREFIX_EMAIL and $PREFIX_PASSWORD")
+    parser.add_argument("--watch", action="store_true",
+                        help="Keep the browser open and rebuild the sections affected by each saved change")
+    parser.add_argument("--plan", action="store_true",
+                        help="Show the steps, estimated time and size of the build without running it")
+    parser.add_argument("--archive", default=DEFAULT_ARCHIVE_PATH, metavar="PATH",
+                        help=f"Page archive that keeps an MHTML snapshot of every captured page (default: {DEFAULT_ARCHIVE_PATH})")
+    parser.add_argument("--no-archive", action="store_true", help="Do not archive the captured pages")
+    parser.add_argument("--profile-memory", action="store_true",
+                        help="Report peak memory and top allocation sites per build phase")
+    parser.add_argument("--memory-budget", type=float, metavar="MB",
+                        help="Exit with 1 when any phase peaks above this many MB (implies --profile-memory)")
+    parser.add_argument("--record-fps", type=float, metavar="FPS",
+                        help="Record walkthrough clips of the tour at this frame rate (needs ffmpeg)")
+    parser.add_argument("--clip-format", choices=CLIP_FORMATS, default="mp4",
+                        help="Format of the walkthrough clips (default: mp4)")
+    args = parser.parse_args()
+    
+    # Only what is named is built; naming just sections skips the tour entirely
+    pages = sections = None
+    if args.pages is not None or args.sections is not None:
+        pages = _names(args.pages or "", TOUR_STEPS, parser, "page")
+        sections = _names(args.sections or "", TEXT_SECTIONS, parser, "section")
+    # Every extra viewport is emulated on each page and written as a manual of its own
+    viewports = set(_names(args.viewports, VIEWPORTS, parser, "viewport")) | {"desktop"}
+    viewports = tuple(name for name in VIEWPORTS if name in viewports)
+    if args.no_screenshots and (args.pages or args.watch):
+        parser.error("--no-screenshots cannot be combined with --pages or --watch")
+    
+    credentials = None
+    if args.credentials_env:
+        try:
+            credentials = credentials_from_env(args.credentials_env)
+        except KeyError as e:
+            parser.error(e.args[0])
+    
     print("=== Inventory Management System - User Manual Generator ===")
-    print("Checking if development server is running...")
     
-    # Check if server is running
-    import requests
+    if args.plan:
+        plan = BuildPlan(TOUR_STEPS, list(TOUR_STEPS) if pages is None else pages,
+                         list(TEXT_SECTIONS) if sections is None else sections, workers=args.workers)
+        print("\n".join(plan.lines()))
+        return
+    
+    if args.no_screenshots:
+        generator = UserManualGenerator(base_url=args.base_url)
+        generator.generate_text_only_manual(args.output, index_path(args.output))
+        print(f"\n✓ Text-only user manual created: {args.output}")
+        return
+    
     server_running = False
-    try:
-        response = requests.get("http://localhost:3000", timeout=5)
-        if response.status_code == 200:
-            server_running = True
-            print("✓ Development server is running")
-        else:
-            print(f"⚠️ Development server responded with status: {response.status_code}")
-    except requests.exceptions.RequestException as e:
-        print(f"❌ Cannot connect to development server: {e}")
+    if pages is None or pages or args.watch:
+        print("Checking if development server is running...")
+        
+        # Check if server is running
+        import requests
+        try:
+            response = requests.get(args.base_url, timeout=5)
+            if response.status_code == 200:
+                server_running = True
+                print("✓ Development server is running")
+            else:
+                print(f"⚠️ Development server responded with status: {response.status_code}")
+        except requests.exceptions.RequestException as e:
+            print(f"❌ Cannot connect to development server: {e}")
     
-    if not server_running:
+    if args.watch:
+        if not server_running:
+            print("❌ Watch mode needs the development server: npm run dev")
+            sys.exit(1)
+        from manual_watch import watch_manual
+        # One viewport keeps each rebuild fast
+        sys.exit(watch_manual(UserManualGenerator(base_url=args.base_url, credentials=credentials), args.output))
+    
+    if (pages is None or pages) and not server_running:
         print("\n⚠️ Development server is not accessible.")
         print("The manual will be generated without screenshots.")
         print("To include screenshots, please:")
         print("1. Start the development server: npm run dev")
-        print("2. Ensure it's running on http://localhost:3000")
+        print(f"2. Ensure it's running on {args.base_url}")
         print("3. Run this script again")
         print("\nProceeding with text-only manual generation...")
     
     print("Generating user manual...")
     print()
     
-    generator = UserManualGenerator()
-    doc_path = generator.generate_manual()
+    generator = UserManualGenerator(base_url=args.base_url, viewports=viewports, record_fps=args.record_fps,
+                                    clip_format=args.clip_format, credentials=credentials,
+                                    profile_memory=args.profile_memory, memory_budget_mb=args.memory_budget,
+                                    archive_path=None if args.no_archive else args.archive)
+    doc_path = generator.generate_manual(args.output, pages=pages, sections=sections, workers=args.workers,
+                                         search_index_path=index_path(args.output))
     
     print("\n=== Manual Generation Complete ===")
     print(f"✓ User manual created: {doc_path}")
     if server_running:
         print("✓ Screenshots captured and embedded")
-    else:
+        if not args.no_archive:
+            print(f"✓ Page snapshots archived in {args.archive} (python manual_archive.py list)")
+    elif pages is None or pages:
         print("⚠️ Screenshots skipped (server not accessible)")
     print("✓ Professional formatting applied")
     print("\nThe manual is ready for use and distribution.")
+    
+    if generator.performance_regressions:
+        print(f"\n❌ {len(generator.performance_regressions)} performance regression(s) - see the report above")
+        sys.exit(1)
+    if generator.memory.over_budget():
+        print("\n❌ Memory budget exceeded - see the report above")
+        sys.exit(1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
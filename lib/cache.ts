@@ -12,6 +12,19 @@ interface CacheStats {
   averageResponseTime: number;
 }
 
+interface CacheKeyStats {
+  cacheHits: number;
+  cacheMisses: number;
+  apiCalls: number;
+}
+
+declare global {
+  interface Window {
+    // Test hook read by the documentation tour (generate_user_manual.py)
+    __cacheStats?: () => CacheStats & { keys: Record<string, CacheKeyStats> }
+  }
+}
+
 export class CacheManager {
   private static cache = new Map<string, CacheEntry>()
   private static cleanupInterval: NodeJS.Timeout | null = null
@@ -21,6 +34,7 @@ export class CacheManager {
     apiCalls: 0,
     averageResponseTime: 0
   }
+  private static keyStats = new Map<string, CacheKeyStats>()
   private static responseTimes: number[] = []
   private static readonly DEFAULT_TTL = 5 * 60 * 1000 // 5 minutes
 
@@ -56,6 +70,7 @@ export class CacheManager {
     const memoryItem = this.cache.get(key)
     if (memoryItem && this.isValid(memoryItem)) {
       this.stats.cacheHits++
+      this.statsFor(key).cacheHits++
       return memoryItem.data
     }
 
@@ -69,6 +84,7 @@ export class CacheManager {
             // Restore to memory cache
             this.cache.set(key, item)
             this.stats.cacheHits++
+            this.statsFor(key).cacheHits++
             return item.data
           } else {
             // Remove expired item
@@ -81,6 +97,7 @@ export class CacheManager {
     }
 
     this.stats.cacheMisses++
+    this.statsFor(key).cacheMisses++
     return null
   }
 
@@ -132,11 +149,15 @@ export class CacheManager {
       apiCalls: 0,
       averageResponseTime: 0
     }
+    this.keyStats.clear()
     this.responseTimes = []
   }
 
-  static recordApiCall(responseTime: number): void {
+  static recordApiCall(responseTime: number, key?: string): void {
     this.stats.apiCalls++
+    if (key) {
+      this.statsFor(key).apiCalls++
+    }
     this.responseTimes.push(responseTime)
     
     // Keep only last 100 response times for average calculation
@@ -154,6 +175,24 @@ export class CacheManager {
     return { ...this.stats }
   }
 
+  // Hits, misses and API calls per cache key, e.g. 'inventory_items'
+  static getKeyStats(): Record<string, CacheKeyStats> {
+    const result: Record<string, CacheKeyStats> = {}
+    for (const [key, stats] of this.keyStats.entries()) {
+      result[key] = { ...stats }
+    }
+    return result
+  }
+
+  private static statsFor(key: string): CacheKeyStats {
+    let stats = this.keyStats.get(key)
+    if (!stats) {
+      stats = { cacheHits: 0, cacheMisses: 0, apiCalls: 0 }
+      this.keyStats.set(key, stats)
+    }
+    return stats
+  }
+
   private static isValid(item: { timestamp: number; ttl: number }): boolean {
     return Date.now() - item.timestamp < item.ttl
   }
@@ -214,7 +253,7 @@ export class CachedAPI {
       
       // Record API call performance
       const responseTime = Date.now() - startTime
-      CacheManager.recordApiCall(responseTime)
+      CacheManager.recordApiCall(responseTime, key)
       
       // Cache the result
       CacheManager.set(key, data, ttl)
@@ -223,7 +262,7 @@ export class CachedAPI {
     } catch (error) {
       // Record failed API call
       const responseTime = Date.now() - startTime
-      CacheManager.recordApiCall(responseTime)
+      CacheManager.recordApiCall(responseTime, key)
       
       // If fetch fails, try to return stale data as fallback
       if (!forceRefresh) {
@@ -246,4 +285,13 @@ export class CachedAPI {
 // Initialize cleanup on module load
 if (typeof window !== 'undefined') {
   CacheManager.startCleanup()
-}
\ No newline at end of file
+}
+
+// Expose the stats to browser automation outside production builds
+// (or when NEXT_PUBLIC_EXPOSE_CACHE_STATS=true) so the tour can read them per page
+if (
+  typeof window !== 'undefined' &&
+  (process.env.NODE_ENV !== 'production' || process.env.NEXT_PUBLIC_EXPOSE_CACHE_STATS === 'true')
+) {
+  window.__cacheStats = () => ({ ...CacheManager.getStats(), keys: CacheManager.getKeyStats() })
+}
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Element Close-ups for the User Manual Screenshots
+Records the on-screen boxes of the elements a section talks about and turns a
+full-page screenshot into a cropped, scaled close-up with numbered callouts.
+annotate_screenshot() only needs the PNG bytes and the boxes, so it runs in a
+worker process while the browser moves on to the next page.
+"""
+
+import os
+from io import BytesIO
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+from manual_images import RENDER_IMAGE_WIDTH, png_size
+
+# Boxes in screenshot pixels (CSS pixels x devicePixelRatio), for CSS selectors or XPaths
+ELEMENT_BOXES_SCRIPT = """
+const scale = window.devicePixelRatio || 1;
+return arguments[0].map(([label, selector]) => {
+  const element = selector.startsWith("/")
+    ? document.evaluate(selector, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+    : document.querySelector(selector);
+  if (!element) return null;
+  const rect = element.getBoundingClientRect();
+  if (!rect.width || !rect.height) return null;
+  return {label: label, x: rect.left * scale, y: rect.top * scale,
+          width: rect.width * scale, height: rect.height * scale};
+}).filter(Boolean);
+"""
+
+CALLOUT_COLOR = (220, 38, 38)
+OUTLINE_WIDTH = 3
+CALLOUT_RADIUS = 14
+CROP_MARGIN = 32
+# Small crops are enlarged at most this much so they stay readable without blurring
+MAX_UPSCALE = 2.0
+
+
+def element_boxes(driver, targets):
+    """Return [{"label", "x", "y", "width", "height"}] for the targets that are on screen
+
+    targets is a list of (label, CSS selector or XPath); elements that are
+    missing or hidden are skipped, so the numbering follows what was found.
+    """
+    return driver.execute_script(ELEMENT_BOXES_SCRIPT, [list(target) for target in targets])
+
+
+def visible_boxes(boxes, png):
+    """The boxes that overlap the screenshot, in their original order"""
+    width, height = png_size(png)
+    return [box for box in boxes
+            if box["x"] < width and box["y"] < height
+            and box["x"] + box["width"] > 0 and box["y"] + box["height"] > 0]
+
+
+def _box_array(boxes, width, height):
+    """Boxes as an int array of (x0, y0, x1, y1) clipped to the image"""
+    array = np.array([[box["x"], box["y"], box["x"] + box["width"], box["y"] + box["height"]]
+                      for box in boxes]).round().astype(int)
+    array[:, [0, 2]] = array[:, [0, 2]].clip(0, width)
+    array[:, [1, 3]] = array[:, [1, 3]].clip(0, height)
+    return array
+
+
+def _font(size):
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:
+        # Pillow < 10.1 has a single fixed-size bitmap font
+        return ImageFont.load_default()
+
+
+def annotate_screenshot(png, boxes, output_path, width=None):
+    """Write a close-up of the boxed elements with numbered callouts
+
+    The area outside the boxes is faded, each box is outlined, the result
+    is cropped to the boxes plus a margin and scaled to the DOCX image
+    width. Returns output_path, or None when no box is on screen.
+    """
+    width = width or RENDER_IMAGE_WIDTH["docx"]
+    with Image.open(BytesIO(png)) as image:
+        pixels = np.array(image.convert("RGB"))
+    height, full_width = pixels.shape[:2]
+
+    boxes = visible_boxes(boxes, png)
+    if not boxes:
+        return None
+    box_array = _box_array(boxes, full_width, height)
+
+    # Fade everything outside the boxes
+    inside = np.zeros((height, full_width), dtype=bool)
+    for x0, y0, x1, y1 in box_array:
+        inside[y0:y1, x0:x1] = True
+    pixels[~inside] = (pixels[~inside] * 0.55 + 255 * 0.45).astype(np.uint8)
+
+    for x0, y0, x1, y1 in box_array:
+        t = OUTLINE_WIDTH
+        pixels[max(y0 - t, 0):y0, max(x0 - t, 0):x1 + t] = CALLOUT_COLOR
+        pixels[y1:y1 + t, max(x0 - t, 0):x1 + t] = CALLOUT_COLOR
+        pixels[max(y0 - t, 0):y1 + t, max(x0 - t, 0):x0] = CALLOUT_COLOR
+        pixels[max(y0 - t, 0):y1 + t, x1:x1 + t] = CALLOUT_COLOR
+
+    # Crop to the boxes plus a margin, then scale to the target width
+    cx0, cy0 = np.maximum(box_array[:, :2].min(axis=0) - CROP_MARGIN, 0)
+    cx1 = min(box_array[:, 2].max() + CROP_MARGIN, full_width)
+    cy1 = min(box_array[:, 3].max() + CROP_MARGIN, height)
+    crop = Image.fromarray(pixels[cy0:cy1, cx0:cx1])
+    scale = min(width / crop.width, MAX_UPSCALE)
+    if scale != 1:
+        crop = crop.resize((round(crop.width * scale), round(crop.height * scale)), Image.LANCZOS)
+
+    # Callouts are drawn after scaling so they have the same size in every close-up
+    pixels = np.array(crop)
+    rows, columns = np.ogrid[:pixels.shape[0], :pixels.shape[1]]
+    centers = []
+    for number, (x0, y0, _, _) in enumerate(box_array, start=1):
+        cx = int(np.clip((x0 - cx0) * scale, CALLOUT_RADIUS, pixels.shape[1] - CALLOUT_RADIUS))
+        cy = int(np.clip((y0 - cy0) * scale, CALLOUT_RADIUS, pixels.shape[0] - CALLOUT_RADIUS))
+        pixels[(rows - cy) ** 2 + (columns - cx) ** 2 <= CALLOUT_RADIUS ** 2] = CALLOUT_COLOR
+        centers.append((number, cx, cy))
+
+    annotated = Image.fromarray(pixels)
+    draw = ImageDraw.Draw(annotated)
+    font = _font(CALLOUT_RADIUS + 2)
+    for number, cx, cy in centers:
+        draw.text((cx, cy), str(number), fill="white", font=font, anchor="mm")
+
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    annotated.save(tmp_path, "PNG")
+    os.replace(tmp_path, output_path)
+    return output_path
+
+
+def callout_legend(boxes):
+    """Numbered legend lines matching the callouts, e.g. "(1) Item Name field" """
+    return [f"({number}) {box['label']}" for number, box in enumerate(boxes, start=1)]
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Offline Page Archive for the Website Tour
+Saves an MHTML snapshot (page plus stylesheets, images and frames) of every
+page the tour screenshots, so auditors can open exactly what a screen looked
+like when the manual was generated. Snapshots live in one SQLite file indexed
+by page and time. Each MIME part is stored once by content hash and
+compressed with zstd (zlib where zstandard is not installed), so unchanged
+pages, shared stylesheets and repeated images add a row, not a copy.
+"""
+
+import os
+import re
+import sys
+import zlib
+import json
+import sqlite3
+import hashlib
+import argparse
+import threading
+from datetime import datetime, timezone
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+DEFAULT_ARCHIVE_PATH = "page_archive.sqlite"
+
+ZSTD_LEVEL = 10
+
+# Chrome picks a random MIME boundary, Content-IDs and a Date header for every
+# capture; they are replaced so identical pages produce identical parts
+CANONICAL_BOUNDARY = "----MultipartBoundary--manual-archive----"
+BOUNDARY_PATTERN = re.compile(r'boundary="([^"]+)"')
+CONTENT_ID_PATTERN = re.compile(r"\b([a-z]+)-[0-9A-Za-z-]+@mhtml\.blink\b")
+DATE_HEADER_PATTERN = re.compile(r"^Date: [^\r\n]*\r?\n", re.MULTILINE)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS parts (
+    hash TEXT PRIMARY KEY,
+    codec TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    page TEXT NOT NULL,
+    url TEXT,
+    captured_at TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    parts TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS snapshots_by_page ON snapshots (page, captured_at);
+"""
+
+
+def normalize_mhtml(mhtml):
+    """Split a snapshot into its header and MIME parts, with the per-capture noise removed"""
+    header, blank, body = mhtml.partition("\r\n\r\n")
+    mhtml = DATE_HEADER_PATTERN.sub("", header, count=1) + blank + body
+    match = BOUNDARY_PATTERN.search(mhtml)
+    if match:
+        mhtml = mhtml.replace(match.group(1), CANONICAL_BOUNDARY)
+    ids = {}
+    mhtml = CONTENT_ID_PATTERN.sub(
+        lambda m: ids.setdefault(m.group(0), f"{m.group(1)}-{len(ids)}@mhtml.blink"), mhtml
+    )
+    return mhtml.split("--" + CANONICAL_BOUNDARY) if match else [mhtml]
+
+
+def join_parts(parts):
+    return ("--" + CANONICAL_BOUNDARY).join(parts)
+
+
+def compress(data):
+    """(codec, compressed bytes)"""
+    if zstandard is not None:
+        return "zstd", zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    return "zlib", zlib.compress(data, 9)
+
+
+def decompress(codec, data):
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("This archive part is zstd-compressed: pip install zstandard")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return zlib.decompress(data)
+
+
+def _until(at):
+    """Upper bound for captured_at; a bare date means the end of that day"""
+    return at + "T23:59:59" if len(at) == 10 else at
+
+
+class PageArchive:
+    """Snapshots by page and time in one SQLite file
+
+    One archive may be shared by the browser sessions of a build; writes
+    are serialized, and parallel builds rely on SQLite's own locking.
+    """
+
+    def __init__(self, path=DEFAULT_ARCHIVE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(SCHEMA)
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def add(self, page, mhtml, url=None, captured_at=None):
+        """Store a snapshot and return (snapshot id, bytes of new parts stored)"""
+        parts = [part.encode("utf-8") for part in normalize_mhtml(mhtml)]
+        hashes = [hashlib.sha256(part).hexdigest() for part in parts]
+        digest = hashlib.sha256(b"".join(bytes.fromhex(h) for h in hashes)).hexdigest()
+        captured_at = captured_at or datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+        with self._lock, self._db:
+            known = {row[0] for row in self._db.execute(
+                f"SELECT hash FROM parts WHERE hash IN ({','.join('?' * len(hashes))})", hashes)}
+            stored = 0
+            for part_hash, part in zip(hashes, parts):
+                if part_hash in known:
+                    continue
+                codec, data = compress(part)
+                self._db.execute("INSERT INTO parts VALUES (?, ?, ?, ?)", (part_hash, codec, len(part), data))
+                known.add(part_hash)
+                stored += len(data)
+            cursor = self._db.execute(
+                "INSERT INTO snapshots (page, url, captured_at, digest, parts) VALUES (?, ?, ?, ?, ?)",
+                (page, url, captured_at, digest, json.dumps(hashes)),
+            )
+        return cursor.lastrowid, stored
+
+    def capture(self, driver, page):
+        """Snapshot the page loaded in a Chrome driver"""
+        mhtml = driver.execute_cdp_cmd("Page.captureSnapshot", {"format": "mhtml"})["data"]
+        return self.add(page, mhtml, url=driver.current_url)
+
+    def snapshots(self, page=None):
+        """Snapshot rows (id, page, url, captured_at, digest), oldest first"""
+        query = "SELECT id, page, url, captured_at, digest FROM snapshots"
+        if page is not None:
+            return self._db.execute(query + " WHERE page = ? ORDER BY captured_at, id", (page,)).fetchall()
+        return self._db.execute(query + " ORDER BY page, captured_at, id").fetchall()
+
+    def find(self, page, at=None):
+        """Id of the newest snapshot of a page taken at or before `at` (ISO date or time), or None"""
+        row = self._db.execute(
+            "SELECT id FROM snapshots WHERE page = ? AND captured_at <= ? ORDER BY captured_at DESC, id DESC LIMIT 1",
+            (page, _until(at) if at else "9999"),
+        ).fetchone()
+        return row[0] if row else None
+
+    def read(self, snapshot_id):
+        """The MHTML of a snapshot"""
+        row = self._db.execute("SELECT parts FROM snapshots WHERE id = ?", (snapshot_id,)).fetchone()
+        if row is None:
+            raise KeyError(snapshot_id)
+        hashes = json.loads(row[0])
+        stored = {part_hash: decompress(codec, data) for part_hash, codec, data in self._db.execute(
+            f"SELECT hash, codec, data FROM parts WHERE hash IN ({','.join('?' * len(hashes))})", hashes)}
+        return join_parts([stored[part_hash].decode("utf-8") for part_hash in hashes])
+
+    def stats(self):
+        """(snapshots, distinct page states, parts, original bytes of all snapshots, bytes stored)"""
+        snapshots, states = self._db.execute("SELECT COUNT(*), COUNT(DISTINCT digest) FROM snapshots").fetchone()
+        parts, stored = self._db.execute("SELECT COUNT(*), COALESCE(SUM(LENGTH(data)), 0) FROM parts").fetchone()
+        sizes = dict(self._db.execute("SELECT hash, size FROM parts"))
+        original = sum(sizes[part_hash] for (hashes,) in self._db.execute("SELECT parts FROM snapshots")
+                       for part_hash in json.loads(hashes))
+        return snapshots, states, parts, original, stored
+
+
+def main():
+    """Main function to browse the page archive"""
+    parser = argparse.ArgumentParser(description="List and extract archived page snapshots")
+    parser.add_argument("--archive", default=DEFAULT_ARCHIVE_PATH, help="Archive file")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    list_parser = subparsers.add_parser("list", help="List snapshots, oldest first")
+    list_parser.add_argument("page", nargs="?", help="Only this page (screenshot name, e.g. 05_inventory_overview)")
+    extract_parser = subparsers.add_parser("extract", help="Write a snapshot as an .mhtml file")
+    extract_parser.add_argument("page", help="Screenshot name of the page")
+    extract_parser.add_argument("--at", help="Newest snapshot taken at or before this date or time (default: latest)")
+    extract_parser.add_argument("--output", help="File to write (default: <page>_<time>.mhtml)")
+    subparsers.add_parser("stats", help="Show how much deduplication and compression save")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.archive):
+        print(f"Archive not found: {args.archive} (run generate_user_manual.py first)")
+        sys.exit(1)
+
+    with PageArchive(args.archive) as archive:
+        if args.command == "list":
+            for snapshot_id, page, url, captured_at, digest in archive.snapshots(args.page):
+                print(f"{snapshot_id:>6}  {captured_at}  {page:<28}{digest[:12]}  {url or ''}")
+        elif args.command == "extract":
+            snapshot_id = archive.find(args.page, args.at)
+            if snapshot_id is None:
+                print(f"❌ No snapshot of {args.page}" + (f" at or before {args.at}" if args.at else ""))
+                sys.exit(1)
+            captured_at = next(row[3] for row in archive.snapshots(args.page) if row[0] == snapshot_id)
+            output = args.output or f"{args.page}_{captured_at.replace(':', '')}.mhtml"
+            with open(output, "w", encoding="utf-8", newline="") as f:
+                f.write(archive.read(snapshot_id))
+            print(f"✓ {args.page} as of {captured_at} written to {output}")
+        else:
+            snapshots, states, parts, original, stored = archive.stats()
+            codec = "zstd" if zstandard is not None else "zlib; pip install zstandard for zstd"
+            print(f"Snapshots: {snapshots} ({states} distinct page states, {parts} stored parts)")
+            print(f"Size: {original / 1024 / 1024:.1f} MB of snapshots stored in {stored / 1024 / 1024:.1f} MB "
+                  f"({codec})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Asynchronous Tour Engine for the User Manual
+Runs the browser sessions, screenshot encoding and document writing of a
+build as concurrent asyncio tasks. Each browser session keeps its blocking
+WebDriver calls on a thread of its own; screenshots reach the image pool
+through a bounded queue, so a fast tour waits for the encoders instead of
+piling screenshots up in memory; and every section is written into the
+document, in manual order, as soon as it and its images are ready.
+"""
+
+import os
+import sys
+import time
+import asyncio
+from datetime import datetime
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from manual_package import save_document
+from manual_perf import PERF_DIR, PerformanceRecorder
+from manual_plan import AFTER_TOUR_SECTIONS, page_groups, record_step
+
+# Screenshots waiting for an encoder; captures block while this many are queued
+IMAGE_QUEUE_SIZE = 8
+
+# Screenshots encoded at once (the size of the generator's image pool)
+ENCODERS = 4
+
+
+class AsyncBrowser:
+    """A generator's browser session, driven from the event loop
+
+    WebDriver is not thread-safe, so every call of one session runs on a
+    single thread of its own. Awaiting a call leaves the loop free for the
+    other sessions, the encoders and the document writer.
+    """
+
+    def __init__(self, generator):
+        self.generator = generator
+        self._thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="browser")
+
+    async def call(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._thread, fn, *args)
+
+    async def start(self):
+        await self.call(self.generator.setup_driver)
+
+    async def tour(self, pages):
+        await self.call(self.generator.tour_complete_website, pages)
+
+    async def close(self):
+        try:
+            await self.call(self.generator.close)
+        finally:
+            self._thread.shutdown()
+
+
+class ImageQueue:
+    """Bounded hand-off of screenshots from the browser threads to an executor
+
+    submit() has the signature of Executor.submit, so a generator uses the
+    queue in place of its image pool. It must be called from a browser
+    thread, never from the loop: it blocks while the queue is full.
+    """
+
+    def __init__(self, executor, encoders=ENCODERS, size=IMAGE_QUEUE_SIZE):
+        self.loop = asyncio.get_running_loop()
+        self.executor = executor
+        self.queue = asyncio.Queue(size)
+        self.tasks = [self.loop.create_task(self._encode()) for _ in range(encoders)]
+
+    def submit(self, fn, *args):
+        job = Future()
+        asyncio.run_coroutine_threadsafe(self.queue.put((job, fn, args)), self.loop).result()
+        return job
+
+    async def _encode(self):
+        while True:
+            job, fn, args = await self.queue.get()
+            try:
+                job.set_result(await self.loop.run_in_executor(self.executor, fn, *args))
+            except Exception as e:
+                job.set_exception(e)
+            finally:
+                self.queue.task_done()
+
+    async def close(self):
+        """Finish the queued screenshots and stop the encoders"""
+        await self.queue.join()
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+
+
+class AsyncTourRunner:
+    """Builds a generator's manual with the tour, encoding and writing overlapping
+
+    Pages are split into consecutive groups, one browser session each (see
+    manual_plan.page_groups). Text sections run on a generator of their own
+    while the pages are toured. The generator keeps the merged results:
+    section_nodes, content_tree, captured, clips and perf.
+    """
+
+    def __init__(self, generator, pages, sections, workers=1):
+        self.generator = generator
+        module = sys.modules[type(generator).__module__]
+        self.pages = [name for name in module.TOUR_STEPS if name in pages]
+        self.sections = [name for name in module.TEXT_SECTIONS if name in sections]
+        self.section_methods = module.TEXT_SECTIONS
+        self.groups = page_groups(self.pages, workers, module.TOUR_STEPS)
+        self.ready = {}
+
+    async def build(self, doc_path="User_Manual.docx"):
+        """Tour, write and save the manual; doc_path may be a file name or a binary stream"""
+        loop = asyncio.get_running_loop()
+        generator = self.generator
+        # Every session appends its samples to the same run
+        generator.perf_run_id = generator.perf_run_id or datetime.now().strftime("%Y%m%d-%H%M%S")
+        self.ready = {name: loop.create_future() for name in self.pages + self.sections}
+        self.images = ImageQueue(generator.image_pool)
+        sessions = [generator.new_session() for _ in self.groups]
+        text = generator.new_session()
+        writer = asyncio.create_task(self.write_document(doc_path))
+        try:
+            if len(self.groups) > 1:
+                print(f"Touring {len(self.pages)} pages in {len(self.groups)} browser sessions...")
+            during_tour = [name for name in self.sections if name not in AFTER_TOUR_SECTIONS]
+            results = await asyncio.gather(
+                self.text_sections(text, during_tour),
+                *(self.tour_session(session, group) for session, group in zip(sessions, self.groups)),
+                return_exceptions=True,
+            )
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+            self.merge_sessions(sessions)
+            text.perf = generator.perf
+            await self.text_sections(text, [name for name in self.sections if name in AFTER_TOUR_SECTIONS])
+            await writer
+        finally:
+            writer.cancel()
+            await self.images.close()
+            text.close()
+            generator.memory.merge(text.memory, "text")
+        return doc_path
+
+    def _finish(self, session, name, nodes):
+        """Hand a section's entries and their image jobs to the writer (on the loop)"""
+        ready = self.ready[name]
+        if not ready.done():
+            jobs = {path: session.image_jobs[path] for node in nodes for path in node["images"]
+                    if path in session.image_jobs}
+            ready.set_result((nodes, jobs))
+
+    def _watch_sections(self, session):
+        loop = asyncio.get_running_loop()
+        session.on_section = lambda name, nodes: loop.call_soon_threadsafe(self._finish, session, name, nodes)
+
+    async def tour_session(self, session, pages):
+        """Tour some pages in a browser session of their own"""
+        self._watch_sections(session)
+        session.image_queue = self.images
+        browser = AsyncBrowser(session)
+        try:
+            await browser.start()
+            await browser.tour(pages)
+        finally:
+            await browser.close()
+            # Pages skipped after a failed login are left out of the manual
+            for name in pages:
+                self._finish(session, name, [])
+
+    async def text_sections(self, session, names):
+        """Run text sections one after another, off the loop"""
+        self._watch_sections(session)
+        try:
+            for name in names:
+                await asyncio.to_thread(session.run_section, name, getattr(session, self.section_methods[name]))
+        finally:
+            for name in names:
+                self._finish(session, name, [])
+
+    def merge_sessions(self, sessions):
+        generator = self.generator
+        perf_dir = os.path.join(PERF_DIR, generator.network_profile) if generator.network_profile else PERF_DIR
+        generator.perf = PerformanceRecorder(None, run_id=generator.perf_run_id, perf_dir=perf_dir)
+        for number, session in enumerate(sessions, start=1):
+            generator.memory.merge(session.memory, f"session {number}")
+            generator.captured += session.captured
+            generator.clips += session.clips
+            if session.perf:
+                generator.perf.samples += session.perf.samples
+
+    async def write_document(self, doc_path):
+        """Write the sections in manual order as soon as each one and its images are ready
+
+        Writing happens on the loop: a section takes milliseconds once its
+        images are encoded. Its memory phase is "write <name>"; the sessions
+        record the tour steps themselves.
+        """
+        generator = self.generator
+        with generator.memory.phase("styles"):
+            generator.setup_document_styles()
+        with generator.memory.phase("cover"):
+            generator.add_cover_page()
+        with generator.memory.phase("toc"):
+            generator.add_table_of_contents()
+
+        for name in self.pages + self.sections:
+            nodes, jobs = await self.ready[name]
+            for job in jobs.values():
+                await asyncio.wrap_future(job)
+            generator.image_jobs.update(jobs)
+            generator.section_nodes[name] = nodes
+            with generator.memory.phase(f"write {name}"):
+                for node in nodes:
+                    generator.content_tree.append(node)
+                    generator.write_section(node)
+
+        started = time.perf_counter()
+        with generator.memory.phase("save"):
+            generator.toc.finish()
+            save_document(generator.doc, doc_path)
+        record_step("save", "save", time.perf_counter() - started)
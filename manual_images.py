@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Image Derivatives for the User Manual Renderers
+Scales screenshots to each renderer's target width and caches the result on
+disk, so every screenshot is encoded once per target resolution no matter how
+many renderers, variants or processes use it.
+"""
+
+import os
+import struct
+import hashlib
+import tempfile
+import threading
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+
+from manual_template import CACHE_DIR
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+IMAGE_CACHE_DIR = os.path.join(CACHE_DIR, "images")
+
+# Screenshot width in pixels for each output format
+RENDER_IMAGE_WIDTH = {"docx": 1200, "pdf": 900, "html": 1200}
+
+# Prefer a palette PNG (crisp UI text) unless JPEG is clearly smaller (photographic content)
+JPEG_QUALITY = 85
+JPEG_PREFERENCE_RATIO = 0.75
+
+# Content digests keyed by (path, size, mtime), so unchanged files are hashed once
+_digests = {}
+
+# Pixel digests keyed by file digest, and encoded media keyed by (pixel digest, width)
+_pixel_digests = {}
+_media = {}
+
+# The digest caches are filled from the image pool, the async encoders and prepare_* threads
+_cache_lock = threading.Lock()
+
+
+def file_digest(path):
+    """SHA-1 of a file's contents"""
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    with _cache_lock:
+        digest = _digests.get(key)
+    if digest is None:
+        with open(path, "rb") as f:
+            digest = hashlib.sha1(f.read()).hexdigest()
+        with _cache_lock:
+            _digests[key] = digest
+    return digest
+
+
+def _write_cached(cached, write):
+    """Write a cache file through a temporary file of its own, then move it in place
+
+    Every call gets a unique temporary name, so threads and processes that
+    encode the same image at once never touch each other's partial files.
+    A file another writer already moved in place holds the same content.
+    """
+    os.makedirs(IMAGE_CACHE_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=IMAGE_CACHE_DIR, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp_path, cached)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        if not os.path.exists(cached):
+            raise
+
+
+def png_size(data):
+    """Return (width, height) from PNG bytes without decoding the image"""
+    if data[:8] != b"\x89PNG\r\n\x1a\n":
+        raise ValueError("Not a PNG image")
+    return struct.unpack(">II", data[16:24])
+
+
+def derivative_path(path, width):
+    """Cache location of a PNG derivative of an image at a target width"""
+    return os.path.join(IMAGE_CACHE_DIR, f"{file_digest(path)}_{width}.png")
+
+
+def image_derivative(path, width):
+    """Return the path of a PNG copy of an image scaled down to width pixels
+
+    Images that are already narrow enough, and all images when Pillow is not
+    installed, are returned unchanged.
+    """
+    if Image is None:
+        return path
+
+    cached = derivative_path(path, width)
+    if os.path.exists(cached):
+        return cached
+
+    with Image.open(path) as image:
+        if image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        if image.width > width:
+            height = round(image.height * width / image.width)
+            image = image.resize((width, height), Image.LANCZOS)
+        # Concurrent renderers never read a partial file
+        _write_cached(cached, lambda f: image.save(f, "PNG", optimize=True))
+    return cached
+
+
+def prepare_derivatives(paths, widths, workers=None):
+    """Encode every (image, width) pair once, in parallel, before rendering"""
+    jobs = {(path, width) for path in paths for width in widths}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(lambda job: image_derivative(*job), jobs))
+
+
+def pixel_digest(path):
+    """SHA-1 of an image's decoded pixels
+
+    Two files showing the same pixels (say, a logo or an unchanged tab
+    re-captured later) share a digest even if their encodings differ.
+    """
+    file_key = file_digest(path)
+    with _cache_lock:
+        digest = _pixel_digests.get(file_key)
+    if digest is None:
+        with Image.open(path) as image:
+            image.load()
+            digest = hashlib.sha1(
+                f"{image.mode}{image.size}".encode("ascii") + image.tobytes()
+            ).hexdigest()
+        with _cache_lock:
+            _pixel_digests[file_key] = digest
+    return digest
+
+
+def encode_smallest(image):
+    """Encode an image in the smallest acceptable format for Word
+
+    Returns (bytes, extension). Flat UI content becomes a palette PNG when
+    that loses no pixel, other images a full-colour PNG, photographic
+    content a JPEG, and images with transparency stay PNG.
+    WebP and other formats Word cannot display always end up as PNG/JPEG.
+    """
+    has_alpha = image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info)
+    if has_alpha:
+        image = image.convert("RGBA")
+        if image.getextrema()[3][0] == 255:
+            image, has_alpha = image.convert("RGB"), False
+    elif image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+
+    candidates = []
+    buffer = BytesIO()
+    palette = None
+    if image.getcolors(256) is not None:
+        palette = image.convert("P", palette=Image.ADAPTIVE, colors=256)
+        # Only a palette that reproduces every pixel is used; anything else stays full colour
+        if palette.convert(image.mode).tobytes() != image.tobytes():
+            palette = None
+    (palette or image).save(buffer, "PNG", optimize=True)
+    candidates.append((buffer.getvalue(), "png"))
+
+    if not has_alpha:
+        buffer = BytesIO()
+        image.save(buffer, "JPEG", quality=JPEG_QUALITY, optimize=True)
+        jpeg = buffer.getvalue()
+        if len(jpeg) < JPEG_PREFERENCE_RATIO * len(candidates[0][0]):
+            candidates.append((jpeg, "jpg"))
+
+    return candidates[-1]
+
+
+def docx_media(path, width=None):
+    """Return the path of the smallest acceptable encoding of an image for DOCX
+
+    Encodings are cached by pixel digest, so identical images always map
+    to byte-identical media, which python-docx stores in word/media once
+    and references from every place it is used.
+    """
+    if Image is None:
+        return path
+    width = width or RENDER_IMAGE_WIDTH["docx"]
+    key = (pixel_digest(path), width)
+    with _cache_lock:
+        cached = _media.get(key)
+    if cached and os.path.exists(cached):
+        return cached
+
+    stem = os.path.join(IMAGE_CACHE_DIR, f"media_{key[0]}_{width}")
+    for extension in ("png", "jpg"):
+        if os.path.exists(f"{stem}.{extension}"):
+            with _cache_lock:
+                _media[key] = f"{stem}.{extension}"
+            return f"{stem}.{extension}"
+
+    with Image.open(path) as image:
+        image.load()
+        if image.width > width:
+            image = image.resize((width, round(image.height * width / image.width)), Image.LANCZOS)
+        data, extension = encode_smallest(image)
+
+    cached = f"{stem}.{extension}"
+    _write_cached(cached, lambda f: f.write(data))
+    with _cache_lock:
+        _media[key] = cached
+    return cached
+
+
+def cached_media_size(path, width=None):
+    """Size in bytes of the cached DOCX media for an image, or None if it was never encoded"""
+    if Image is None or not os.path.exists(path):
+        return None
+    stem = os.path.join(IMAGE_CACHE_DIR, f"media_{pixel_digest(path)}_{width or RENDER_IMAGE_WIDTH['docx']}")
+    for extension in ("png", "jpg"):
+        if os.path.exists(f"{stem}.{extension}"):
+            return os.path.getsize(f"{stem}.{extension}")
+    return None
+
+
+def prepare_media(paths, workers=None):
+    """Encode the DOCX media for every image once, in parallel"""
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(docx_media, set(paths)))
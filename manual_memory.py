@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Memory Profiling for the User Manual Build
+Measures every phase of a build (styles, cover, table of contents, each
+section, each capture, save) with tracemalloc and a background RSS sampler,
+reports the peak per phase with its top allocation sites and checks the peaks
+against a memory budget. Disabled profilers cost nothing.
+"""
+
+import os
+import time
+import threading
+import tracemalloc
+from contextlib import contextmanager
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# RSS sampling interval in seconds
+SAMPLE_INTERVAL = 0.02
+
+# Frames kept per allocation; one is enough to name the allocating line
+TRACE_FRAMES = 1
+
+MB = 1024 * 1024
+
+# The profiler's own allocations are left out of the allocation sites
+_OWN_FILES = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+
+
+class MemoryBudgetExceeded(RuntimeError):
+    """Raised by MemoryProfiler.assert_within_budget"""
+
+
+def current_rss():
+    """Resident set size of this process in bytes, or None where it cannot be read"""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+# Profilers share tracemalloc; it is stopped when the last one stops
+_lock = threading.Lock()
+_profilers = 0
+
+# Phases in progress in every profiler and thread
+_open = []
+
+
+class MemoryProfiler:
+    """Collects per-phase memory figures
+
+    Use `with profiler.phase("name"):` around each phase. Phases may nest
+    (a capture inside a tour step); an outer phase's peak includes its inner
+    phases. Any thread may run phases, and every browser session of a build
+    has a profiler of its own. Memory figures are process-wide: while phases
+    of other threads are open, a phase's traced peak is sampled rather than
+    exact. budget_mb applies to the RSS peak, or to the traced peak where
+    RSS is not available.
+    """
+
+    def __init__(self, enabled=False, budget_mb=None, top=5):
+        self.enabled = enabled
+        self.budget_mb = budget_mb
+        self.top = top
+        self.phases = []
+        self._stacks = {}
+        self._open = []
+        self._sampler = None
+        self._stop = threading.Event()
+
+    def start(self):
+        global _profilers
+        if not self.enabled or self._sampler is not None:
+            return
+        with _lock:
+            if _profilers == 0 and not tracemalloc.is_tracing():
+                tracemalloc.start(TRACE_FRAMES)
+            _profilers += 1
+        self._stop.clear()
+        self._sampler = threading.Thread(target=self._sample, name="memory-sampler", daemon=True)
+        self._sampler.start()
+
+    def stop(self):
+        global _profilers
+        if self._sampler is None:
+            return
+        self._stop.set()
+        self._sampler.join()
+        self._sampler = None
+        with _lock:
+            _profilers -= 1
+            if _profilers == 0:
+                tracemalloc.stop()
+
+    def merge(self, other, label):
+        """Append the phases of another profiler (a browser session's) under a label"""
+        self.phases += [dict(phase, name=f"[{label}] {phase['name']}") for phase in other.phases]
+
+    def _sample(self):
+        while not self._stop.wait(SAMPLE_INTERVAL):
+            rss = current_rss()
+            traced = tracemalloc.get_traced_memory()[0]
+            for phase in list(self._open):
+                if rss is not None:
+                    phase["rss_peak"] = max(phase["rss_peak"] or 0, rss)
+                phase["traced_peak"] = max(phase["traced_peak"], traced)
+
+    @contextmanager
+    def phase(self, name):
+        if not self.enabled:
+            yield
+            return
+        self.start()
+        stack = self._stacks.setdefault(threading.get_ident(), [])
+        rss = current_rss()
+        phase = {
+            "name": name, "depth": len(stack), "traced_peak": 0, "rss_peak": rss,
+            "traced_start": tracemalloc.get_traced_memory()[0],
+            "snapshot": tracemalloc.take_snapshot().filter_traces(_OWN_FILES), "started": time.perf_counter(),
+        }
+        with _lock:
+            # tracemalloc keeps one peak for the process; only reset it when no other thread's phase relies on it
+            phase["exact"] = all(other in stack for other in _open)
+            if phase["exact"]:
+                if stack:
+                    stack[-1]["traced_peak"] = max(stack[-1]["traced_peak"], tracemalloc.get_traced_memory()[1])
+                tracemalloc.reset_peak()
+            _open.append(phase)
+        stack.append(phase)
+        self._open.append(phase)
+        self.phases.append(phase)
+        try:
+            yield
+        finally:
+            stack.pop()
+            self._open.remove(phase)
+            with _lock:
+                _open.remove(phase)
+                current, peak = tracemalloc.get_traced_memory()
+                phase["traced_peak"] = max(phase["traced_peak"], peak if phase.pop("exact") else current)
+                if stack:
+                    stack[-1]["traced_peak"] = max(stack[-1]["traced_peak"], phase["traced_peak"])
+            # Still allocated when the phase ended, compared with when it started
+            phase["retained"] = current - phase.pop("traced_start")
+            phase["seconds"] = time.perf_counter() - phase["started"]
+            rss = current_rss()
+            if rss is not None:
+                phase["rss_peak"] = max(phase["rss_peak"] or 0, rss)
+            # Allocation sites that grew during the phase
+            stats = tracemalloc.take_snapshot().filter_traces(_OWN_FILES).compare_to(phase.pop("snapshot"), "lineno")
+            phase["top"] = [(str(stat.traceback[0]), stat.size_diff) for stat in stats[:self.top] if stat.size_diff > 0]
+            del phase["started"]
+
+    def peak(self, phase):
+        """The figure the budget applies to, in bytes"""
+        return phase["rss_peak"] if phase["rss_peak"] is not None else phase["traced_peak"]
+
+    def over_budget(self):
+        if not self.budget_mb:
+            return []
+        return [phase for phase in self.phases if self.peak(phase) > self.budget_mb * MB]
+
+    def assert_within_budget(self):
+        """Raise MemoryBudgetExceeded when any phase peaked above the budget (for tests and CI)"""
+        exceeded = self.over_budget()
+        if exceeded:
+            worst = max(exceeded, key=self.peak)
+            raise MemoryBudgetExceeded(
+                f"{len(exceeded)} phase(s) over the {self.budget_mb} MB memory budget, "
+                f"worst: {worst['name']} at {self.peak(worst) / MB:.1f} MB"
+            )
+
+    def report_lines(self):
+        """Per-phase peaks in build order, then the allocation sites of the heaviest phases"""
+        if not self.phases:
+            return []
+        exceeded = self.over_budget()
+        lines = [f"{'phase':<48}{'RSS peak':>10}{'traced peak':>13}{'retained':>10}{'time':>8}"]
+        for phase in self.phases:
+            rss = f"{phase['rss_peak'] / MB:.1f} MB" if phase["rss_peak"] is not None else "n/a"
+            flag = " ❌" if phase in exceeded else ""
+            lines.append(f"{'  ' * phase['depth'] + phase['name']:<48}{rss:>10}{phase['traced_peak'] / MB:>10.1f} MB"
+                         f"{phase['retained'] / MB:>+7.1f} MB{phase['seconds']:>7.2f}s{flag}")
+        heaviest = sorted(self.phases, key=lambda phase: phase["traced_peak"], reverse=True)[:3]
+        for phase in heaviest:
+            if phase["top"]:
+                lines += ["", f"Top allocation sites in {phase['name']}:"]
+                lines += [f"  {size / 1024:>9.0f} KB  {site}" for site, size in phase["top"]]
+        return lines
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Parallel DOCX Package Writer for the User Manual Generators
+Serializes a python-docx document and deflates its parts across CPU cores.
+Already-compressed media (PNG, JPEG, GIF) is stored as-is instead of being
+deflated a second time. The result is a standard ZIP package that Word opens
+like any document saved by python-docx.
+"""
+
+import os
+import sys
+import zlib
+import time
+import struct
+import argparse
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from docx.opc.packuri import CONTENT_TYPES_URI, PACKAGE_URI
+    from docx.opc.pkgwriter import _ContentTypesItem
+except ImportError:
+    print("Installing python-docx...")
+    os.system("pip install python-docx")
+    from docx.opc.packuri import CONTENT_TYPES_URI, PACKAGE_URI
+    from docx.opc.pkgwriter import _ContentTypesItem
+
+# Deflate level and chunk size per preset (speed vs. size)
+SAVE_PRESETS = {
+    "fast": {"level": 1, "chunk_size": 256 * 1024},
+    "balanced": {"level": 6, "chunk_size": 1024 * 1024},
+    "small": {"level": 9, "chunk_size": 4 * 1024 * 1024},
+}
+
+DEFAULT_PRESET = "balanced"
+
+# Media types that gain nothing from another round of deflate
+STORED_CONTENT_TYPES = {"image/png", "image/jpeg", "image/gif"}
+
+# 1980-01-01 00:00, the earliest ZIP timestamp, keeps output reproducible
+ZIP_DATE, ZIP_TIME = (0 << 9) | (1 << 5) | 1, 0
+
+LOCAL_HEADER = struct.Struct("<IHHHHHIIIHH")
+CENTRAL_HEADER = struct.Struct("<IHHHHHHIIIHHHHHII")
+END_RECORD = struct.Struct("<IHHHHIIH")
+
+
+def package_entries(doc):
+    """Return [(member name, content type, bytes)] in python-docx's write order"""
+    package = doc.part.package
+    for part in package.parts:
+        part.before_marshal()
+    parts = package.parts
+
+    entries = [
+        (CONTENT_TYPES_URI.membername, "application/xml", _ContentTypesItem.from_parts(parts).blob),
+        (PACKAGE_URI.rels_uri.membername, "application/xml", package.rels.xml),
+    ]
+    for part in parts:
+        entries.append((part.partname.membername, part.content_type, part.blob))
+        if len(part.rels):
+            entries.append((part.partname.rels_uri.membername, "application/xml", part.rels.xml))
+    return entries
+
+
+def chunk_bounds(size, chunk_size):
+    """(start, end) of each deflate chunk of a part; an empty part is one empty chunk"""
+    return [(start, min(start + chunk_size, size)) for start in range(0, size, chunk_size)] or [(0, 0)]
+
+
+def deflate_chunk(view, start, end, level):
+    """Raw deflate of one chunk of a part
+
+    Each chunk is primed with the previous 32 KiB as a dictionary and all
+    but the last end on a sync flush, so the chunks concatenated in order
+    are one valid deflate stream (the pigz approach).
+    """
+    zdict = bytes(view[max(0, start - 32768):start])
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15, zdict=zdict) if zdict else \
+        zlib.compressobj(level, zlib.DEFLATED, -15)
+    flush_mode = zlib.Z_FINISH if end == len(view) else zlib.Z_SYNC_FLUSH
+    return compressor.compress(view[start:end]) + compressor.flush(flush_mode)
+
+
+def deflate(data, level, chunk_size):
+    """Raw deflate of a whole part, one chunk after another"""
+    view = memoryview(data)
+    return b"".join(deflate_chunk(view, start, end, level) for start, end in chunk_bounds(len(data), chunk_size))
+
+
+def _submit_entry(pool, entry, level, chunk_size):
+    """Queue a part's CRC and each of its deflate chunks as separate jobs
+
+    Returns a function that waits for them and gives the part's ZIP member
+    (name, method, crc, size, payload), with the chunks joined in order.
+    """
+    name, content_type, data = entry
+    crc = pool.submit(zlib.crc32, data)
+    if content_type in STORED_CONTENT_TYPES:
+        return lambda: (name, 0, crc.result(), len(data), data)
+    view = memoryview(data)
+    chunks = [pool.submit(deflate_chunk, view, start, end, level) for start, end in chunk_bounds(len(data), chunk_size)]
+    return lambda: (name, 8, crc.result(), len(data), b"".join(chunk.result() for chunk in chunks))
+
+
+def write_zip(stream, members):
+    """Write (name, method, crc, size, payload) members as a ZIP archive"""
+    central = []
+    offset = 0
+    for name, method, crc, size, payload in members:
+        encoded = name.encode("utf-8")
+        flags = 0x800 if not encoded.isascii() else 0
+        if size > 0xFFFFFFFF or len(payload) > 0xFFFFFFFF or offset > 0xFFFFFFFF:
+            raise ValueError("Package too large for a ZIP without ZIP64 extensions")
+        header = LOCAL_HEADER.pack(0x04034b50, 20, flags, method, ZIP_TIME, ZIP_DATE,
+                                   crc, len(payload), size, len(encoded), 0)
+        stream.write(header)
+        stream.write(encoded)
+        stream.write(payload)
+        central.append(CENTRAL_HEADER.pack(0x02014b50, 20, 20, flags, method, ZIP_TIME, ZIP_DATE,
+                                           crc, len(payload), size, len(encoded), 0, 0, 0, 0, 0, offset) + encoded)
+        offset += len(header) + len(encoded) + len(payload)
+
+    directory = b"".join(central)
+    stream.write(directory)
+    stream.write(END_RECORD.pack(0x06054b50, 0, 0, len(central), len(central), len(directory), offset, 0))
+
+
+def save_document(doc, target, preset=DEFAULT_PRESET, workers=None):
+    """Save a python-docx document, compressing its parts in parallel
+
+    target may be a file name or a writable binary stream. zlib releases
+    the GIL while it compresses, so a thread pool uses every core.
+    """
+    settings = SAVE_PRESETS[preset]
+    entries = package_entries(doc)
+
+    # Every chunk is a job of its own, so a single large part also spreads across cores
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        members = [_submit_entry(pool, entry, settings["level"], settings["chunk_size"]) for entry in entries]
+        members = [member() for member in members]
+
+    if hasattr(target, "write"):
+        write_zip(target, members)
+    else:
+        tmp_path = f"{target}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            write_zip(f, members)
+        os.replace(tmp_path, target)
+    return target
+
+
+def benchmark(screenshots=200, output_dir="."):
+    """Compare python-docx's serial save with each preset on a screenshot-heavy manual"""
+    from PIL import Image
+    from docx.shared import Inches
+    from create_manual_basic import BasicUserManualGenerator, SCREENSHOTS_DIR
+
+    print(f"Building a manual with {screenshots} unique screenshots...")
+    generator = BasicUserManualGenerator()
+    generator.build_document()
+    sources = sorted(
+        os.path.join(SCREENSHOTS_DIR, name) for name in os.listdir(SCREENSHOTS_DIR) if name.endswith(".png")
+    )
+    for number in range(screenshots):
+        with Image.open(sources[number % len(sources)]) as image:
+            image = image.convert("RGB")
+            # Mark each copy so every screenshot is a distinct media part
+            image.putpixel((number % image.width, 0), (number % 256, number // 256, 0))
+            buffer = BytesIO()
+            image.save(buffer, "PNG")
+        buffer.seek(0)
+        generator.doc.add_picture(buffer, width=Inches(6))
+
+    results = []
+    start = time.perf_counter()
+    generator.doc.save(os.path.join(output_dir, "benchmark_python_docx.docx"))
+    results.append(("python-docx save", time.perf_counter() - start,
+                    os.path.getsize(os.path.join(output_dir, "benchmark_python_docx.docx"))))
+    for preset in SAVE_PRESETS:
+        path = os.path.join(output_dir, f"benchmark_{preset}.docx")
+        start = time.perf_counter()
+        save_document(generator.doc, path, preset)
+        results.append((f"save_document({preset})", time.perf_counter() - start, os.path.getsize(path)))
+
+    print(f"\n{'Method':<28}{'Time':>10}{'Size':>14}")
+    for label, seconds, size in results:
+        print(f"{label:<28}{seconds:>9.2f}s{size / 1024 / 1024:>12.2f} MB")
+    return results
+
+
+def main():
+    """Main function to run the save benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark parallel DOCX package saving")
+    parser.add_argument("--screenshots", type=int, default=200, help="Screenshots in the benchmark manual")
+    parser.add_argument("--output-dir", default=".", help="Where to write the benchmark documents")
+    args = parser.parse_args()
+
+    print(f"=== DOCX Save Benchmark ({os.cpu_count()} CPUs) ===")
+    benchmark(args.screenshots, args.output_dir)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Page Performance Collection for the Website Tour
+Installs Web Vitals observers before any page script runs and, at every tour
+step, reads Navigation Timing, Resource Timing, LCP/CLS/INP, long tasks, the
+JS heap and the app's client cache statistics (window.__cacheStats, see
+lib/cache.ts) from the page. Samples are appended to one JSON Lines file per
+run under perf/, so runs form a time series.
+"""
+
+import os
+import json
+import time
+from datetime import datetime
+
+PERF_DIR = "perf"
+
+# Cache keys of lib/cache.ts and the service calls that use them
+CACHE_KEYS = {
+    "inventory_items": "InventoryService.getAll",
+    "stock_items": "StockService.getAll",
+    "stock_history": "StockHistoryService.getAll",
+}
+
+# Runs before the page's own scripts on every document (Page.addScriptToEvaluateOnNewDocument)
+VITALS_OBSERVER_SCRIPT = """
+(() => {
+  const vitals = window.__manualVitals = {
+    lcp: null, cls: 0, inp: null, longTasks: 0, longTaskTime: 0, totalBlockingTime: 0,
+    resourceIndex: 0
+  };
+  const observe = (type, callback, options) => {
+    try {
+      new PerformanceObserver(list => list.getEntries().forEach(callback))
+        .observe(Object.assign({type: type, buffered: true}, options || {}));
+    } catch (e) { /* entry type not supported by this browser */ }
+  };
+  observe("largest-contentful-paint", entry => { vitals.lcp = entry.startTime; });
+  // CLS is the largest session window of shifts <1s apart and <5s long
+  let session = 0, sessionStart = 0, lastShift = 0;
+  observe("layout-shift", entry => {
+    if (entry.hadRecentInput) return;
+    if (entry.startTime - lastShift > 1000 || entry.startTime - sessionStart > 5000) {
+      session = 0;
+      sessionStart = entry.startTime;
+    }
+    session += entry.value;
+    lastShift = entry.startTime;
+    vitals.cls = Math.max(vitals.cls, session);
+  });
+  observe("event", entry => {
+    if (entry.interactionId) vitals.inp = Math.max(vitals.inp || 0, entry.duration);
+  }, {durationThreshold: 16});
+  observe("longtask", entry => {
+    vitals.longTasks += 1;
+    vitals.longTaskTime += entry.duration;
+    vitals.totalBlockingTime += Math.max(0, entry.duration - 50);
+  });
+})();
+"""
+
+# Reads everything measured since the previous call on the same document
+COLLECT_SCRIPT = """
+const vitals = window.__manualVitals || {};
+const nav = performance.getEntriesByType("navigation")[0];
+const paint = performance.getEntriesByName("first-contentful-paint")[0];
+const resources = performance.getEntriesByType("resource");
+const fresh = resources.slice(vitals.resourceIndex || 0);
+vitals.resourceIndex = resources.length;
+const byType = {};
+for (const entry of fresh) {
+  const bucket = byType[entry.initiatorType] = byType[entry.initiatorType] || {count: 0, bytes: 0};
+  bucket.count += 1;
+  bucket.bytes += entry.transferSize || 0;
+}
+return {
+  url: location.href,
+  navigation: nav ? {
+    type: nav.type,
+    ttfb: nav.responseStart,
+    domContentLoaded: nav.domContentLoadedEventEnd,
+    load: nav.loadEventEnd,
+    transferSize: nav.transferSize,
+    decodedBodySize: nav.decodedBodySize
+  } : null,
+  fcp: paint ? paint.startTime : null,
+  lcp: vitals.lcp === undefined ? null : vitals.lcp,
+  cls: vitals.cls === undefined ? null : vitals.cls,
+  inp: vitals.inp === undefined ? null : vitals.inp,
+  longTasks: vitals.longTasks || 0,
+  longTaskTime: vitals.longTaskTime || 0,
+  totalBlockingTime: vitals.totalBlockingTime || 0,
+  resources: {
+    count: fresh.length,
+    transferSize: fresh.reduce((sum, entry) => sum + (entry.transferSize || 0), 0),
+    byType: byType,
+    slowest: fresh.slice().sort((a, b) => b.duration - a.duration).slice(0, 5)
+      .map(entry => ({name: entry.name, duration: entry.duration, transferSize: entry.transferSize}))
+  },
+  heap: performance.memory ? {
+    used: performance.memory.usedJSHeapSize, total: performance.memory.totalJSHeapSize
+  } : null,
+  // Cumulative for the document; identified by timeOrigin so reloads can be detected
+  cache: window.__cacheStats ? Object.assign({timeOrigin: performance.timeOrigin}, window.__cacheStats()) : null
+};
+"""
+
+
+def run_path(run_id, perf_dir=PERF_DIR):
+    return os.path.join(perf_dir, f"{run_id}.jsonl")
+
+
+def load_samples(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _cache_counts(stats):
+    return {name: stats.get(name, 0) for name in ("cacheHits", "cacheMisses", "apiCalls")}
+
+
+def cache_delta(current, previous):
+    """Cache activity since the previous step
+
+    The counters live in the page, so they start again after a full page
+    load; the previous snapshot only counts if it came from the same document.
+    """
+    if previous is None or previous.get("timeOrigin") != current.get("timeOrigin"):
+        previous = {}
+    delta = {name: value - previous.get(name, 0) for name, value in _cache_counts(current).items()}
+    lookups = delta["cacheHits"] + delta["cacheMisses"]
+    delta["hitRatio"] = delta["cacheHits"] / lookups if lookups else None
+    previous_keys = previous.get("keys", {})
+    delta["keys"] = {}
+    for key, stats in current.get("keys", {}).items():
+        before = _cache_counts(previous_keys.get(key, {}))
+        changes = {name: value - before[name] for name, value in _cache_counts(stats).items()}
+        if any(changes.values()):
+            delta["keys"][key] = changes
+    return delta
+
+
+class PerformanceRecorder:
+    """Collects one performance sample per tour step into perf/<run id>.jsonl"""
+
+    def __init__(self, driver, run_id=None, perf_dir=PERF_DIR):
+        self.driver = driver
+        self.run_id = run_id or datetime.now().strftime("%Y%m%d-%H%M%S")
+        self.path = run_path(self.run_id, perf_dir)
+        self.samples = []
+        self._cache_snapshot = None
+
+    def install(self):
+        """Register the observers for every document loaded from now on"""
+        self.driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": VITALS_OBSERVER_SCRIPT})
+        self.driver.execute_cdp_cmd("Performance.enable", {})
+
+    def collect(self, page):
+        """Record the measurements for the page the browser is showing now"""
+        try:
+            sample = self.driver.execute_script(COLLECT_SCRIPT)
+            metrics = self.driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]
+        except Exception as e:
+            print(f"Could not collect performance data for {page}: {e}")
+            return None
+
+        devtools = {metric["name"]: metric["value"] for metric in metrics}
+        sample.update(
+            run=self.run_id,
+            page=page,
+            timestamp=time.time(),
+            # DevTools counters are more precise than performance.memory, which Chrome quantizes
+            heap={"used": devtools.get("JSHeapUsedSize"), "total": devtools.get("JSHeapTotalSize")},
+            dom_nodes=devtools.get("Nodes"),
+        )
+        if sample.get("cache"):
+            snapshot = sample["cache"]
+            sample["cache"] = cache_delta(snapshot, self._cache_snapshot)
+            self._cache_snapshot = snapshot
+        self.samples.append(sample)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(sample) + "\n")
+        return sample
+
+
+def _ms(value):
+    return "n/a" if value is None else f"{value / 1000:.2f} s" if value >= 1000 else f"{value:.0f} ms"
+
+
+def appendix_paragraphs(samples, path=None):
+    """Text for the Performance Appendix, one bullet per tour step
+
+    path is the file the samples were saved to (default: the run's file in PERF_DIR).
+    """
+    if not samples:
+        return []
+    lines = [
+        f"Measured during the documentation tour on {datetime.fromtimestamp(samples[0]['timestamp']):%B %d, %Y} "
+        f"(run {samples[0]['run']}). Times are from the start of the page load; resource figures cover the "
+        "requests made since the previous step.",
+        "",
+    ]
+    for sample in samples:
+        navigation = sample.get("navigation") or {}
+        heap = (sample.get("heap") or {}).get("used")
+        resources = sample["resources"]
+        parts = [
+            f"load {_ms(navigation.get('load'))}",
+            f"LCP {_ms(sample.get('lcp'))}",
+            f"CLS {sample['cls']:.3f}" if sample.get("cls") is not None else "CLS n/a",
+            f"INP {_ms(sample.get('inp'))}",
+            f"{resources['count']} requests / {resources['transferSize'] / 1024:.0f} KB",
+            f"{sample['longTasks']} long tasks",
+        ]
+        if heap:
+            parts.append(f"heap {heap / 1024 / 1024:.1f} MB")
+        cache = sample.get("cache")
+        if cache and cache["hitRatio"] is not None:
+            parts.append(f"cache hits {cache['hitRatio']:.0%}, {cache['apiCalls']} API calls")
+        lines.append(f"• {sample['page']}: " + ", ".join(parts))
+    fetches = repeated_fetches(samples)
+    if fetches:
+        lines += ["", "Data fetched again from the server during the tour:"]
+        for key, pages in fetches.items():
+            lines.append(f"• {CACHE_KEYS.get(key, key)}: {len(pages)} times ({', '.join(pages)})")
+    lines += ["", f"Raw samples: {path or run_path(samples[0]['run'])}"]
+    return lines
+
+
+def repeated_fetches(samples):
+    """{cache key: [page, ...]} for keys that went to the server on more than one step"""
+    pages = {}
+    for sample in samples:
+        for key, stats in ((sample.get("cache") or {}).get("keys") or {}).items():
+            if stats["apiCalls"]:
+                pages.setdefault(key, []).append(sample["page"])
+    return {key: fetched for key, fetched in pages.items() if len(fetched) > 1}
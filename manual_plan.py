@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Build Plans for the Tour-Based User Manual
+Every tour step and text section records its duration, images and text size
+in a history file as it runs; only the last HISTORY_RUNS runs of each step are
+kept. A plan resolves the steps a build would run and
+estimates its wall time and output size from that history and from the image
+cache, without starting a browser.
+"""
+
+import os
+import json
+import time
+import tempfile
+import threading
+from statistics import median
+
+from manual_template import CACHE_DIR, load_template_bytes
+from manual_images import cached_media_size
+
+HISTORY_PATH = os.path.join(CACHE_DIR, "step_history.jsonl")
+
+# Estimates use the median of this many most recent runs of a step; older runs are dropped
+HISTORY_RUNS = 10
+
+# Seconds assumed for steps that never ran, by kind
+DEFAULT_SECONDS = {"setup": 3.0, "login": 5.0, "page": 20.0, "section": 0.05, "save": 0.5}
+
+# Deflated size of document XML relative to its text
+TEXT_COMPRESSION = 0.3
+
+# Text sections that summarize the tour; manual_async writes them once every
+# session has finished, and the other sections while the pages are toured
+AFTER_TOUR_SECTIONS = ("performance",)
+
+# App sources that show on every page, in addition to each step's own
+SHARED_SOURCES = ["app/layout.tsx", "app/globals.css", "components/ui", "components/layout",
+                  "components/providers", "lib", "services", "hooks", "styles"]
+
+
+# Browser sessions of one build record their steps from threads of their own
+_history_lock = threading.Lock()
+
+
+def record_step(name, kind, seconds, images=(), text_bytes=0, path=HISTORY_PATH):
+    """Add one timing to the step history; image paths are stored absolute
+
+    The file is rewritten with the last HISTORY_RUNS entries of every step,
+    so it stays the same size however many builds have run.
+    """
+    entry = {"name": name, "kind": kind, "seconds": round(seconds, 3),
+             "images": [os.path.abspath(image) for image in images],
+             "text_bytes": text_bytes, "timestamp": time.time()}
+    with _history_lock:
+        try:
+            history = load_history(path)
+            history.setdefault(name, []).append(entry)
+            write_history(history, path)
+        except (OSError, ValueError) as e:
+            print(f"Could not record step timing: {e}")
+
+
+def write_history(history, path=HISTORY_PATH):
+    """Replace the history file with the most recent HISTORY_RUNS entries per step"""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            for entries in history.values():
+                for entry in entries[-HISTORY_RUNS:]:
+                    f.write(json.dumps(entry) + "\n")
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def load_history(path=HISTORY_PATH):
+    """{step name: [entries]} with the most recent HISTORY_RUNS entries per step"""
+    history = {}
+    if not os.path.exists(path):
+        return history
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            # A build killed while writing leaves a partial line; it is skipped
+            try:
+                entry = json.loads(line)
+                float(entry["seconds"])
+                history.setdefault(entry["name"], []).append(entry)
+            except (ValueError, TypeError, KeyError):
+                continue
+    return {name: entries[-HISTORY_RUNS:] for name, entries in history.items()}
+
+
+def page_groups(pages, workers, tour_steps=None):
+    """Split pages into at most `workers` consecutive groups, one per browser session
+
+    A page whose step continues on another page ("after" in tour_steps)
+    stays in that page's group, so it never starts a session of its own.
+    """
+    units = []
+    for name in pages:
+        after = (tour_steps or {}).get(name, {}).get("after")
+        if units and after in units[-1]:
+            units[-1].append(name)
+        else:
+            units.append([name])
+    size = -(-len(units) // max(1, workers))
+    return [sum(units[i:i + size], []) for i in range(0, len(units), size)]
+
+
+def newest_source_change(sources, root):
+    """Latest mtime (seconds) among the files under the given app sources"""
+    newest = 0
+    for source in sources:
+        path = os.path.join(root, source)
+        if os.path.isfile(path):
+            newest = max(newest, os.path.getmtime(path))
+        for directory, _, files in os.walk(path):
+            for name in files:
+                newest = max(newest, os.path.getmtime(os.path.join(directory, name)))
+    return newest
+
+
+def _size(size):
+    return f"{size / 1024 / 1024:.1f} MB" if size >= 1024 * 1024 else f"{size / 1024:.0f} KB"
+
+
+class BuildPlan:
+    """What a build with the given pages, sections and workers would do"""
+
+    def __init__(self, tour_steps, pages, sections, workers=1, history=None, root=None):
+        self.tour_steps = tour_steps
+        self.pages = pages
+        self.sections = sections
+        self.workers = workers
+        self.history = load_history() if history is None else history
+        self.root = root or os.path.dirname(os.path.abspath(__file__))
+        self.steps = [self._step(name, "page") for name in pages] + [self._step(name, "section") for name in sections]
+
+    def estimate(self, name, kind):
+        """(seconds, number of recorded runs) for a step"""
+        entries = self.history.get(name, [])
+        if not entries:
+            return DEFAULT_SECONDS[kind], 0
+        return median(entry["seconds"] for entry in entries), len(entries)
+
+    def _step(self, name, kind):
+        seconds, runs = self.estimate(name, kind)
+        last = self.history.get(name, [{}])[-1]
+        images = last.get("images", [])
+        return {
+            "name": name, "kind": kind, "seconds": seconds, "runs": runs, "images": images,
+            "text_bytes": last.get("text_bytes", 0),
+            "reusable": kind == "page" and self._screenshots_current(name, images),
+        }
+
+    def _screenshots_current(self, name, images):
+        """True when every screenshot of a page exists and is newer than the sources it shows"""
+        if not images or not all(os.path.exists(path) for path in images):
+            return False
+        sources = self.tour_steps[name]["sources"] + SHARED_SOURCES
+        return newest_source_change(sources, self.root) < min(os.path.getmtime(path) for path in images)
+
+    def session_seconds(self, group):
+        """One browser session: start-up, a login if a page needs it, then the pages in order"""
+        seconds = self.estimate("setup", "setup")[0]
+        if any(self.tour_steps[name]["needs_session"] for name in group):
+            seconds += self.estimate("login", "login")[0]
+        return seconds + sum(step["seconds"] for step in self.steps if step["name"] in group)
+
+    def wall_seconds(self, workers=None):
+        """Estimated wall time of the build with the given number of browser sessions
+
+        Follows manual_async: the sessions and the text sections run side by
+        side, and only the sections summarizing the tour wait for it.
+        """
+        workers = self.workers if workers is None else workers
+        tour = max((self.session_seconds(group) for group in page_groups(self.pages, workers, self.tour_steps)), default=0)
+        sections = [step for step in self.steps if step["kind"] == "section"]
+        during = sum(step["seconds"] for step in sections if step["name"] not in AFTER_TOUR_SECTIONS)
+        after = sum(step["seconds"] for step in sections if step["name"] in AFTER_TOUR_SECTIONS)
+        return max(tour, during) + after + self.estimate("save", "save")[0]
+
+    def output_bytes(self):
+        """(estimated manual size, images without cached media)"""
+        total = len(load_template_bytes())
+        missing = []
+        seen = set()
+        for step in self.steps:
+            total += step["text_bytes"] * TEXT_COMPRESSION
+            for image in step["images"]:
+                if image in seen:
+                    continue
+                seen.add(image)
+                size = cached_media_size(image)
+                if size is None:
+                    missing.append(image)
+                else:
+                    total += size
+        return int(total), missing
+
+    def lines(self):
+        """Human-readable plan"""
+        lines = [f"{'step':<22}{'kind':<9}{'estimate':>10}  basis"]
+        for step in self.steps:
+            basis = f"median of {step['runs']} runs" if step["runs"] else "no history, default"
+            if step["reusable"]:
+                basis += "; screenshots current, could be served from cache"
+            lines.append(f"{step['name']:<22}{step['kind']:<9}{step['seconds']:>9.2f}s  {basis}")
+
+        size, missing = self.output_bytes()
+        lines += [
+            "",
+            f"Estimated wall time: {self.wall_seconds():.0f}s with {self.workers} browser session(s)",
+            f"Estimated manual size: {_size(size)}"
+            + (f" ({len(missing)} images not in the cache yet, not counted)" if missing else ""),
+        ]
+
+        sessions = len(page_groups(self.pages, len(self.pages), self.tour_steps))
+        if sessions > 1:
+            best = min(range(1, sessions + 1), key=lambda workers: (self.wall_seconds(workers), workers))
+            # Only worth mentioning when it saves a noticeable share of the build
+            if best != self.workers and self.wall_seconds(best) < 0.9 * self.wall_seconds():
+                groups = " | ".join(", ".join(group) for group in page_groups(self.pages, best, self.tour_steps))
+                lines.append(f"Parallel: --workers {best} would take about {self.wall_seconds(best):.0f}s "
+                             f"(sessions: {groups})")
+        reusable = [step["name"] for step in self.steps if step["reusable"]]
+        if reusable:
+            lines.append(f"Cache: {', '.join(reusable)} unchanged since the last capture")
+        return lines
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Walkthrough Clip Recorder for the Website Tour
+Samples the browser at a fixed frame rate on a background thread and streams
+the frames into ffmpeg as they arrive, so a clip never has to fit in memory.
+Identical consecutive frames are dropped before they are queued; the encoder
+repeats the previous frame on the pipe to keep the timing right. WebDriver is
+not thread-safe, so the sampler and the tour share a lock on every command.
+"""
+
+import os
+import time
+import queue
+import shutil
+import hashlib
+import threading
+import subprocess
+from contextlib import contextmanager
+
+DEFAULT_FPS = 4
+# Frames waiting for the encoder; when full the sampler waits instead of buffering more
+QUEUE_SIZE = 8
+# The last frame is held this long so clips do not end abruptly
+HOLD_LAST_FRAME = 1.0
+
+CLIP_FORMATS = ("mp4", "gif", "webp")
+
+# Output options per format; the input is always a PNG stream at the sampling rate
+FFMPEG_OUTPUT_ARGS = {
+    "mp4": ["-vf", "scale=trunc(iw/2)*2:trunc(ih/2)*2", "-c:v", "libx264", "-preset", "veryfast",
+            "-pix_fmt", "yuv420p", "-movflags", "+faststart"],
+    "gif": ["-vf", "scale=960:-1:flags=lanczos,split[a][b];[a]palettegen=stats_mode=diff[p];[b][p]paletteuse",
+            "-loop", "0"],
+    "webp": ["-vf", "scale=960:-1:flags=lanczos", "-c:v", "libwebp", "-quality", "75", "-loop", "0"],
+}
+
+
+def ffmpeg_available():
+    return shutil.which("ffmpeg") is not None
+
+
+def driver_lock(driver):
+    """The lock every command of a driver is sent under; installed once per driver
+
+    All WebDriver commands go through driver.execute, so wrapping it lets a
+    background thread share the session with the tour.
+    """
+    lock = getattr(driver, "_command_lock", None)
+    if lock is None:
+        lock = driver._command_lock = threading.RLock()
+        execute = getattr(driver, "execute", None)
+        if execute is not None:
+            def locked_execute(*args, **kwargs):
+                with lock:
+                    return execute(*args, **kwargs)
+            driver.execute = locked_execute
+    return lock
+
+
+class ClipEncoder:
+    """Feeds PNG frames with capture timestamps into one ffmpeg process"""
+
+    def __init__(self, path, fps, clip_format):
+        self.path = path
+        self.fps = fps
+        self.frames_written = 0
+        tmp_path = f"{path}.{os.getpid()}.tmp.{clip_format}"
+        self._tmp_path = tmp_path
+        self._process = subprocess.Popen(
+            ["ffmpeg", "-loglevel", "error", "-y", "-f", "image2pipe", "-c:v", "png", "-framerate", str(fps),
+             "-i", "-", *FFMPEG_OUTPUT_ARGS[clip_format], tmp_path],
+            stdin=subprocess.PIPE,
+        )
+        self._previous = None
+
+    @property
+    def empty(self):
+        return self._previous is None
+
+    def _write(self, png, count):
+        for _ in range(count):
+            self._process.stdin.write(png)
+        self.frames_written += count
+
+    def add(self, timestamp, png):
+        """Emit the previous frame for as long as it was on screen, then hold the new one"""
+        if self._previous is not None:
+            started, previous_png = self._previous
+            self._write(previous_png, max(1, round((timestamp - started) * self.fps)))
+        self._previous = (timestamp, png)
+
+    def close(self):
+        if self._previous is not None:
+            self._write(self._previous[1], max(1, round(HOLD_LAST_FRAME * self.fps)))
+        self._process.stdin.close()
+        if self._process.wait() != 0:
+            raise RuntimeError(f"ffmpeg failed to encode {self.path}")
+        os.replace(self._tmp_path, self.path)
+        return self.path
+
+    def abort(self):
+        """Stop ffmpeg and discard the partial clip"""
+        self._process.kill()
+        self._process.wait()
+        if os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+
+
+class FrameRecorder:
+    """Records named clips of a WebDriver session
+
+    start(name) begins a clip, stop() finishes it and returns its path.
+    Sampling and encoding run on two threads joined by a bounded queue.
+    Wrap anything that changes the page size in paused(): ffmpeg cannot
+    encode frames of different sizes into one clip.
+    """
+
+    def __init__(self, driver, output_dir="walkthroughs", fps=DEFAULT_FPS, clip_format="mp4"):
+        if clip_format not in CLIP_FORMATS:
+            raise ValueError(f"Unsupported clip format: {clip_format}")
+        self.driver = driver
+        self.output_dir = output_dir
+        self.fps = fps
+        self.clip_format = clip_format
+        self.dropped = 0
+        self.error = None
+        self._frames = None
+        self._stop = None
+        self._threads = []
+        self._encoder = None
+        self._lock = driver_lock(driver)
+        self._paused = 0
+
+    @contextmanager
+    def paused(self):
+        """Take no frames until the block ends; a frame being taken is finished first"""
+        with self._lock:
+            self._paused += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._paused -= 1
+
+    def start(self, name):
+        if self._threads:
+            self.stop()
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, f"{name}.{self.clip_format}")
+        self._encoder = ClipEncoder(path, self.fps, self.clip_format)
+        self.error = None
+        self._frames = queue.Queue(maxsize=QUEUE_SIZE)
+        self._stop = threading.Event()
+        self._threads = [
+            threading.Thread(target=self._sample, name=f"sample-{name}", daemon=True),
+            threading.Thread(target=self._encode, name=f"encode-{name}", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        """Finish the current clip and return its path (None if nothing was recorded)"""
+        if not self._threads:
+            return None
+        self._stop.set()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        encoder, self._encoder = self._encoder, None
+        if self.error is not None or encoder.empty:
+            encoder.abort()
+            if self.error is not None:
+                print(f"Could not record {encoder.path}: {self.error}")
+            return None
+        return encoder.close()
+
+    def _sample(self):
+        interval = 1 / self.fps
+        previous_digest = None
+        next_frame = time.monotonic()
+        while not self._stop.is_set():
+            try:
+                with self._lock:
+                    png = None if self._paused else self.driver.get_screenshot_as_png()
+            except Exception:
+                # The page may be navigating; try again on the next tick
+                png = None
+            if png is not None:
+                digest = hashlib.sha1(png).digest()
+                if digest == previous_digest:
+                    self.dropped += 1
+                else:
+                    previous_digest = digest
+                    self._frames.put((time.monotonic(), png))
+            next_frame += interval
+            self._stop.wait(max(0, next_frame - time.monotonic()))
+        self._frames.put(None)
+
+    def _encode(self):
+        while True:
+            item = self._frames.get()
+            if item is None:
+                return
+            # After a failure keep draining the queue so the sampler never blocks
+            if self.error is None:
+                try:
+                    self._encoder.add(*item)
+                except OSError as e:
+                    self.error = e
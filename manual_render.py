@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+"""
+Multi-Format User Manual Renderer for Inventory Management System
+Renders one content tree to DOCX, self-contained HTML and PDF in parallel
+worker processes. The PDF path is pure Python and needs no office suite.
+"""
+
+import os
+import html
+import zlib
+import time
+import base64
+import struct
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from manual_template import MANUAL_STYLES
+from manual_images import image_derivative, prepare_derivatives, prepare_media, RENDER_IMAGE_WIDTH
+from manual_package import save_document
+from create_manual_basic import BasicUserManualGenerator, DEFAULT_VARIANT
+
+OUTPUT_FORMATS = ("docx", "html", "pdf")
+
+STYLE_SPECS = {spec["name"]: spec for spec in MANUAL_STYLES}
+
+
+# --- DOCX ---------------------------------------------------------------
+
+def render_docx(tree, cover, path, variant=None):
+    """Render the content tree to a Word document"""
+    generator = BasicUserManualGenerator(variant=variant, include_screenshots=True)
+    generator.build_document(tree)
+    save_document(generator.doc, path)
+    return path
+
+
+# --- HTML ---------------------------------------------------------------
+
+HTML_STYLE = """
+body { font-family: Arial, Helvetica, sans-serif; max-width: 900px; margin: 2em auto; padding: 0 1em; color: #222; line-height: 1.45; }
+.cover { text-align: center; page-break-after: always; margin-bottom: 3em; }
+.CustomTitle { font-size: 24pt; font-weight: bold; margin: 0 0 12pt; }
+.CustomHeading1 { font-size: 18pt; font-weight: bold; margin: 12pt 0 6pt; }
+.CustomHeading2 { font-size: 14pt; font-weight: bold; margin: 6pt 0 3pt; }
+p { margin: 0 0 .35em; white-space: pre-wrap; }
+p.blank { min-height: 1em; }
+nav a { text-decoration: none; }
+figure { margin: 1em 0; text-align: center; }
+figure img { max-width: 100%; height: auto; border: 1px solid #ddd; }
+"""
+
+
+def section_anchor(title):
+    """Anchor id for a section title, e.g. "5.1 Inventory Overview" -> "sec-5-1" """
+    number = title.split(" ", 1)[0].rstrip(".")
+    return "sec-" + number.replace(".", "-")
+
+
+def image_data_uri(path, width):
+    with open(image_derivative(path, width), "rb") as f:
+        return "data:image/png;base64," + base64.b64encode(f.read()).decode("ascii")
+
+
+def html_paragraphs(paragraphs):
+    return "\n".join(
+        f"<p>{html.escape(text)}</p>" if text.strip() else '<p class="blank"></p>'
+        for text in paragraphs
+    )
+
+
+def render_html(tree, cover, path, variant=None):
+    """Render the content tree to a single self-contained HTML file"""
+    parts = ['<div class="cover">']
+    for text, style in cover:
+        parts.append(f'<p class="{style}">{html.escape(text)}</p>' if text else '<p class="blank"></p>')
+    parts.append("</div>")
+
+    parts.append('<nav><h2 class="CustomHeading1">TABLE OF CONTENTS</h2>')
+    for node in tree:
+        indent = "&nbsp;" * 4 if node["level"] > 1 else ""
+        parts.append(f'<p>{indent}<a href="#{section_anchor(node["title"])}">{html.escape(node["title"])}</a></p>')
+    parts.append("</nav>")
+
+    width = RENDER_IMAGE_WIDTH["html"]
+    for node in tree:
+        tag, style = ("h2", "CustomHeading1") if node["level"] == 1 else ("h3", "CustomHeading2")
+        parts.append(f'<{tag} id="{section_anchor(node["title"])}" class="{style}">{html.escape(node["title"])}</{tag}>')
+        parts.append(html_paragraphs(node["paragraphs"]))
+        for image_path in node["images"]:
+            alt = html.escape(os.path.splitext(os.path.basename(image_path))[0].replace("_", " "))
+            parts.append(f'<figure><img src="{image_data_uri(image_path, width)}" alt="{alt}"></figure>')
+
+    document = (
+        "<!DOCTYPE html>\n<html lang=\"{lang}\">\n<head>\n<meta charset=\"utf-8\">\n"
+        "<title>User Manual - Computerized Stationary Management System</title>\n"
+        "<style>{style}</style>\n</head>\n<body>\n{body}\n</body>\n</html>\n"
+    ).format(
+        lang=(variant or DEFAULT_VARIANT).get("language") or "en",
+        style=HTML_STYLE,
+        body="\n".join(parts),
+    )
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(document)
+    return path
+
+
+# --- PDF ----------------------------------------------------------------
+
+# Helvetica advance widths (1/1000 em) for ASCII 32-126, from the standard AFM
+HELVETICA_WIDTHS = [
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+]
+
+PAGE_WIDTH, PAGE_HEIGHT = 595.28, 841.89  # A4 in points
+MARGIN = 56
+BODY_SIZE = 11
+
+
+def pdf_text(text):
+    """Encode text as a PDF literal string in WinAnsiEncoding"""
+    text = text.replace("→", "->")
+    data = text.encode("cp1252", errors="replace")
+    data = data.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+    return b"(" + data + b")"
+
+
+def text_width(text, size, bold=False):
+    width = 0
+    for char in text:
+        code = ord(char)
+        if 32 <= code <= 126:
+            width += HELVETICA_WIDTHS[code - 32]
+        elif char == "•":
+            width += 350
+        else:
+            width += 556
+    return width * size / 1000 * (1.05 if bold else 1.0)
+
+
+def wrap_text(text, size, max_width, bold=False):
+    """Greedy word wrap; leading spaces become a hanging indent"""
+    stripped = text.lstrip(" ")
+    indent = text_width(text[:len(text) - len(stripped)], size, bold)
+    lines, current = [], ""
+    for word in stripped.split(" "):
+        candidate = f"{current} {word}" if current else word
+        if current and indent + text_width(candidate, size, bold) > max_width:
+            lines.append(current)
+            current = word
+        else:
+            current = candidate
+    lines.append(current)
+    return indent, lines
+
+
+def png_for_pdf(path):
+    """Split a PNG into the pieces a PDF image XObject needs
+
+    Non-interlaced 8-bit RGB and grayscale PNGs can be embedded without
+    decoding: the IDAT stream is already zlib data using the PNG row
+    predictors, which PDF's FlateDecode understands directly.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:8] != b"\x89PNG\r\n\x1a\n":
+        return None
+    offset, idat, header = 8, [], None
+    while offset < len(data):
+        length, kind = struct.unpack(">I4s", data[offset:offset + 8])
+        chunk = data[offset + 8:offset + 8 + length]
+        if kind == b"IHDR":
+            header = struct.unpack(">IIBBBBB", chunk)
+        elif kind == b"IDAT":
+            idat.append(chunk)
+        elif kind == b"IEND":
+            break
+        offset += 12 + length
+    width, height, bit_depth, color_type, _, _, interlace = header
+    colors = {0: 1, 2: 3}.get(color_type)
+    if bit_depth != 8 or colors is None or interlace:
+        return None
+    return width, height, colors, b"".join(idat)
+
+
+class PDFWriter:
+    """Minimal PDF 1.4 writer: base-14 Helvetica text and PNG images"""
+
+    def __init__(self):
+        self.objects = []
+        self.pages = []
+        self.images = {}
+        self.stream = []
+        self.page_images = {}
+        self.y = PAGE_HEIGHT - MARGIN
+
+    def add_object(self, body):
+        self.objects.append(body)
+        return len(self.objects)
+
+    # Layout
+
+    def new_page(self):
+        if self.stream:
+            self.pages.append((b"\n".join(self.stream), dict(self.page_images)))
+        self.stream = []
+        self.page_images = {}
+        self.y = PAGE_HEIGHT - MARGIN
+
+    def ensure_space(self, height):
+        if self.y - height < MARGIN:
+            self.new_page()
+
+    def space(self, points):
+        self.y -= points
+
+    def line(self, text, size, bold=False, x=MARGIN, center=False):
+        leading = size * 1.3
+        self.ensure_space(leading)
+        if center:
+            x = (PAGE_WIDTH - text_width(text, size, bold)) / 2
+        self.y -= leading
+        font = b"/F2" if bold else b"/F1"
+        self.stream.append(
+            b"BT " + font + b" %.2f Tf %.2f %.2f Td " % (size, x, self.y) + pdf_text(text) + b" Tj ET"
+        )
+
+    def paragraph(self, text, style="Normal", center=False):
+        spec = STYLE_SPECS.get(style)
+        size = spec["size"] if spec else BODY_SIZE
+        bold = spec is not None
+        if spec and spec["space_before"]:
+            self.space(spec["space_before"])
+        if not text.strip():
+            self.space(size * 1.3)
+        else:
+            indent, lines = wrap_text(text, size, PAGE_WIDTH - 2 * MARGIN, bold)
+            for line in lines:
+                self.line(line, size, bold, x=MARGIN + indent, center=center)
+        if spec:
+            self.space(spec["space_after"])
+
+    def image(self, path, max_width=PAGE_WIDTH - 2 * MARGIN):
+        if path not in self.images:
+            parsed = png_for_pdf(path)
+            if parsed is None:
+                print(f"Skipping unsupported image in PDF: {path}")
+                return
+            width, height, colors, data = parsed
+            color_space = b"/DeviceRGB" if colors == 3 else b"/DeviceGray"
+            number = self.add_object(
+                b"<< /Type /XObject /Subtype /Image /Width %d /Height %d /ColorSpace %s "
+                b"/BitsPerComponent 8 /Filter /FlateDecode "
+                b"/DecodeParms << /Predictor 15 /Colors %d /BitsPerComponent 8 /Columns %d >> "
+                b"/Length %d >>\nstream\n" % (width, height, color_space, colors, width, len(data))
+                + data + b"\nendstream"
+            )
+            self.images[path] = (f"Im{len(self.images) + 1}".encode(), number, width, height)
+        name, number, width, height = self.images[path]
+        draw_width = min(max_width, width * 0.75)
+        draw_height = height * draw_width / width
+        self.ensure_space(draw_height + 12)
+        self.y -= draw_height + 6
+        x = (PAGE_WIDTH - draw_width) / 2
+        self.stream.append(b"q %.2f 0 0 %.2f %.2f %.2f cm /%s Do Q" % (draw_width, draw_height, x, self.y, name))
+        self.page_images[name] = number
+        self.y -= 6
+
+    # Output
+
+    def save(self, path):
+        if self.stream:
+            self.new_page()
+
+        font_regular = self.add_object(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+        font_bold = self.add_object(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>")
+        pages_number = len(self.objects) + 2 * len(self.pages) + 1
+
+        page_numbers = []
+        for content, images in self.pages:
+            compressed = zlib.compress(content)
+            content_number = self.add_object(
+                b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(compressed) + compressed + b"\nendstream"
+            )
+            xobjects = b"".join(b"/%s %d 0 R " % (name, number) for name, number in images.items())
+            page_numbers.append(self.add_object(
+                b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %.2f %.2f] /Contents %d 0 R "
+                b"/Resources << /Font << /F1 %d 0 R /F2 %d 0 R >> /XObject << %s>> >> >>"
+                % (pages_number, PAGE_WIDTH, PAGE_HEIGHT, content_number, font_regular, font_bold, xobjects)
+            ))
+
+        kids = b" ".join(b"%d 0 R" % number for number in page_numbers)
+        self.add_object(b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_numbers)))
+        catalog = self.add_object(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_number)
+
+        out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        offsets = []
+        for number, body in enumerate(self.objects, start=1):
+            offsets.append(len(out))
+            out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+        xref = len(out)
+        out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(self.objects) + 1)
+        out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+        out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(self.objects) + 1, catalog, xref)
+
+        with open(path, "wb") as f:
+            f.write(out)
+
+
+def render_pdf(tree, cover, path, variant=None):
+    """Render the content tree to PDF without any office suite"""
+    pdf = PDFWriter()
+    pdf.new_page()
+
+    pdf.space(PAGE_HEIGHT / 5)
+    for text, style in cover:
+        pdf.paragraph(text, style, center=True)
+    pdf.new_page()
+
+    pdf.paragraph("TABLE OF CONTENTS", "CustomHeading1", center=True)
+    for node in tree:
+        indent = "   " if node["level"] > 1 else ""
+        pdf.paragraph(indent + node["title"])
+    pdf.new_page()
+
+    width = RENDER_IMAGE_WIDTH["pdf"]
+    for node in tree:
+        pdf.paragraph(node["title"], "CustomHeading1" if node["level"] == 1 else "CustomHeading2")
+        for text in node["paragraphs"]:
+            pdf.paragraph(text)
+        for image_path in node["images"]:
+            pdf.image(image_derivative(image_path, width))
+        pdf.paragraph("")
+
+    pdf.save(path)
+    return path
+
+
+RENDERERS = {"docx": render_docx, "html": render_html, "pdf": render_pdf}
+
+
+def render_formats(formats=OUTPUT_FORMATS, variant=None, output_dir=".", basename="User_Manual",
+                   workers=None, tree=None):
+    """Render the manual to several formats in parallel from one content tree
+
+    The tree defaults to the basic manual's content; the tour generator's
+    recorded content_tree can be passed instead.
+    """
+    generator = BasicUserManualGenerator(variant=variant, include_screenshots=True)
+    tree = tree if tree is not None else generator.content_tree()
+    cover = generator.cover_lines()
+
+    # Encode each screenshot once per target width before the renderers start
+    images = sorted({path for node in tree for path in node["images"]})
+    prepare_derivatives(images, {RENDER_IMAGE_WIDTH[fmt] for fmt in formats if fmt != "docx"})
+    if "docx" in formats:
+        prepare_media(images)
+
+    os.makedirs(output_dir, exist_ok=True)
+    outputs = []
+    with ProcessPoolExecutor(max_workers=workers or len(formats)) as pool:
+        futures = [
+            pool.submit(RENDERERS[fmt], tree, cover, os.path.join(output_dir, f"{basename}.{fmt}"), variant)
+            for fmt in formats
+        ]
+        for fmt, future in zip(formats, futures):
+            try:
+                outputs.append(future.result())
+            except Exception as e:
+                print(f"Error rendering {fmt.upper()}: {e}")
+    return outputs
+
+
+def main():
+    """Main function to render the manual in several formats"""
+    parser = argparse.ArgumentParser(description="Render the user manual as DOCX, HTML and PDF")
+    parser.add_argument("--formats", default=",".join(OUTPUT_FORMATS), help="Comma-separated formats")
+    parser.add_argument("--output-dir", default=".", help="Directory for the rendered files")
+    parser.add_argument("--role", default=None)
+    parser.add_argument("--location", default=None)
+    parser.add_argument("--language", default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    formats = [fmt.strip() for fmt in args.formats.split(",") if fmt.strip()]
+    unknown = [fmt for fmt in formats if fmt not in RENDERERS]
+    if unknown:
+        parser.error(f"Unknown format(s): {', '.join(unknown)}")
+
+    variant = {name: value for name, value in
+               (("role", args.role), ("location", args.location), ("language", args.language)) if value}
+
+    print("=== Inventory Management System - Multi-Format Manual Renderer ===")
+    start = time.perf_counter()
+    outputs = render_formats(formats, variant or None, args.output_dir, workers=args.workers)
+    print(f"\n✓ Rendered {len(outputs)} file(s) in {time.perf_counter() - start:.2f}s")
+    for path in outputs:
+        print(f"  {path}")
+
+
+if __name__ == "__main__":
+    main()
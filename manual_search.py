@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Full-Text Search Index for the User Manual
+Builds an inverted index (term -> section, paragraph, position) over every
+paragraph of the manual and stores it as a memory-mappable sorted term table
+that answers prefix queries without loading the whole file.
+
+File layout (little endian):
+    header      magic, section count, term count, section table size
+    sections    JSON list of {"id", "title", "hash"}
+    term_offsets    uint32 x (terms + 1), offsets into the term blob
+    run_offsets     uint32 x (terms + 1), run indexes per term
+    terms       sorted UTF-8 terms, concatenated
+    runs        (section uint32, first hit uint32, hit count uint32), one per
+                term and section, in section order
+    hits        (paragraph uint32, position uint32) records
+
+A section's hits for a term are contiguous, so an update copies the hits of
+unchanged sections byte for byte and only re-tokenizes the changed ones.
+"""
+
+import os
+import re
+import sys
+import mmap
+import json
+import time
+import struct
+import bisect
+import hashlib
+import argparse
+from collections import defaultdict
+
+MAGIC = b"PSOIDX2\0"
+HEADER = struct.Struct("<8sIII")
+RUN = struct.Struct("<III")
+HIT = struct.Struct("<II")
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+DEFAULT_INDEX_PATH = "User_Manual.idx"
+
+
+def index_path(doc_path):
+    """Index file that goes with a manual, e.g. User_Manual.idx for User_Manual.docx"""
+    return os.path.splitext(doc_path)[0] + ".idx"
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def section_hash(node):
+    data = json.dumps([node["title"], node["paragraphs"]], ensure_ascii=False).encode("utf-8")
+    return hashlib.sha1(data).hexdigest()
+
+
+def section_postings(node):
+    """Postings for one section as {term: [(paragraph, position), ...]}
+
+    The heading is paragraph 0; content paragraphs are numbered from 1.
+    """
+    postings = defaultdict(list)
+    for paragraph_number, text in enumerate([node["title"]] + node["paragraphs"]):
+        for position, term in enumerate(tokenize(text)):
+            postings[term].append((paragraph_number, position))
+    return postings
+
+
+def pack_hits(hits):
+    """HIT records for [(paragraph, position)]; struct.error if a value does not fit"""
+    return b"".join(HIT.pack(paragraph, position) for paragraph, position in hits)
+
+
+def write_index(path, sections, section_terms):
+    """Write the index file
+
+    sections is a list of {"id", "title", "hash"}; section_terms holds the
+    matching {term: hits} dict for each section, where hits is either a
+    list of (paragraph, position) or HIT records copied from an earlier index.
+    """
+    merged = defaultdict(list)
+    for section_number, postings in enumerate(section_terms):
+        for term, hits in postings.items():
+            merged[term].append((section_number, hits if isinstance(hits, (bytes, memoryview)) else pack_hits(hits)))
+
+    terms = sorted(merged)
+    term_blob = bytearray()
+    term_offsets = [0]
+    run_offsets = [0]
+    run_blob = bytearray()
+    hit_blob = bytearray()
+    for term in terms:
+        term_blob += term.encode("utf-8")
+        term_offsets.append(len(term_blob))
+        for section_number, hits in merged[term]:
+            run_blob += RUN.pack(section_number, len(hit_blob) // HIT.size, len(hits) // HIT.size)
+            hit_blob += hits
+        run_offsets.append(len(run_blob) // RUN.size)
+
+    section_table = json.dumps(sections, ensure_ascii=False).encode("utf-8")
+    # Pad with JSON whitespace so the uint32 arrays that follow are aligned
+    section_table += b" " * (-(HEADER.size + len(section_table)) % 4)
+    data = b"".join([
+        HEADER.pack(MAGIC, len(sections), len(terms), len(section_table)),
+        section_table,
+        struct.pack(f"<{len(term_offsets)}I", *term_offsets),
+        struct.pack(f"<{len(run_offsets)}I", *run_offsets),
+        bytes(term_blob),
+        bytes(run_blob),
+        bytes(hit_blob),
+    ])
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return path
+
+
+class SearchIndex:
+    """Read-only view of an index file through mmap"""
+
+    def __init__(self, path=DEFAULT_INDEX_PATH):
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, section_count, term_count, table_size = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a manual search index")
+
+        offset = HEADER.size
+        self.sections = json.loads(self._map[offset:offset + table_size].decode("utf-8"))
+        offset += table_size
+        self.term_count = term_count
+        self._term_offsets = memoryview(self._map)[offset:offset + 4 * (term_count + 1)].cast("I")
+        offset += 4 * (term_count + 1)
+        self._run_offsets = memoryview(self._map)[offset:offset + 4 * (term_count + 1)].cast("I")
+        offset += 4 * (term_count + 1)
+        self._terms_start = offset
+        self._runs_start = offset + self._term_offsets[term_count]
+        self._hits_start = self._runs_start + RUN.size * self._run_offsets[term_count]
+
+    def close(self):
+        self._term_offsets.release()
+        self._run_offsets.release()
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.term_count
+
+    def __getitem__(self, number):
+        """Term number `number`, so bisect can search the mapped table directly"""
+        start = self._terms_start + self._term_offsets[number]
+        end = self._terms_start + self._term_offsets[number + 1]
+        return self._map[start:end].decode("utf-8")
+
+    def runs(self, number):
+        """Yield (section, first hit, hit count) for term number `number`"""
+        start = self._runs_start + RUN.size * self._run_offsets[number]
+        end = self._runs_start + RUN.size * self._run_offsets[number + 1]
+        yield from RUN.iter_unpack(self._map[start:end])
+    
+    def hit_bytes(self, first, count):
+        start = self._hits_start + HIT.size * first
+        return self._map[start:start + HIT.size * count]
+    
+    def postings(self, number):
+        """Yield (section, paragraph, position) for term number `number`"""
+        for section, first, count in self.runs(number):
+            for paragraph, position in HIT.iter_unpack(self.hit_bytes(first, count)):
+                yield section, paragraph, position
+
+    def prefix(self, prefix):
+        """Yield (term, postings) for every term starting with prefix"""
+        number = bisect.bisect_left(self, prefix)
+        while number < self.term_count:
+            term = self[number]
+            if not term.startswith(prefix):
+                break
+            yield term, list(self.postings(number))
+            number += 1
+
+    def section_terms(self, sections=None):
+        """{term: HIT records} for every section, or only for the given section numbers
+
+        The hits are copied as stored, without decoding them.
+        """
+        wanted = set(range(len(self.sections)) if sections is None else sections)
+        result = {section: {} for section in wanted}
+        if not wanted:
+            return result
+        for number in range(self.term_count):
+            term = None
+            for section, first, count in self.runs(number):
+                if section in wanted:
+                    term = term or self[number]
+                    result[section][term] = self.hit_bytes(first, count)
+        return result
+
+    def search(self, query, limit=10):
+        """Sections matching every query word as a prefix, best first
+
+        Returns a list of (section dict, hit count, [(paragraph, position)]).
+        """
+        words = tokenize(query)
+        if not words:
+            return []
+        matches = None
+        for word in words:
+            hits = defaultdict(list)
+            for _, postings in self.prefix(word):
+                for section, paragraph, position in postings:
+                    hits[section].append((paragraph, position))
+            if matches is None:
+                matches = hits
+            else:
+                matches = {section: matches[section] + hits[section] for section in matches if section in hits}
+            if not matches:
+                return []
+        ranked = sorted(matches.items(), key=lambda item: (-len(item[1]), item[0]))
+        return [(self.sections[section], len(hits), sorted(hits)) for section, hits in ranked[:limit]]
+
+
+def update_index(tree, path=DEFAULT_INDEX_PATH):
+    """Write the index for a content tree, re-tokenizing only changed sections
+
+    The hits of unchanged sections are copied from the previous index as
+    stored. Returns the number of sections that had to be re-tokenized.
+    """
+    keys = [(node["title"].split(" ", 1)[0].rstrip("."), section_hash(node)) for node in tree]
+    previous = {}
+    if os.path.exists(path):
+        try:
+            with SearchIndex(path) as index:
+                wanted = set(keys)
+                unchanged = [number for number, section in enumerate(index.sections)
+                             if (section["id"], section["hash"]) in wanted]
+                for number, terms in index.section_terms(unchanged).items():
+                    previous[(index.sections[number]["id"], index.sections[number]["hash"])] = terms
+        except (OSError, ValueError, struct.error) as e:
+            print(f"Rebuilding search index from scratch: {e}")
+
+    sections, section_terms, changed = [], [], 0
+    for node, (section_id, digest) in zip(tree, keys):
+        terms = previous.get((section_id, digest))
+        if terms is None:
+            terms = section_postings(node)
+            changed += 1
+        sections.append({"id": section_id, "title": node["title"], "hash": digest})
+        section_terms.append(terms)
+
+    write_index(path, sections, section_terms)
+    return changed
+
+
+def main():
+    """Main function to build or query the manual search index"""
+    parser = argparse.ArgumentParser(description="Build or query the user manual search index")
+    parser.add_argument("--index", default=DEFAULT_INDEX_PATH, help="Index file path")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("build", help="Build or update the index from the manual content")
+    query_parser = subparsers.add_parser("query", help="Search the index")
+    query_parser.add_argument("text", help="Words or word prefixes to search for")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        from create_manual_basic import BasicUserManualGenerator
+        tree = BasicUserManualGenerator().content_tree()
+        changed = update_index(tree, args.index)
+        print(f"✓ Search index written to {args.index} ({changed} of {len(tree)} sections re-indexed)")
+        return
+
+    if not os.path.exists(args.index):
+        print(f"Index not found: {args.index} (run 'build' first)")
+        sys.exit(1)
+    with SearchIndex(args.index) as index:
+        start = time.perf_counter()
+        results = index.search(args.text)
+        elapsed = (time.perf_counter() - start) * 1000
+        for section, count, hits in results:
+            print(f"{section['title']}  ({count} hits)")
+        print(f"\n{len(results)} section(s) in {elapsed:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+In-Memory User Manual Service for Inventory Management System
+Renders manuals without touching the disk and serves them over HTTP with
+ETag revalidation, so repeat downloads are answered from the cache. Only known
+roles and languages are rendered, and the cache keeps a bounded number of
+variants.
+"""
+
+import re
+import hashlib
+import argparse
+import threading
+from collections import OrderedDict
+from datetime import date
+from urllib.parse import urlparse, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from create_manual_basic import BasicUserManualGenerator, ALL_ROLES, DEFAULT_VARIANT, available_languages
+
+DOCX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+# Rendered variants kept in memory; the least recently used is dropped first
+CACHE_ENTRIES = 32
+
+# Locations are free text on the cover page, so only their shape is checked
+LOCATION_PATTERN = re.compile(r"[\w][\w .,'()-]{0,63}")
+
+
+def validate_variant(variant):
+    """Raise ValueError unless every part of a requested variant is known"""
+    if "role" in variant and variant["role"] not in ALL_ROLES:
+        raise ValueError(f"Unknown role: {variant['role']}")
+    if "language" in variant and variant["language"] not in available_languages():
+        raise ValueError(f"Unknown language: {variant['language']}")
+    if "location" in variant and not LOCATION_PATTERN.fullmatch(variant["location"]):
+        raise ValueError(f"Invalid location: {variant['location']}")
+
+
+def render_manual(variant=None):
+    """Return a manual as .docx bytes"""
+    return BasicUserManualGenerator(variant=variant).to_bytes()
+
+
+def stream_manual(stream, variant=None):
+    """Write a manual to a writable binary stream"""
+    return BasicUserManualGenerator(variant=variant).write_to(stream)
+
+
+class ManualCache:
+    """Rendered manuals keyed by variant, each with a strong ETag
+
+    Entries are keyed by the current date as well, so the "Generated on"
+    line on the cover page never goes stale. A variant is rendered under a
+    lock of its own: concurrent requests for it wait for one render, while
+    other variants are served meanwhile.
+    """
+
+    def __init__(self, max_entries=CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._rendering = {}
+        self._lock = threading.Lock()
+
+    def _key(self, variant):
+        variant = dict(DEFAULT_VARIANT, **(variant or {}))
+        return (variant["role"], variant["location"], variant["language"], date.today().isoformat())
+
+    def get(self, variant=None):
+        """Return (etag, bytes) for a variant, rendering it on first use"""
+        key = self._key(variant)
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is not None:
+                return entry
+            render_lock = self._rendering.setdefault(key, threading.Lock())
+        with render_lock:
+            with self._lock:
+                entry = self._lookup(key)
+            if entry is not None:
+                return entry
+            try:
+                data = render_manual(variant)
+            finally:
+                with self._lock:
+                    self._rendering.pop(key, None)
+            etag = '"' + hashlib.sha256(data).hexdigest()[:32] + '"'
+            with self._lock:
+                # Drop entries from earlier days, then the least recently used
+                for stale in [k for k in self._entries if k[3] != key[3]]:
+                    del self._entries[stale]
+                self._entries[key] = entry = (etag, data)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return entry
+
+    def _lookup(self, key):
+        """The entry for a key, marked as most recently used (call with the lock held)"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+
+def etag_matches(if_none_match, etag):
+    """Weak comparison of an If-None-Match header with an ETag, as RFC 9110 requires"""
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in [tag[2:] if tag.startswith("W/") else tag for tag in tags]
+
+
+class ManualRequestHandler(BaseHTTPRequestHandler):
+    """Serves GET /manual.docx?role=&location=&language="""
+
+    cache = ManualCache()
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path not in ("/", "/manual.docx"):
+            self.send_error(404, "Not Found")
+            return
+
+        query = parse_qs(url.query)
+        variant = {name: query[name][0] for name in ("role", "location", "language") if name in query}
+        try:
+            validate_variant(variant)
+        except ValueError as e:
+            self.send_error(400, str(e))
+            return
+        try:
+            etag, data = self.cache.get(variant or None)
+        except Exception as e:
+            self.send_error(500, f"Error generating manual: {e}")
+            return
+
+        if etag_matches(self.headers.get("If-None-Match", ""), etag):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", DOCX_CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Content-Disposition", 'attachment; filename="User_Manual.docx"')
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def serve(host="127.0.0.1", port=8765):
+    """Run the manual download endpoint until interrupted"""
+    server = ThreadingHTTPServer((host, port), ManualRequestHandler)
+    print(f"Serving user manual at http://{host}:{port}/manual.docx")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopping manual server")
+    finally:
+        server.server_close()
+
+
+def main():
+    """Main function to run the manual download endpoint"""
+    parser = argparse.ArgumentParser(description="Serve the user manual over HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    serve(args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()
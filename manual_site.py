@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+HTML Help Site Builder for Inventory Management System
+Splits the manual into one page per numbered section with lazy-loaded,
+responsive screenshots. Every page and asset gets a content-hashed file name
+and precompressed gzip/brotli copies so it can be cached forever.
+"""
+
+import os
+import re
+import gzip
+import html
+import hashlib
+import argparse
+import mimetypes
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+from manual_images import image_derivative, prepare_derivatives, png_size
+from manual_render import HTML_STYLE, html_paragraphs
+from create_manual_basic import BasicUserManualGenerator, DEFAULT_VARIANT
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Screenshot widths offered to the browser through srcset
+SRCSET_WIDTHS = (480, 960, 1200)
+
+SITE_STYLE = HTML_STYLE + """
+header { border-bottom: 1px solid #ddd; margin-bottom: 1.5em; padding-bottom: .5em; }
+header a { color: #1a56db; text-decoration: none; }
+ol.toc { list-style: none; padding: 0; }
+ol.toc ol { list-style: none; padding-left: 1.5em; }
+"""
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="{lang}">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title} - User Manual</title>
+<link rel="stylesheet" href="{stylesheet}">
+</head>
+<body>
+<header><a href="index.html">&larr; User Manual contents</a></header>
+{body}
+</body>
+</html>
+"""
+
+# Content-hashed names never change meaning, so they may be cached forever
+IMMUTABLE_PATTERN = re.compile(r"\.[0-9a-f]{10}\.[a-z]+$")
+
+
+def hashed_name(stem, data, extension):
+    """File name with a short content hash, e.g. section-1-introduction.3f2a9c01de.html"""
+    return f"{stem}.{hashlib.sha256(data).hexdigest()[:10]}.{extension}"
+
+
+def slugify(text):
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+
+
+def split_pages(tree):
+    """Group the tree into pages: each numbered section with its subsections"""
+    pages = []
+    for node in tree:
+        if node["level"] == 1 or not pages:
+            pages.append([])
+        pages[-1].append(node)
+    return pages
+
+
+class SiteBuilder:
+    """Writes the help site into an output directory"""
+
+    def __init__(self, output_dir, language="en"):
+        self.output_dir = output_dir
+        self.language = language or "en"
+        self.written = []
+        self.images = {}
+
+    def write(self, relative_path, data, compress=True):
+        """Write a file plus its precompressed .gz and .br copies"""
+        path = os.path.join(self.output_dir, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+        if compress:
+            with open(path + ".gz", "wb") as f:
+                f.write(gzip.compress(data, 9, mtime=0))
+            if brotli is not None:
+                with open(path + ".br", "wb") as f:
+                    f.write(brotli.compress(data, quality=11))
+        self.written.append(relative_path)
+        return relative_path
+
+    def write_hashed(self, directory, stem, data, extension, compress=True):
+        name = hashed_name(stem, data, extension)
+        return self.write(os.path.join(directory, name) if directory else name, data, compress)
+
+    def image_tag(self, image_path):
+        """<img> with lazy loading and a srcset of hashed width variants"""
+        if image_path not in self.images:
+            sources = []
+            for width in SRCSET_WIDTHS:
+                with open(image_derivative(image_path, width), "rb") as f:
+                    data = f.read()
+                stem = slugify(os.path.splitext(os.path.basename(image_path))[0]) + f"-{width}"
+                # PNG is already compressed; no .gz/.br copies
+                sources.append((self.write_hashed("assets", stem, data, "png", compress=False), width, data))
+            self.images[image_path] = sources
+
+        sources = self.images[image_path]
+        largest, _, data = sources[-1]
+        width, height = png_size(data)
+        srcset = ", ".join(f"{path} {w}w" for path, w, _ in sources)
+        alt = html.escape(os.path.splitext(os.path.basename(image_path))[0].replace("_", " "))
+        return (
+            f'<figure><img src="{largest}" srcset="{srcset}" sizes="(max-width: 900px) 100vw, 900px" '
+            f'width="{width}" height="{height}" loading="lazy" decoding="async" alt="{alt}"></figure>'
+        )
+
+    def page_body(self, nodes):
+        parts = []
+        for node in nodes:
+            tag, style = ("h1", "CustomHeading1") if node["level"] == 1 else ("h2", "CustomHeading2")
+            parts.append(f'<{tag} id="{slugify(node["title"])}" class="{style}">{html.escape(node["title"])}</{tag}>')
+            parts.append(html_paragraphs(node["paragraphs"]))
+            for image_path in node["images"]:
+                parts.append(self.image_tag(image_path))
+        return "\n".join(parts)
+
+    def build(self, tree, cover):
+        """Write the stylesheet, one page per section and the index page"""
+        stylesheet = self.write_hashed("assets", "site", SITE_STYLE.encode("utf-8"), "css")
+
+        toc = ['<ol class="toc">']
+        for nodes in split_pages(tree):
+            heading = nodes[0]["title"]
+            page = PAGE_TEMPLATE.format(
+                lang=self.language,
+                title=html.escape(heading),
+                stylesheet=stylesheet,
+                body=self.page_body(nodes),
+            ).encode("utf-8")
+            page_name = self.write_hashed("", "section-" + slugify(heading), page, "html")
+
+            toc.append(f'<li><a href="{page_name}">{html.escape(heading)}</a>')
+            if len(nodes) > 1:
+                toc.append("<ol>")
+                for node in nodes[1:]:
+                    toc.append(f'<li><a href="{page_name}#{slugify(node["title"])}">{html.escape(node["title"])}</a></li>')
+                toc.append("</ol>")
+            toc.append("</li>")
+        toc.append("</ol>")
+
+        cover_html = "\n".join(
+            f'<p class="{style}">{html.escape(text)}</p>' for text, style in cover if text
+        )
+        index = PAGE_TEMPLATE.format(
+            lang=self.language,
+            title="Contents",
+            stylesheet=stylesheet,
+            body=f'<div class="cover">{cover_html}</div>\n<h2 class="CustomHeading1">TABLE OF CONTENTS</h2>\n'
+                 + "\n".join(toc),
+        ).encode("utf-8")
+        # The entry point keeps a stable name; everything it links to is hashed
+        self.write("index.html", index)
+        return self.written
+
+
+def build_site(output_dir="help_site", variant=None, tree=None):
+    """Build the help site for a variant (or a recorded content tree)"""
+    generator = BasicUserManualGenerator(variant=variant, include_screenshots=True)
+    tree = tree if tree is not None else generator.content_tree()
+
+    images = sorted({path for node in tree for path in node["images"]})
+    prepare_derivatives(images, SRCSET_WIDTHS)
+
+    language = (variant or DEFAULT_VARIANT).get("language")
+    return SiteBuilder(output_dir, language).build(tree, generator.cover_lines())
+
+
+class PrecompressedRequestHandler(SimpleHTTPRequestHandler):
+    """Static file handler that serves .br/.gz copies and long-lived caching"""
+
+    def send_head(self):
+        self._cache_headers_sent = False
+        path = self.translate_path(self.path)
+        if os.path.isdir(path):
+            path = os.path.join(path, "index.html")
+            self.path = self.path.rstrip("/") + "/index.html"
+
+        accepted = self.headers.get("Accept-Encoding", "")
+        for encoding, suffix in (("br", ".br"), ("gzip", ".gz")):
+            if encoding in accepted and os.path.isfile(path + suffix):
+                try:
+                    f = open(path + suffix, "rb")
+                except OSError:
+                    break
+                self.send_response(200)
+                self.send_header("Content-Type", mimetypes.guess_type(path)[0] or "application/octet-stream")
+                self.send_header("Content-Encoding", encoding)
+                self.send_header("Content-Length", str(os.fstat(f.fileno()).st_size))
+                self.send_header("Vary", "Accept-Encoding")
+                self.send_cache_headers(path)
+                self.end_headers()
+                return f
+        return super().send_head()
+
+    def end_headers(self):
+        if not getattr(self, "_cache_headers_sent", False) and self.command in ("GET", "HEAD"):
+            self.send_cache_headers(self.translate_path(self.path))
+        super().end_headers()
+
+    def send_cache_headers(self, path):
+        self._cache_headers_sent = True
+        if IMMUTABLE_PATTERN.search(path):
+            self.send_header("Cache-Control", "public, max-age=31536000, immutable")
+        else:
+            self.send_header("Cache-Control", "no-cache")
+
+
+def serve(directory, host="127.0.0.1", port=8766):
+    """Preview the help site until interrupted"""
+    handler = partial(PrecompressedRequestHandler, directory=directory)
+    server = ThreadingHTTPServer((host, port), handler)
+    print(f"Previewing help site at http://{host}:{port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopping preview server")
+    finally:
+        server.server_close()
+
+
+def main():
+    """Main function to build and optionally preview the help site"""
+    parser = argparse.ArgumentParser(description="Build the chunked HTML help site")
+    parser.add_argument("--output-dir", default="help_site")
+    parser.add_argument("--role", default=None)
+    parser.add_argument("--location", default=None)
+    parser.add_argument("--language", default=None)
+    parser.add_argument("--serve", action="store_true", help="Start a local preview server after building")
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    variant = {name: value for name, value in
+               (("role", args.role), ("location", args.location), ("language", args.language)) if value}
+
+    print("=== Inventory Management System - Help Site Builder ===")
+    written = build_site(args.output_dir, variant or None)
+    print(f"✓ Wrote {len(written)} files to {args.output_dir}")
+    if brotli is None:
+        print("⚠️ brotli not installed - only gzip copies were written")
+
+    if args.serve:
+        serve(args.output_dir, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
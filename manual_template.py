@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Document Template for the User Manual Generators
+Compiles the manual style set once into a cached base package so that new
+documents start from an in-memory copy instead of rebuilding their styles.
+"""
+
+import os
+import json
+import hashlib
+from io import BytesIO
+
+try:
+    from docx import Document
+    from docx.shared import Pt
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    from docx.enum.style import WD_STYLE_TYPE
+except ImportError:
+    print("Installing python-docx...")
+    os.system("pip install python-docx")
+    from docx import Document
+    from docx.shared import Pt
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    from docx.enum.style import WD_STYLE_TYPE
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".manual_cache")
+
+# Style set shared by every manual (sizes and spacing in points)
+MANUAL_STYLES = [
+    {"name": "CustomTitle", "size": 24, "center": True, "space_before": None, "space_after": 12},
+    {"name": "CustomHeading1", "size": 18, "center": False, "space_before": 12, "space_after": 6},
+    {"name": "CustomHeading2", "size": 14, "center": False, "space_before": 6, "space_after": 3},
+]
+
+# Compiled template package, kept for the lifetime of the process
+_template_bytes = None
+
+
+def style_set_key():
+    """Short hash of the style set, used to invalidate stale cached templates"""
+    spec = json.dumps(MANUAL_STYLES, sort_keys=True).encode("utf-8")
+    return hashlib.sha1(spec).hexdigest()[:12]
+
+
+def template_path():
+    """Location of the cached base package for the current style set"""
+    return os.path.join(CACHE_DIR, f"manual_base_{style_set_key()}.docx")
+
+
+def apply_manual_styles(doc):
+    """Add the manual styles to a document, skipping any that already exist"""
+    existing = {style.name for style in doc.styles}
+    for spec in MANUAL_STYLES:
+        if spec["name"] in existing:
+            continue
+        style = doc.styles.add_style(spec["name"], WD_STYLE_TYPE.PARAGRAPH)
+        font = style.font
+        font.name = 'Arial'
+        font.size = Pt(spec["size"])
+        font.bold = True
+        if spec["center"]:
+            style.paragraph_format.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        if spec["space_before"] is not None:
+            style.paragraph_format.space_before = Pt(spec["space_before"])
+        style.paragraph_format.space_after = Pt(spec["space_after"])
+    return doc
+
+
+def compile_template(path=None):
+    """Build the styled base package and write it to the template cache"""
+    path = path or template_path()
+    doc = apply_manual_styles(Document())
+    buffer = BytesIO()
+    doc.save(buffer)
+    data = buffer.getvalue()
+
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temporary name first so concurrent builds never read a partial file
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Could not cache document template: {e}")
+
+    return data
+
+
+def load_template_bytes():
+    """Return the compiled template, reading or compiling it on first use"""
+    global _template_bytes
+    if _template_bytes is None:
+        path = template_path()
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                _template_bytes = f.read()
+        else:
+            _template_bytes = compile_template(path)
+    return _template_bytes
+
+
+def new_document():
+    """Create a new document from an in-memory copy of the styled template"""
+    return Document(BytesIO(load_template_bytes()))
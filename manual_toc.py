@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Automatic Table of Contents for the User Manual Generators
+Records headings as sections are emitted and fills in the table of contents
+in the same pass: every heading gets a bookmark, every entry a hyperlink,
+and the entries are the cached result of a native Word TOC field.
+"""
+
+import os
+
+try:
+    from docx.shared import Pt
+    from docx.oxml.shared import OxmlElement, qn
+except ImportError:
+    print("Installing python-docx...")
+    os.system("pip install python-docx")
+    from docx.shared import Pt
+    from docx.oxml.shared import OxmlElement, qn
+
+# Outline levels 1-2, hyperlinked entries, use paragraph outline levels
+TOC_INSTRUCTION = ' TOC \\o "1-2" \\h \\z \\u '
+
+
+def _field_char(kind):
+    run = OxmlElement('w:r')
+    char = OxmlElement('w:fldChar')
+    char.set(qn('w:fldCharType'), kind)
+    run.append(char)
+    return run
+
+
+def _instruction(text):
+    run = OxmlElement('w:r')
+    instr = OxmlElement('w:instrText')
+    instr.set(qn('xml:space'), 'preserve')
+    instr.text = text
+    run.append(instr)
+    return run
+
+
+class TableOfContents:
+    """Collects headings while the document is built
+
+    Call insert() where the table of contents belongs, add_heading() for
+    every section heading and finish() once before saving. finish() only
+    walks the recorded headings; the document itself is never re-read.
+    """
+
+    def __init__(self, doc):
+        self.doc = doc
+        self.entries = []
+        self.placeholder = None
+
+    def insert(self):
+        """Reserve the position of the table of contents"""
+        self.placeholder = self.doc.add_paragraph("", style='Normal')
+        return self.placeholder
+
+    def add_heading(self, paragraph, level):
+        """Bookmark a heading paragraph and record it for the table of contents"""
+        name = f"_Toc{100000000 + len(self.entries)}"
+        bookmark_id = str(len(self.entries) + 1)
+
+        start = OxmlElement('w:bookmarkStart')
+        start.set(qn('w:id'), bookmark_id)
+        start.set(qn('w:name'), name)
+        end = OxmlElement('w:bookmarkEnd')
+        end.set(qn('w:id'), bookmark_id)
+        p = paragraph._p
+        p.insert(1 if p.pPr is not None else 0, start)
+        p.append(end)
+
+        # Outline level lets Word rebuild the same entries when the field is updated
+        outline = OxmlElement('w:outlineLvl')
+        outline.set(qn('w:val'), str(level - 1))
+        p.get_or_add_pPr().append(outline)
+
+        self.entries.append((level, paragraph.text, name))
+
+    def _entry_paragraph(self, level, text, name):
+        paragraph = self.placeholder.insert_paragraph_before("", style='Normal')
+        if level > 1:
+            paragraph.paragraph_format.left_indent = Pt(18 * (level - 1))
+
+        link = OxmlElement('w:hyperlink')
+        link.set(qn('w:anchor'), name)
+        link.set(qn('w:history'), '1')
+        run = OxmlElement('w:r')
+        text_element = OxmlElement('w:t')
+        text_element.set(qn('xml:space'), 'preserve')
+        text_element.text = text
+        run.append(text_element)
+        link.append(run)
+        paragraph._p.append(link)
+        return paragraph
+
+    def finish(self):
+        """Write the entries into the reserved position as a TOC field result"""
+        if self.placeholder is None:
+            return
+
+        paragraphs = [self._entry_paragraph(*entry) for entry in self.entries]
+        if not paragraphs:
+            paragraphs = [self.placeholder.insert_paragraph_before("", style='Normal')]
+
+        first = paragraphs[0]._p
+        for offset, run in enumerate([_field_char('begin'), _instruction(TOC_INSTRUCTION), _field_char('separate')]):
+            first.insert(offset + (1 if first.pPr is not None else 0), run)
+        paragraphs[-1]._p.append(_field_char('end'))
+
+        # The placeholder is no longer needed once the entries are in place
+        self.placeholder._p.getparent().remove(self.placeholder._p)
+        self.placeholder = None
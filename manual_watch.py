@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Watch Mode for the Tour-Based User Manual
+Keeps the browser session and the compiled document template alive after a
+first full build, polls the manual's content and the app sources for saved
+changes and re-runs only the tour steps and text sections they affect before
+re-rendering the document from the recorded sections.
+"""
+
+import os
+import sys
+import time
+import inspect
+import importlib
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# App sources that show up in screenshots, relative to ROOT
+WATCHED_SOURCES = ["app", "components", "lib", "services", "hooks", "styles"]
+
+# Files holding the manual text; edits are picked up by reloading the generator module
+CONTENT_FILES = ["generate_user_manual.py"]
+
+POLL_INTERVAL = 0.25
+
+
+def snapshot(root=ROOT):
+    """{relative path: mtime} of the content files and every watched app source"""
+    mtimes = {}
+    for name in CONTENT_FILES:
+        path = os.path.join(root, name)
+        if os.path.exists(path):
+            mtimes[name] = os.stat(path).st_mtime_ns
+    for source in WATCHED_SOURCES:
+        for directory, subdirectories, files in os.walk(os.path.join(root, source)):
+            subdirectories[:] = [name for name in subdirectories if not name.startswith(".")]
+            for name in files:
+                path = os.path.join(directory, name)
+                try:
+                    mtimes[os.path.relpath(path, root).replace(os.sep, "/")] = os.stat(path).st_mtime_ns
+                except FileNotFoundError:
+                    # Editors replace files by renaming; it will be back on the next poll
+                    pass
+    return mtimes
+
+
+def changed_files(before, after):
+    """Paths that were added, removed or modified between two snapshots"""
+    return sorted(path for path in before.keys() | after.keys() if before.get(path) != after.get(path))
+
+
+def affected_steps(paths, steps):
+    """Tour steps whose screenshots depend on the changed app sources
+
+    A change outside every step's sources (shared UI components, lib/,
+    services/...) may show on any page, so it affects all steps.
+    """
+    affected = set()
+    for path in paths:
+        matches = {name for name, step in steps.items()
+                   if any(path == source or path.startswith(source + "/") for source in step["sources"])}
+        affected |= matches or set(steps)
+    return affected
+
+
+class ManualWatcher:
+    """Rebuilds the manual of a generator whose browser is kept open"""
+
+    def __init__(self, generator, doc_path="User_Manual.docx"):
+        self.generator = generator
+        self.doc_path = doc_path
+        self.module = sys.modules[type(generator).__module__]
+        self.sources = self._section_sources(type(generator))
+
+    def _section_sources(self, cls):
+        """Source text of every step and section method, to tell which ones were edited"""
+        methods = {name: step["method"] for name, step in self.module.TOUR_STEPS.items()}
+        methods.update(self.module.TEXT_SECTIONS)
+        return {name: inspect.getsource(getattr(cls, method)) for name, method in methods.items()}
+
+    def reload_generator(self):
+        """Reload the generator module, switch the running generator to it and return the edited sections"""
+        try:
+            module = importlib.reload(sys.modules["generate_user_manual"]) if "generate_user_manual" in sys.modules \
+                else importlib.import_module("generate_user_manual")
+        except Exception as e:
+            # Most likely a half-finished edit; the next save triggers another attempt
+            print(f"❌ Could not reload the manual content: {e}")
+            return set()
+        self.module = module
+        self.generator.__class__ = module.UserManualGenerator
+        sources = self._section_sources(module.UserManualGenerator)
+        edited = {name for name, source in sources.items() if self.sources.get(name) != source}
+        self.sources = sources
+        return edited
+
+    def run_step(self, name):
+        """Re-capture one tour step, keeping the warm session whenever the step allows it"""
+        generator = self.generator
+        step = self.module.TOUR_STEPS[name]
+        if not step["needs_session"]:
+            # Public pages look different to a signed-in visitor
+            if generator.signed_in:
+                generator.sign_out()
+            if step.get("after"):
+                # The step continues on a page it does not load itself
+                generator.driver.get(generator.base_url)
+                generator.wait_for_page_load()
+        elif not generator.signed_in and not generator.login_to_system():
+            print(f"⚠️ Could not sign in to re-capture {name}")
+            return
+        generator.run_section(name, getattr(generator, step["method"]))
+
+    def rebuild(self, changed):
+        """Re-run what the changed files affect and save the document"""
+        start = time.perf_counter()
+        names = set()
+        if any(path in CONTENT_FILES for path in changed):
+            names |= self.reload_generator()
+        app_changes = [path for path in changed if path not in CONTENT_FILES]
+        if app_changes:
+            names |= affected_steps(app_changes, self.module.TOUR_STEPS)
+
+        steps = [name for name in self.module.TOUR_STEPS if name in names]
+        sections = [name for name in self.module.TEXT_SECTIONS if name in names]
+        for name in steps:
+            self.run_step(name)
+        for name in sections:
+            self.generator.run_section(name, getattr(self.generator, self.module.TEXT_SECTIONS[name]))
+        self.generator.render_document(self.doc_path)
+
+        rebuilt = ", ".join(steps + sections) or "layout only"
+        print(f"✓ {self.doc_path} rebuilt ({rebuilt}) in {time.perf_counter() - start:.2f}s")
+
+    def watch(self):
+        """Poll for saved changes until interrupted"""
+        files = snapshot()
+        print(f"Watching {', '.join(CONTENT_FILES + [source + '/' for source in WATCHED_SOURCES])} (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(POLL_INTERVAL)
+                current = snapshot()
+                changed = changed_files(files, current)
+                if not changed:
+                    continue
+                files = current
+                print(f"\nChanged: {', '.join(changed)}")
+                try:
+                    self.rebuild(changed)
+                except Exception as e:
+                    print(f"❌ Rebuild failed: {e}")
+        except KeyboardInterrupt:
+            print("\nStopped watching")
+        finally:
+            self.generator.close()
+
+
+def watch_manual(generator, doc_path="User_Manual.docx"):
+    """Build the manual once with the browser kept open, then rebuild on every change"""
+    generator.keep_browser = True
+    generator.generate_manual(doc_path)
+    if generator.driver is None or not generator.section_nodes:
+        print("❌ Watch mode needs the development server and a working tour")
+        generator.close()
+        return 1
+    # Later captures are edits, not measurements of a fresh tour
+    generator.perf = None
+    ManualWatcher(generator, doc_path).watch()
+    return 0
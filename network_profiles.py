@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Network-Condition Profiles for the Website Tour
+Applies named network and CPU throttling profiles through DevTools emulation
+and runs one tour per profile, each in its own browser session, to report
+per-page timings under field-office conditions. Also holds the in-page
+settle check that the tour waits on instead of fixed sleeps.
+"""
+
+import sys
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+# Throughput in bytes per second for Network.emulateNetworkConditions; cpu is the
+# Emulation.setCPUThrottlingRate slowdown factor. timeout_scale stretches the
+# tour's waits so slow profiles time out on real failures only.
+NETWORK_PROFILES = {
+    "3g": {"latency": 563, "download": 180_000, "upload": 84_000, "cpu": 4, "timeout_scale": 6},
+    "branch-dsl": {"latency": 40, "download": 512_000, "upload": 128_000, "cpu": 2, "timeout_scale": 2},
+    "lan": {"latency": 2, "download": 12_500_000, "upload": 12_500_000, "cpu": 1, "timeout_scale": 1},
+}
+
+# Milliseconds without a fetch/XHR starting or finishing before the page counts as idle
+QUIET_MS = 500
+
+# Runs before the page's own scripts and counts the fetch/XHR requests in flight
+NETWORK_TRACKER_SCRIPT = """
+(() => {
+  const state = window.__manualNetwork = {pending: 0, lastActivity: performance.now()};
+  const begin = () => { state.pending += 1; state.lastActivity = performance.now(); };
+  const end = () => { state.pending = Math.max(0, state.pending - 1); state.lastActivity = performance.now(); };
+  const fetch = window.fetch;
+  window.fetch = function () {
+    begin();
+    return fetch.apply(window, arguments).finally(end);
+  };
+  const send = XMLHttpRequest.prototype.send;
+  XMLHttpRequest.prototype.send = function () {
+    begin();
+    this.addEventListener("loadend", end, {once: true});
+    return send.apply(this, arguments);
+  };
+})();
+"""
+
+# True once the document is loaded, the network has been quiet for arguments[0] ms,
+# no spinner is visible, images are decoded and finite animations have ended
+SETTLED_SCRIPT = """
+const state = window.__manualNetwork;
+if (document.readyState !== "complete") return false;
+if (state && (state.pending > 0 || performance.now() - state.lastActivity < arguments[0])) return false;
+const visible = element => element.getClientRects().length > 0;
+if (Array.from(document.querySelectorAll(".animate-spin")).some(visible)) return false;
+if (Array.from(document.images).some(image => !image.complete)) return false;
+return document.getAnimations().every(animation =>
+  animation.playState !== "running" ||
+  (animation.effect && animation.effect.getComputedTiming().iterations === Infinity));
+"""
+
+
+def install_network_tracker(driver):
+    """Track in-flight requests on every document loaded from now on"""
+    driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": NETWORK_TRACKER_SCRIPT})
+
+
+def apply_network_profile(driver, name):
+    """Throttle the browser's network and CPU to a named profile"""
+    profile = NETWORK_PROFILES[name]
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.emulateNetworkConditions", {
+        "offline": False,
+        "latency": profile["latency"],
+        "downloadThroughput": profile["download"],
+        "uploadThroughput": profile["upload"],
+    })
+    driver.execute_cdp_cmd("Emulation.setCPUThrottlingRate", {"rate": profile["cpu"]})
+
+
+def profile_tour(name, base_url):
+    """Run the tour under one profile and return its performance samples"""
+    from generate_user_manual import UserManualGenerator
+    generator = UserManualGenerator(base_url=base_url, network_profile=name)
+    try:
+        generator.run_tour()
+    finally:
+        generator.close()
+    return generator.perf.samples if generator.perf else []
+
+
+def run_profiles(names, base_url, workers=None):
+    """{profile: samples}, with every profile's tour in its own browser session
+
+    Each session is a separate Chrome process, so threads are enough to run
+    the tours side by side.
+    """
+    with ThreadPoolExecutor(max_workers=workers or len(names)) as pool:
+        jobs = {name: pool.submit(profile_tour, name, base_url) for name in names}
+        results = {}
+        for name, job in jobs.items():
+            try:
+                results[name] = job.result()
+            except Exception as e:
+                print(f"❌ Tour under {name} failed: {e}")
+                results[name] = []
+        return results
+
+
+def _seconds(value):
+    return "n/a" if value is None else f"{value / 1000:.2f}s"
+
+
+def timing_table(results):
+    """Lines of a page x profile table of load time and largest contentful paint"""
+    names = list(results)
+    pages = []
+    for samples in results.values():
+        pages += [sample["page"] for sample in samples if sample["page"] not in pages]
+    lines = [f"{'page':<26}" + "".join(f"{name + ' load/LCP':>22}" for name in names)]
+    for page in pages:
+        cells = []
+        for name in names:
+            sample = next((sample for sample in results[name] if sample["page"] == page), None)
+            if sample is None:
+                cells.append(f"{'-':>22}")
+                continue
+            load = (sample.get("navigation") or {}).get("load")
+            cells.append(f"{_seconds(load) + ' / ' + _seconds(sample.get('lcp')):>22}")
+        lines.append(f"{page:<26}" + "".join(cells))
+    return lines
+
+
+def main():
+    """Main function to time the tour under each network profile"""
+    parser = argparse.ArgumentParser(description="Run the website tour under throttled network profiles")
+    parser.add_argument("profiles", nargs="*", default=list(NETWORK_PROFILES),
+                        help=f"Profiles to run (default: all of {', '.join(NETWORK_PROFILES)})")
+    parser.add_argument("--base-url", default="http://localhost:3000")
+    parser.add_argument("--workers", type=int, default=None, help="Parallel browser sessions (default: one per profile)")
+    args = parser.parse_args()
+
+    unknown = [name for name in args.profiles if name not in NETWORK_PROFILES]
+    if unknown:
+        print(f"❌ Unknown profile(s): {', '.join(unknown)}")
+        return 1
+
+    print("=== Inventory Management System - Network Profiles ===")
+    results = run_profiles(args.profiles, args.base_url, args.workers)
+    print()
+    print("\n".join(timing_table(results)))
+    print("\nSamples: " + ", ".join(f"perf/{name}/" for name in results))
+    return 0 if all(results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
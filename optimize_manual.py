@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+DOCX Optimizer for Existing User Manuals
+Shrinks User_Manual.docx files that were built before the current pipeline
+(or edited in Word since): images are downsampled to a target DPI at their
+displayed size and re-encoded, unused styles and image/hyperlink relationships
+are dropped, and orphaned media is removed. Packages are streamed part by
+part, so a large manual is never held in memory as a whole.
+"""
+
+import os
+import sys
+import math
+import argparse
+import posixpath
+from io import BytesIO
+from zipfile import ZipFile, ZipInfo, ZIP_DEFLATED, ZIP_STORED
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from lxml import etree
+
+from manual_images import Image, encode_smallest
+
+W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+R = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+WP = "http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing"
+A = "http://schemas.openxmlformats.org/drawingml/2006/main"
+CT = "http://schemas.openxmlformats.org/package/2006/content-types"
+
+# Relationship types that are only reachable through an r:id in the part body;
+# every other type (styles, numbering, theme...) is implicit and always kept
+PRUNABLE_RELATIONSHIPS = (
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships/image",
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships/hyperlink",
+)
+
+STYLE_REFERENCES = {f"{{{W}}}pStyle", f"{{{W}}}rStyle", f"{{{W}}}tblStyle", f"{{{W}}}numStyleLink", f"{{{W}}}styleLink"}
+STYLE_LINKS = (f"{{{W}}}basedOn", f"{{{W}}}next", f"{{{W}}}link")
+
+IMAGE_TYPES = {"png": "image/png", "jpg": "image/jpeg", "jpeg": "image/jpeg", "gif": "image/gif"}
+
+DEFAULT_DPI = 150
+EMU_PER_INCH = 914400
+ZIP_TIMESTAMP = (1980, 1, 1, 0, 0, 0)
+
+
+def rels_source(rels_path):
+    """Part name a .rels member belongs to ("" for the package rels)"""
+    directory, name = posixpath.split(rels_path)
+    return posixpath.join(posixpath.dirname(directory), name[:-len(".rels")]).lstrip("/")
+
+
+def scan_part(stream):
+    """Stream one XML part and collect what it references
+
+    Returns (relationship ids, {image rId: widest displayed EMU}, style ids).
+    """
+    rel_ids, extents, styles = set(), {}, set()
+    width = 0
+    for _, element in etree.iterparse(stream, events=("end",), huge_tree=True):
+        for name, value in element.attrib.items():
+            if name.startswith(f"{{{R}}}"):
+                rel_ids.add(value)
+        tag = element.tag
+        if tag in STYLE_REFERENCES:
+            styles.add(element.get(f"{{{W}}}val"))
+        elif tag == f"{{{WP}}}extent":
+            width = int(element.get("cx", 0))
+        elif tag == f"{{{A}}}blip":
+            embed = element.get(f"{{{R}}}embed")
+            if embed:
+                extents[embed] = max(extents.get(embed, 0), width)
+        # Only the current path is needed, so memory stays flat on large parts
+        element.clear(keep_tail=True)
+        while element.getprevious() is not None:
+            del element.getparent()[0]
+    return rel_ids, extents, styles
+
+
+def prune_styles(data, used):
+    """Drop styles that nothing uses directly or through basedOn/next/link"""
+    root = etree.fromstring(data)
+    by_id = {style.get(f"{{{W}}}styleId"): style for style in root.iterfind(f"{{{W}}}style")}
+    keep = {style_id for style_id, style in by_id.items() if style.get(f"{{{W}}}default") in ("1", "true")}
+    pending = list(used | keep)
+    while pending:
+        style = by_id.get(pending.pop())
+        if style is None:
+            continue
+        for link in STYLE_LINKS:
+            target = style.find(link)
+            if target is not None and target.get(f"{{{W}}}val") not in keep:
+                keep.add(target.get(f"{{{W}}}val"))
+                pending.append(target.get(f"{{{W}}}val"))
+        keep.add(style.get(f"{{{W}}}styleId"))
+
+    for style_id, style in by_id.items():
+        if style_id not in keep:
+            root.remove(style)
+    return etree.tostring(root, xml_declaration=True, encoding="UTF-8", standalone=True)
+
+
+def downsample(data, display_emu, dpi):
+    """Re-encode an image at no more than dpi at its displayed width
+
+    Returns (bytes, extension) or None when the result is not smaller.
+    """
+    if Image is None:
+        return None
+    with Image.open(BytesIO(data)) as image:
+        image.load()
+        if display_emu:
+            target = math.ceil(display_emu / EMU_PER_INCH * dpi)
+            if image.width > target:
+                image = image.resize((target, round(image.height * target / image.width)), Image.LANCZOS)
+        encoded, extension = encode_smallest(image)
+    if len(encoded) >= len(data):
+        return None
+    return encoded, extension
+
+
+class PartReport:
+    """Bytes before/after for each member of one package"""
+
+    def __init__(self, path):
+        self.path = path
+        self.parts = []
+
+    def add(self, name, before, after, note=""):
+        self.parts.append((name, before, after, note))
+
+    @property
+    def before(self):
+        return sum(before for _, before, _, _ in self.parts)
+
+    @property
+    def after(self):
+        return sum(after for _, _, after, _ in self.parts)
+
+    def lines(self):
+        yield f"{self.path}: {self.before:,} -> {self.after:,} bytes ({self.before - self.after:,} saved)"
+        for name, before, after, note in sorted(self.parts, key=lambda part: part[2] - part[1]):
+            if before != after:
+                yield f"  {name:<40}{before:>12,}{after:>12,}{before - after:>12,}  {note}"
+
+
+def optimize_docx(source, target, dpi=DEFAULT_DPI):
+    """Write an optimized copy of a DOCX package and return its PartReport"""
+    report = PartReport(source)
+    with ZipFile(source) as package:
+        infos = package.infolist()
+        names = {info.filename for info in infos}
+
+        # Pass 1: stream every XML part once to learn what is referenced
+        references, extents, used_styles = {}, {}, set()
+        for info in infos:
+            if info.filename.endswith(".xml") and not info.filename.startswith("["):
+                with package.open(info) as stream:
+                    rel_ids, part_extents, styles = scan_part(stream)
+                references[info.filename] = rel_ids
+                used_styles |= styles
+                for rel_id, emu in part_extents.items():
+                    extents[(info.filename, rel_id)] = emu
+
+        # Prune relationships nobody points at, then see which media is still reachable
+        relationships = {}
+        reachable = set()
+        for info in infos:
+            if not info.filename.endswith(".rels"):
+                continue
+            owner = rels_source(info.filename)
+            root = etree.fromstring(package.read(info))
+            for rel in list(root):
+                if rel.get("TargetMode") == "External":
+                    if rel.get("Type") in PRUNABLE_RELATIONSHIPS and rel.get("Id") not in references.get(owner, ()):
+                        root.remove(rel)
+                    continue
+                target_name = posixpath.normpath(
+                    posixpath.join(posixpath.dirname(owner), rel.get("Target"))
+                ).lstrip("/")
+                if rel.get("Type") in PRUNABLE_RELATIONSHIPS and rel.get("Id") not in references.get(owner, ()):
+                    root.remove(rel)
+                    continue
+                reachable.add(target_name)
+                # Widest display across every reference decides the pixel width
+                emu = extents.get((owner, rel.get("Id")), 0)
+                extents[target_name] = max(extents.get(target_name, 0), emu)
+            relationships[info.filename] = (owner, root)
+
+        # Decide which media is re-encoded and under which name; the relationships
+        # and content types that come before the media in the package need the
+        # new names, but the encoded bytes are dropped until pass 2 needs them
+        renamed = {}
+        for info in infos:
+            name = info.filename
+            extension = name.rsplit(".", 1)[-1].lower()
+            if name.startswith("word/media/") and name in reachable and extension in IMAGE_TYPES:
+                result = downsample(package.read(info), extents.get(name, 0), dpi)
+                if result is not None:
+                    new_extension = result[1]
+                    new_name = name if new_extension == extension else f"{name.rsplit('.', 1)[0]}.{new_extension}"
+                    if new_name != name and new_name in names:
+                        continue
+                    renamed[name] = new_name
+
+        for rels_path, (owner, root) in relationships.items():
+            for rel in root:
+                if rel.get("TargetMode") == "External":
+                    continue
+                target_name = posixpath.normpath(posixpath.join(posixpath.dirname(owner), rel.get("Target"))).lstrip("/")
+                if renamed.get(target_name, target_name) != target_name:
+                    rel.set("Target", posixpath.relpath(renamed[target_name], posixpath.dirname(owner) or "."))
+
+        # Pass 2: stream the package into the output, one part at a time; media is
+        # encoded again as it is written (encoding is deterministic, so it matches
+        # the name chosen above), so at most one image is held in memory
+        tmp_path = f"{target}.{os.getpid()}.tmp"
+        with ZipFile(tmp_path, "w") as output:
+            for info in infos:
+                name = info.filename
+                if name.startswith("word/media/") and name not in reachable:
+                    report.add(name, info.compress_size, 0, "unused, removed")
+                    continue
+
+                note = ""
+                if name in renamed:
+                    data, note = downsample(package.read(info), extents.get(name, 0), dpi)[0], "re-encoded"
+                    if renamed[name] != name:
+                        note += f" as {posixpath.basename(renamed[name])}"
+                    name = renamed[name]
+                elif name in relationships:
+                    data = etree.tostring(relationships[name][1], xml_declaration=True, encoding="UTF-8", standalone=True)
+                elif name == "word/styles.xml":
+                    data, note = prune_styles(package.read(info), used_styles), "unused styles removed"
+                elif name == "[Content_Types].xml":
+                    data = content_types(package.read(info), renamed)
+                else:
+                    data = package.read(info)
+
+                member = ZipInfo(name, ZIP_TIMESTAMP)
+                # Freshly encoded media is already compressed; other binary parts keep their method
+                if info.filename in renamed:
+                    member.compress_type = ZIP_STORED
+                elif name.endswith((".xml", ".rels")):
+                    member.compress_type = ZIP_DEFLATED
+                else:
+                    member.compress_type = info.compress_type
+                output.writestr(member, data)
+                report.add(info.filename, info.compress_size, member.compress_size, note)
+
+    os.replace(tmp_path, target)
+    return report
+
+
+def content_types(data, renamed):
+    """Point overrides at renamed media and add Default entries for new extensions"""
+    root = etree.fromstring(data)
+    known = {default.get("Extension").lower() for default in root.iterfind(f"{{{CT}}}Default")}
+    for override in root.iterfind(f"{{{CT}}}Override"):
+        part_name = override.get("PartName").lstrip("/")
+        if part_name in renamed:
+            override.set("PartName", "/" + renamed[part_name])
+    for new_name in renamed.values():
+        extension = new_name.rsplit(".", 1)[-1].lower()
+        if extension not in known:
+            default = etree.Element(f"{{{CT}}}Default", Extension=extension, ContentType=IMAGE_TYPES[extension])
+            root.insert(0, default)
+            known.add(extension)
+    return etree.tostring(root, xml_declaration=True, encoding="UTF-8", standalone=True)
+
+
+def find_manuals(paths, suffix):
+    """Expand files and directories into the .docx files to optimize"""
+    for path in paths:
+        if os.path.isdir(path):
+            for directory, _, files in os.walk(path):
+                for name in sorted(files):
+                    if name.endswith(".docx") and not name.startswith("~$") and not name.endswith(f"{suffix}.docx"):
+                        yield os.path.join(directory, name)
+        else:
+            yield path
+
+
+def output_path(path, suffix, in_place):
+    return path if in_place else f"{os.path.splitext(path)[0]}{suffix}.docx"
+
+
+def _optimize(job):
+    source, target, dpi = job
+    return optimize_docx(source, target, dpi)
+
+
+def main():
+    """Main function to optimize existing manuals"""
+    parser = argparse.ArgumentParser(description="Shrink existing User Manual .docx files")
+    parser.add_argument("paths", nargs="+", help="DOCX files or directories to search for them")
+    parser.add_argument("--dpi", type=int, default=DEFAULT_DPI, help="Maximum image resolution at displayed size")
+    parser.add_argument("--in-place", action="store_true", help="Replace the original files")
+    parser.add_argument("--suffix", default="_optimized", help="Output name suffix when not in place")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    jobs = [(path, output_path(path, args.suffix, args.in_place), args.dpi) for path in find_manuals(args.paths, args.suffix)]
+    if not jobs:
+        print("No .docx files found")
+        return 1
+
+    print(f"=== Optimizing {len(jobs)} manual(s) ===")
+    total_before = total_after = 0
+    failures = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = {pool.submit(_optimize, job): job for job in jobs}
+        for future in as_completed(futures):
+            try:
+                report = future.result()
+            except Exception as e:
+                failures += 1
+                print(f"❌ {futures[future][0]}: {e}")
+                continue
+            print("\n".join(report.lines()))
+            total_before += report.before
+            total_after += report.after
+
+    print(f"\n✓ {total_before - total_after:,} bytes saved across {len(jobs) - failures} manual(s)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
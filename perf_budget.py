@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Performance Budget Gate for the Website Tour
+Checks the samples of a tour run (perf/<run>.jsonl) against per-page budgets
+and against a rolling baseline of earlier runs. The baseline uses the median
+and the median absolute deviation, so one noisy run neither hides nor fakes
+a regression. Only recorded samples are read; no page is loaded again.
+"""
+
+import os
+import sys
+import glob
+import json
+import argparse
+from statistics import median
+
+from manual_perf import PERF_DIR, load_samples
+
+DEFAULT_BUDGET_PATH = "perf_budget.json"
+
+# Metric name -> (how to read it from a sample, unit label)
+METRICS = {
+    "load_ms": (lambda sample: (sample.get("navigation") or {}).get("load"), "ms"),
+    "transfer_kb": (lambda sample: sample["resources"]["transferSize"] / 1024, "KB"),
+    "requests": (lambda sample: sample["resources"]["count"], ""),
+    "long_tasks": (lambda sample: sample["longTasks"], ""),
+}
+
+# Scales the MAD to a standard deviation for normally distributed noise
+MAD_SCALE = 1.4826
+
+
+def load_budget(path=DEFAULT_BUDGET_PATH):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def metric_values(samples):
+    """{(page, metric): value} for one run; repeated pages keep their worst value"""
+    values = {}
+    for sample in samples:
+        for metric, (read, _) in METRICS.items():
+            value = read(sample)
+            if value is None:
+                continue
+            key = (sample["page"], metric)
+            values[key] = max(values.get(key, value), value)
+    return values
+
+
+def previous_runs(run_path, perf_dir=PERF_DIR, limit=10):
+    """Metric values of up to `limit` runs recorded before run_path, newest last"""
+    paths = sorted(path for path in glob.glob(os.path.join(perf_dir, "*.jsonl"))
+                   if os.path.abspath(path) != os.path.abspath(run_path)
+                   and os.path.basename(path) < os.path.basename(run_path))
+    return [metric_values(load_samples(path)) for path in paths[-limit:]]
+
+
+def budget_violations(values, budget):
+    """Findings for every metric over its page (or default) budget"""
+    findings = []
+    for (page, metric), value in values.items():
+        limit = budget.get("pages", {}).get(page, {}).get(metric, budget.get("default", {}).get(metric))
+        if limit is not None and value > limit:
+            findings.append({
+                "kind": "budget", "page": page, "metric": metric, "value": value, "limit": limit,
+                # Severity is how far over budget, as a fraction of the budget
+                "severity": (value - limit) / limit,
+            })
+    return findings
+
+
+def baseline_regressions(values, history, settings):
+    """Findings for metrics that are significantly worse than the rolling baseline
+
+    A value regresses when its robust z-score (distance from the median in
+    scaled MADs) exceeds max_z and it is also min_change worse than the
+    median, so tiny but perfectly stable metrics do not trip the gate.
+    """
+    findings = []
+    for key, value in values.items():
+        earlier = [run[key] for run in history if key in run]
+        if len(earlier) < settings.get("min_runs", 3):
+            continue
+        center = median(earlier)
+        spread = MAD_SCALE * median(abs(x - center) for x in earlier)
+        if value <= center * (1 + settings.get("min_change", 0.1)):
+            continue
+        z = (value - center) / spread if spread else float("inf")
+        if z > settings.get("max_z", 3.5):
+            page, metric = key
+            findings.append({
+                "kind": "baseline", "page": page, "metric": metric, "value": value, "median": center,
+                "z": z, "runs": len(earlier),
+                "severity": (value - center) / center if center else float("inf"),
+            })
+    return findings
+
+
+def check_run(run_path, budget_path=DEFAULT_BUDGET_PATH, perf_dir=PERF_DIR, samples=None):
+    """All budget and baseline findings for a run, worst first
+
+    samples may be passed when they are already in memory (as after a tour);
+    otherwise they are read from run_path.
+    """
+    budget = load_budget(budget_path)
+    settings = budget.get("baseline", {})
+    values = metric_values(samples if samples is not None else load_samples(run_path))
+    history = previous_runs(run_path, perf_dir, settings.get("runs", 10))
+    findings = budget_violations(values, budget) + baseline_regressions(values, history, settings)
+    return sorted(findings, key=lambda finding: finding["severity"], reverse=True)
+
+
+def _format(value, metric):
+    unit = METRICS[metric][1]
+    return f"{value:,.0f}{(' ' + unit) if unit else ''}"
+
+
+def report_lines(findings):
+    """Ranked regression report"""
+    if not findings:
+        yield "✓ All pages within budget and baseline"
+        return
+    yield f"❌ {len(findings)} performance regression(s), worst first:"
+    for rank, finding in enumerate(findings, start=1):
+        value = _format(finding["value"], finding["metric"])
+        if finding["kind"] == "budget":
+            detail = f"budget {_format(finding['limit'], finding['metric'])} (+{finding['severity']:.0%})"
+        else:
+            detail = (f"baseline median {_format(finding['median'], finding['metric'])} over {finding['runs']} runs "
+                      f"(+{finding['severity']:.0%}, z={finding['z']:.1f})")
+        yield f"{rank:>3}. {finding['page']:<26}{finding['metric']:<13}{value:>12}  vs {detail}"
+
+
+def latest_run(perf_dir=PERF_DIR):
+    paths = sorted(glob.glob(os.path.join(perf_dir, "*.jsonl")))
+    return paths[-1] if paths else None
+
+
+def main():
+    """Main function to check a tour run against the performance budget"""
+    parser = argparse.ArgumentParser(description="Check tour performance against budgets and earlier runs")
+    parser.add_argument("run", nargs="?", help="Samples file to check (default: the latest in perf/)")
+    parser.add_argument("--budget", default=DEFAULT_BUDGET_PATH, help="Budget file")
+    args = parser.parse_args()
+
+    run = args.run or latest_run()
+    if run is None:
+        print(f"No performance samples found in {PERF_DIR}/ (run the tour first)")
+        return 1
+
+    print(f"=== Performance Budget: {run} ===")
+    findings = check_run(run, args.budget)
+    print("\n".join(report_lines(findings)))
+    return 1 if findings else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Visual Regression Checks for the Website Tour
+Compares every screenshot the tour captures against a stored baseline with
+vectorized pixel-difference masks and SSIM, in a process pool, and writes a
+highlighted diff image for each page that changed. Exits non-zero when any
+page drifts past the thresholds, so it can gate UI deploys.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+    from PIL import Image
+except ImportError:
+    print("Installing numpy and Pillow...")
+    os.system("pip install numpy pillow")
+    import numpy as np
+    from PIL import Image
+
+SCREENSHOTS_DIR = "screenshots"
+BASELINE_DIR = os.path.join(SCREENSHOTS_DIR, "baseline")
+DIFF_DIR = os.path.join(SCREENSHOTS_DIR, "diff")
+# Annotated close-ups are derived from the page screenshots, not compared themselves
+CLOSEUPS_DIR = os.path.join(SCREENSHOTS_DIR, "closeups")
+
+# A pixel counts as changed when any channel moves by more than this
+PIXEL_THRESHOLD = 16
+# A page fails when more pixels than this fraction change, or SSIM drops below MIN_SSIM
+MAX_CHANGED_RATIO = 0.001
+MIN_SSIM = 0.98
+
+SSIM_WINDOW = 8
+SSIM_C1 = (0.01 * 255) ** 2
+SSIM_C2 = (0.03 * 255) ** 2
+
+
+def load_rgb(path):
+    with Image.open(path) as image:
+        return np.asarray(image.convert("RGB"))
+
+
+def grayscale(rgb):
+    """ITU-R BT.601 luma as float32"""
+    return rgb @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+def diff_mask(baseline, current, threshold=PIXEL_THRESHOLD):
+    """Boolean mask of pixels where any channel differs by more than threshold"""
+    delta = np.abs(baseline.astype(np.int16) - current.astype(np.int16))
+    return delta.max(axis=2) > threshold
+
+
+def box_mean(values, window=SSIM_WINDOW):
+    """Mean over every window x window block, via a summed-area table"""
+    # float64 sums keep the table exact; the result drops back to float32
+    table = np.zeros((values.shape[0] + 1, values.shape[1] + 1))
+    np.cumsum(np.cumsum(values, axis=0), axis=1, out=table[1:, 1:])
+    total = (table[window:, window:] - table[:-window, window:]
+             - table[window:, :-window] + table[:-window, :-window])
+    return (total / (window * window)).astype(np.float32)
+
+
+def ssim(baseline_gray, current_gray, window=SSIM_WINDOW):
+    """Mean structural similarity with a uniform (box) window"""
+    mu_x = box_mean(baseline_gray, window)
+    mu_y = box_mean(current_gray, window)
+    var_x = box_mean(baseline_gray * baseline_gray, window) - mu_x * mu_x
+    var_y = box_mean(current_gray * current_gray, window) - mu_y * mu_y
+    covariance = box_mean(baseline_gray * current_gray, window) - mu_x * mu_y
+    numerator = (2 * mu_x * mu_y + SSIM_C1) * (2 * covariance + SSIM_C2)
+    denominator = (mu_x * mu_x + mu_y * mu_y + SSIM_C1) * (var_x + var_y + SSIM_C2)
+    return float((numerator / denominator).mean())
+
+
+def dilate(mask, radius=2):
+    """Grow a mask by radius pixels so isolated changes stay visible"""
+    padded = np.pad(mask, radius)
+    grown = np.zeros_like(mask)
+    height, width = mask.shape
+    for dy in range(2 * radius + 1):
+        for dx in range(2 * radius + 1):
+            grown |= padded[dy:dy + height, dx:dx + width]
+    return grown
+
+
+def highlight(current, mask):
+    """Faded copy of the current screenshot with changed pixels in red"""
+    faded = (current * 0.35 + 255 * 0.65).astype(np.uint8)
+    faded[dilate(mask)] = (220, 38, 38)
+    return Image.fromarray(faded)
+
+
+def compare_image(name, baseline_path, current_path, diff_dir=DIFF_DIR):
+    """Compare one screenshot with its baseline and write a diff image if it changed"""
+    start = time.perf_counter()
+    result = {"name": name, "status": "pass", "changed_ratio": 0.0, "ssim": 1.0, "diff": None}
+    if not os.path.exists(baseline_path):
+        result["status"] = "new"
+        return result
+
+    baseline, current = load_rgb(baseline_path), load_rgb(current_path)
+    if baseline.shape != current.shape:
+        result.update(status="fail", reason=f"size {baseline.shape[1]}x{baseline.shape[0]} -> "
+                                            f"{current.shape[1]}x{current.shape[0]}")
+        return result
+
+    mask = diff_mask(baseline, current)
+    result["changed_ratio"] = float(mask.mean())
+    if mask.any():
+        result["ssim"] = ssim(grayscale(baseline), grayscale(current))
+        os.makedirs(diff_dir, exist_ok=True)
+        result["diff"] = os.path.join(diff_dir, f"{name}.png")
+        # Diff images are for humans; fast compression keeps the check quick
+        highlight(current, mask).save(result["diff"], compress_level=1)
+        if result["changed_ratio"] > MAX_CHANGED_RATIO or result["ssim"] < MIN_SSIM:
+            result["status"] = "fail"
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def _compare(job):
+    return compare_image(*job)
+
+
+def baseline_name(path):
+    """Path relative to the screenshots directory, e.g. mobile/04_dashboard.png"""
+    return os.path.relpath(path, SCREENSHOTS_DIR)
+
+
+def compare_all(current_paths, baseline_dir=BASELINE_DIR, diff_dir=DIFF_DIR, workers=None):
+    """Compare screenshots with their baselines in a process pool"""
+    jobs = []
+    for path in current_paths:
+        relative = baseline_name(path)
+        name = os.path.splitext(relative)[0].replace(os.sep, "_")
+        jobs.append((name, os.path.join(baseline_dir, relative), path, diff_dir))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_compare, jobs))
+
+
+def update_baseline(current_paths, baseline_dir=BASELINE_DIR):
+    """Accept the current screenshots as the new baseline"""
+    for path in current_paths:
+        target = os.path.join(baseline_dir, baseline_name(path))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copy2(path, target)
+
+
+def stored_screenshots():
+    """Screenshots from the last tour, for every viewport"""
+    paths = []
+    for directory, subdirectories, files in os.walk(SCREENSHOTS_DIR):
+        subdirectories[:] = [name for name in subdirectories
+                             if os.path.join(directory, name) not in (BASELINE_DIR, DIFF_DIR, CLOSEUPS_DIR)]
+        paths.extend(os.path.join(directory, name) for name in files if name.endswith(".png"))
+    return sorted(paths)
+
+
+def tour_screenshots(base_url):
+    """Capture fresh screenshots by running the website tour"""
+    from generate_user_manual import UserManualGenerator, VIEWPORTS
+    generator = UserManualGenerator(base_url=base_url, viewports=tuple(VIEWPORTS))
+    try:
+        return generator.run_tour()
+    finally:
+        generator.close()
+
+
+def main():
+    """Main function to run the visual regression check"""
+    parser = argparse.ArgumentParser(description="Compare tour screenshots against the stored baseline")
+    parser.add_argument("--tour", action="store_true", help="Run the website tour first to capture fresh screenshots")
+    parser.add_argument("--base-url", default="http://localhost:3000")
+    parser.add_argument("--update-baseline", action="store_true", help="Accept the current screenshots as baseline")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--report", metavar="PATH", help="Also write the results as JSON")
+    args = parser.parse_args()
+
+    print("=== Inventory Management System - Visual Regression ===")
+    if args.tour:
+        current = tour_screenshots(args.base_url)
+    else:
+        current = stored_screenshots()
+    if not current:
+        print("❌ No screenshots to compare")
+        return 1
+
+    if args.update_baseline:
+        update_baseline(current)
+        print(f"✓ Baseline updated with {len(current)} screenshots in {BASELINE_DIR}")
+        return 0
+
+    start = time.perf_counter()
+    results = compare_all(current, workers=args.workers)
+    elapsed = time.perf_counter() - start
+
+    symbols = {"pass": "✓", "new": "＋", "fail": "❌"}
+    for result in results:
+        detail = result.get("reason") or f"{result['changed_ratio']:.4%} changed, SSIM {result['ssim']:.4f}"
+        if result["status"] == "new":
+            detail = "no baseline yet"
+        line = f"{symbols[result['status']]} {result['name']:<28}{detail}"
+        if result["diff"]:
+            line += f"  -> {result['diff']}"
+        print(line)
+
+    failed = [result for result in results if result["status"] == "fail"]
+    print(f"\n{len(results)} screenshots compared in {elapsed:.2f}s, {len(failed)} failed")
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())